@@ -1,6 +1,7 @@
 from django.urls import path
+from coderr.async_views import select_view
 from . import views
 
 urlpatterns = [
-    path('base-info/', views.BaseInfoView.as_view()),
+    path('base-info/', select_view(views.AsyncBaseInfoView, views.BaseInfoView)),
 ]
\ No newline at end of file
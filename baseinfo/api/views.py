@@ -1,33 +1,44 @@
-from django.db.models import Avg
-
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from reviews.models import Review
-from user_auth.models import Profile
-from offers.models import Offer
+from baseinfo.models import PlatformStats
+from coderr.async_views import AsyncAPIView
 
 class BaseInfoView(APIView):
     """
     API-Endpoint, der grundlegende Metriken zur Plattform zurückgibt.
     Enthält: Anzahl der Bewertungen, Durchschnittsbewertung, 
     Anzahl Business-Profile, Anzahl Angebote.
+
+    Die Werte stammen aus der inkrementell gepflegten Zählertabelle `PlatformStats`
+    und werden mit einem einzigen Primärschlüssel-Lookup gelesen.
     """
 
+    @staticmethod
+    def format_stats(stats):
+        return {
+            'review_count': stats.review_count,
+            'average_rating': stats.average_rating,
+            'business_profile_count': stats.business_profile_count,
+            'offer_count': stats.offer_count
+        }
+
     def get(self, request, *args, **kwargs):
 
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(average_rating=Avg('rating'))['average_rating']
-        average_rating = round(average_rating, 1) if average_rating else 0
-        business_profile_count = Profile.objects.filter(type='business').count()
-        offer_count = Offer.objects.count()
-
-        platform_stats = {
-            'review_count': review_count,
-            'average_rating': average_rating,
-            'business_profile_count': business_profile_count,
-            'offer_count': offer_count
-        }
+        stats = PlatformStats.load()
+
+        return Response(self.format_stats(stats), status=status.HTTP_200_OK)
+
+
+class AsyncBaseInfoView(AsyncAPIView, BaseInfoView):
+    """
+    Async Variante von `BaseInfoView` für den Betrieb unter ASGI (siehe `ASYNC_READ_VIEWS`).
+    """
+
+    async def get(self, request, *args, **kwargs):
+
+        stats = await PlatformStats.aload()
+
+        return Response(self.format_stats(stats), status=status.HTTP_200_OK)
 
-        return Response(platform_stats, status=status.HTTP_200_OK)
\ No newline at end of file
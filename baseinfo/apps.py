@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BaseinfoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'baseinfo'
+
+    def ready(self):
+        from baseinfo import signals  # noqa: F401
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from baseinfo.models import PlatformStats
+
+
+class Command(BaseCommand):
+    """
+    Gleicht die Zählertabelle der Plattform-Kennzahlen mit dem tatsächlichen Bestand ab
+    und korrigiert eventuelle Abweichungen.
+    """
+    help = 'Berechnet die Plattform-Kennzahlen neu und korrigiert Abweichungen.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            current = PlatformStats.objects.select_for_update().filter(pk=PlatformStats.SINGLETON_PK).first()
+            stats = PlatformStats.reconcile()
+        for field in PlatformStats.COUNTER_FIELDS:
+            before = getattr(current, field, None)
+            after = getattr(stats, field)
+            if before != after:
+                self.stdout.write(f'{field}: {before} -> {after}')
+        self.stdout.write(self.style.SUCCESS('Plattform-Kennzahlen abgeglichen.'))
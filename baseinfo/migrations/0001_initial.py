@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-18 06:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_platform_stats(apps, schema_editor):
+    PlatformStats = apps.get_model('baseinfo', 'PlatformStats')
+    Offer = apps.get_model('offers', 'Offer')
+    Review = apps.get_model('reviews', 'Review')
+    Profile = apps.get_model('user_auth', 'Profile')
+    reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+    PlatformStats.objects.update_or_create(pk=1, defaults={
+        'review_count': reviews['review_count'],
+        'rating_sum': reviews['rating_sum'] or 0,
+        'business_profile_count': Profile.objects.filter(type='business').count(),
+        'offer_count': Offer.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offers', '0003_offer_search_index'),
+        ('reviews', '0001_initial'),
+        ('user_auth', '0002_rename_upload_at_profile_uploaded_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_platform_stats, migrations.RunPython.noop),
+    ]
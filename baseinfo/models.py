@@ -1,3 +1,86 @@
+from asgiref.sync import sync_to_async
 from django.db import models
+from django.db.models import Count, F, Sum
 
-# Create your models here.
+
+class PlatformStats(models.Model):
+    """
+    Einzeilige Zählertabelle (pk=1) mit den Plattform-Kennzahlen für `BaseInfoView`.
+    Wird bei Änderungen an Reviews, Profilen und Angeboten inkrementell fortgeschrieben
+    (siehe `baseinfo.signals`) und kann mit `reconcile_platform_stats` neu berechnet werden.
+    """
+    SINGLETON_PK = 1
+    COUNTER_FIELDS = ['review_count', 'rating_sum', 'business_profile_count', 'offer_count']
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+
+    @property
+    def average_rating(self):
+        """
+        Durchschnittsbewertung, auf eine Nachkommastelle gerundet (0 ohne Bewertungen).
+        """
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @classmethod
+    def load(cls):
+        """
+        Liest die Zählerzeile per Primärschlüssel und legt sie bei Bedarf aus dem aktuellen Bestand an.
+        """
+        stats = cls.objects.filter(pk=cls.SINGLETON_PK).first()
+        return stats if stats is not None else cls.reconcile()
+
+    @classmethod
+    async def aload(cls):
+        """
+        Asynchrone Variante von `load()` für async Views.
+        """
+        stats = await cls.objects.filter(pk=cls.SINGLETON_PK).afirst()
+        return stats if stats is not None else await sync_to_async(cls.reconcile)()
+
+    @classmethod
+    def increment(cls, **deltas):
+        """
+        Verändert die Zähler atomar per `UPDATE ... SET feld = feld + delta`.
+        Fehlt die Zeile noch, wird sie stattdessen vollständig aus dem Bestand berechnet.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(pk=cls.SINGLETON_PK).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated:
+            cls.reconcile()
+
+    @classmethod
+    def compute(cls):
+        """
+        Berechnet alle Kennzahlen direkt aus den Quelltabellen.
+        """
+        from offers.models import Offer
+        from reviews.models import Review
+        from user_auth.models import Profile
+
+        reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Sum('rating'))
+        return {
+            'review_count': reviews['review_count'],
+            'rating_sum': reviews['rating_sum'] or 0,
+            'business_profile_count': Profile.objects.filter(type='business').count(),
+            'offer_count': Offer.objects.count(),
+        }
+
+    @classmethod
+    def reconcile(cls):
+        """
+        Überschreibt die Zählerzeile mit frisch berechneten Werten und gibt sie zurück.
+        """
+        stats, _ = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults=cls.compute())
+        return stats
+
+    def __str__(self):
+        return f"{self.review_count} Bewertungen, {self.business_profile_count} Business-Profile, {self.offer_count} Angebote"
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from baseinfo.models import PlatformStats
+from coderr.tracking import UNKNOWN
+from offers.models import Offer
+from reviews.models import Review
+from user_auth.models import Profile
+
+
+@receiver(post_save, sender=Review)
+def count_saved_review(sender, instance, created, **kwargs):
+    """
+    Verbucht neue Bewertungen bzw. bei Updates nur die Differenz zur zuvor geladenen Bewertung.
+    """
+    if created:
+        PlatformStats.increment(review_count=1, rating_sum=instance.rating)
+        return
+    previous_rating = instance.get_dirty_fields().get('rating', instance.rating)
+    if previous_rating is UNKNOWN:
+        PlatformStats.reconcile()
+    else:
+        PlatformStats.increment(rating_sum=instance.rating - previous_rating)
+
+
+@receiver(post_delete, sender=Review)
+def count_deleted_review(sender, instance, **kwargs):
+    rating = instance.get_loaded_value('rating', instance.rating)
+    PlatformStats.increment(review_count=-1, rating_sum=-rating)
+
+
+@receiver(post_save, sender=Profile)
+def count_saved_profile(sender, instance, created, **kwargs):
+    """
+    Verbucht neue Business-Profile sowie Wechsel zwischen 'business' und 'customer'.
+    """
+    previous_type = None if created else instance.get_dirty_fields().get('type', instance.type)
+    if previous_type is UNKNOWN:
+        PlatformStats.reconcile()
+        return
+    was_business = previous_type == 'business'
+    is_business = instance.type == 'business'
+    PlatformStats.increment(business_profile_count=int(is_business) - int(was_business))
+
+
+@receiver(post_delete, sender=Profile)
+def count_deleted_profile(sender, instance, **kwargs):
+    if instance.get_loaded_value('type', instance.type) == 'business':
+        PlatformStats.increment(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def count_saved_offer(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.increment(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def count_deleted_offer(sender, instance, **kwargs):
+    PlatformStats.increment(offer_count=-1)
@@ -1,3 +1,80 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from baseinfo.api.views import AsyncBaseInfoView
+from baseinfo.models import PlatformStats
+from offers.models import Offer
+from reviews.models import Review
+from user_auth.models import Profile
+
+
+class PlatformStatsTests(APITestCase):
+    """
+    Prüft, dass die Zählertabelle den tatsächlichen Bestand widerspiegelt.
+    """
+
+    def _create_user(self, username, profile_type):
+        user = User.objects.create_user(username=username, password='secret')
+        Profile.objects.create(user=user, email=f'{username}@coderr.de', type=profile_type)
+        return user
+
+    def assertStatsConsistent(self):
+        stats = PlatformStats.load()
+        self.assertEqual({field: getattr(stats, field) for field in PlatformStats.COUNTER_FIELDS}, PlatformStats.compute())
+
+    def test_counters_follow_writes(self):
+        business = self._create_user('business', 'business')
+        customer = self._create_user('customer', 'customer')
+        offer = Offer.objects.create(user=business, title='Logo', description='Design')
+        review = Review.objects.create(reviewer=customer, business_user=business, rating=4, description='Gut')
+        Review.objects.create(reviewer=business, business_user=business, rating=1, description='Test')
+        self.assertStatsConsistent()
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 5
+        review.save()
+        customer.profile.type = 'business'
+        customer.profile.save()
+        self.assertStatsConsistent()
+
+        offer.delete()
+        business.delete()
+        self.assertStatsConsistent()
+
+    def test_base_info_is_a_single_query(self):
+        business = self._create_user('business', 'business')
+        Review.objects.create(reviewer=business, business_user=business, rating=4, description='Gut')
+        Review.objects.create(reviewer=business, business_user=business, rating=5, description='Sehr gut')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/base-info/')
+        self.assertEqual(response.data, {
+            'review_count': 2, 'average_rating': 4.5, 'business_profile_count': 1, 'offer_count': 0,
+        })
+
+    def test_reconcile_command_repairs_drift(self):
+        self._create_user('business', 'business')
+        PlatformStats.objects.update(business_profile_count=42, offer_count=-3)
+        call_command('reconcile_platform_stats', stdout=StringIO())
+        self.assertStatsConsistent()
+
+
+class AsyncBaseInfoViewTests(APITestCase):
+    """
+    Prüft, dass die async Variante dieselben Kennzahlen liefert wie die synchrone View.
+    """
+
+    def test_matches_sync_view(self):
+        user = User.objects.create_user(username='business', password='secret')
+        Profile.objects.create(user=user, email='business@coderr.de', type='business')
+        Offer.objects.create(user=user, title='Logo', description='Design')
+        PlatformStats.objects.all().delete()
+
+        request = APIRequestFactory().get('/api/base-info/')
+        response = async_to_sync(AsyncBaseInfoView.as_view())(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, self.client.get('/api/base-info/').data)
+        self.assertEqual(response.data['offer_count'], 1)
@@ -0,0 +1,167 @@
+"""
+Durchsatzvergleich der synchronen und asynchronen Lese-Views unter uvicorn.
+
+Startet für jeden Modus (`sync`, `async`) einen uvicorn-Prozess mit `coderr.asgi:application`
+(`ASYNC_READ_VIEWS` steuert das Routing) und feuert mit mehreren gleichzeitigen Keep-Alive-Verbindungen
+GET-Anfragen auf die Endpunkte. Ausgegeben werden Anfragen/s sowie Median und p95 der Latenz.
+
+Aufruf aus dem Projektverzeichnis (benötigt `pip install uvicorn`):
+
+    python benchmarks/async_views.py --requests 2000 --concurrency 50
+
+Mit `--url http://127.0.0.1:8000` wird stattdessen ein bereits laufender Server gemessen.
+Das Skript legt in der konfigurierten Datenbank den User `benchmark` (Business-Profil) an, falls er fehlt.
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr.settings')
+
+
+def prepare_fixtures():
+    """
+    Legt User, Profil und ein Angebot für die Messung an und gibt Pfade und Token zurück.
+    """
+    import django
+    django.setup()
+    from django.contrib.auth.models import User
+    from offers.models import Offer, OfferDetail
+    from user_auth.models import Profile
+    from user_auth.tokens import issue_tokens
+
+    user, _ = User.objects.get_or_create(username='benchmark')
+    profile, _ = Profile.objects.get_or_create(user=user, defaults={'email': 'benchmark@coderr.de', 'type': 'business'})
+    offer = Offer.objects.filter(user=user).first() or Offer.objects.create(user=user, title='Benchmark', description='Benchmark')
+    detail = offer.details.first() or OfferDetail.objects.create(
+        offer=offer, title='Basic', revisions=1, delivery_time_in_days=3, price=100, features=['Logo'], offer_type='basic',
+    )
+    paths = [
+        '/api/base-info/',
+        f'/api/order-count/{user.pk}/',
+        f'/api/completed-order-count/{user.pk}/',
+        f'/api/offerdetails/{detail.pk}/',
+        f'/api/profile/{profile.pk}/',
+    ]
+    return paths, issue_tokens(user)['access_token']
+
+
+async def _worker(host, port, requests, token, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in requests:
+            request = (
+                f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAuthorization: Bearer {token}\r\n'
+                'Accept: application/json\r\nConnection: keep-alive\r\n\r\n'
+            )
+            started = time.perf_counter()
+            writer.write(request.encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if not status_line.split()[1].startswith(b'2'):
+                raise RuntimeError(f'{path}: {status_line.decode().strip()}')
+    finally:
+        writer.close()
+
+
+async def run_load(base_url, paths, token, total, concurrency):
+    """
+    Verteilt `total` Anfragen reihum über die Pfade auf `concurrency` Verbindungen.
+    Gibt (Anfragen/s, Latenzen in Sekunden) zurück.
+    """
+    parts = urlsplit(base_url)
+    per_worker = [[] for _ in range(concurrency)]
+    for index in range(total):
+        per_worker[index % concurrency].append(paths[index % len(paths)])
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(parts.hostname, parts.port or 80, requests, token, latencies) for requests in per_worker if requests
+    ))
+    return total / (time.perf_counter() - started), latencies
+
+
+async def _probe(host, port):
+    _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 1)
+    writer.close()
+
+
+def wait_for_server(base_url, timeout=15):
+    parts = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(_probe(parts.hostname, parts.port or 80))
+            return
+        except (OSError, asyncio.TimeoutError):
+            time.sleep(0.2)
+    raise RuntimeError(f'Server unter {base_url} nicht erreichbar.')
+
+
+def start_uvicorn(async_views, port, workers):
+    env = dict(os.environ, ASYNC_READ_VIEWS='1' if async_views else '0')
+    command = [
+        sys.executable, '-m', 'uvicorn', 'coderr.asgi:application',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--log-level', 'warning',
+    ]
+    return subprocess.Popen(command, cwd=BASE_DIR, env=env)
+
+
+def report(label, throughput, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f'{label:<8} {throughput:>9.0f} req/s   median {statistics.median(latencies) * 1000:6.2f} ms   '
+          f'p95 {p95 * 1000:6.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=1, help='Anzahl der uvicorn-Worker.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', help='Bereits laufenden Server messen, statt uvicorn zu starten.')
+    args = parser.parse_args()
+
+    if not args.url and importlib.util.find_spec('uvicorn') is None:
+        parser.error('uvicorn ist nicht installiert (pip install uvicorn) – oder --url verwenden.')
+
+    paths, token = prepare_fixtures()
+    if args.url:
+        wait_for_server(args.url)
+        report('server', *asyncio.run(run_load(args.url, paths, token, args.requests, args.concurrency)))
+        return
+
+    for label, async_views in (('sync', False), ('async', True)):
+        server = start_uvicorn(async_views, args.port, args.workers)
+        try:
+            base_url = f'http://127.0.0.1:{args.port}'
+            wait_for_server(base_url)
+            asyncio.run(run_load(base_url, paths, token, min(200, args.requests), args.concurrency))
+            report(label, *asyncio.run(run_load(base_url, paths, token, args.requests, args.concurrency)))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
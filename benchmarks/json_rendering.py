@@ -0,0 +1,151 @@
+"""
+Mikrobenchmark des JSON-Renderings und -Parsings auf repräsentativen Nutzdaten.
+
+- `DRF`: `rest_framework.renderers.JSONRenderer` bzw. `JSONParser` (stdlib `json`).
+- `Fast`: `coderr.renderers.FastJSONRenderer` bzw. `coderr.parsers.FastJSONParser`
+  (orjson, falls installiert – sonst identisch mit DRF).
+
+Die Nutzdaten haben die Form der Serializer-Ausgabe: Angebotskarten mit `Decimal`-`min_price`
+und Paket-URLs, Bestellungen mit Preis, Zeitstempeln und `features`-Listen; dazu Zeilen mit
+rohen `datetime`-/`Decimal`-Werten, die über DRFs Encoder laufen. Vor der Messung wird
+geprüft, dass beide Renderer dieselben Bytes liefern.
+
+Aufruf aus dem Projektverzeichnis (keine Datenbank nötig):
+
+    python benchmarks/json_rendering.py --repeat 200
+"""
+import argparse
+import datetime
+import decimal
+import io
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+
+def offer_cards(count):
+    return {
+        'count': count,
+        'next': 'http://localhost:8000/api/offers/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': index,
+                'user': index % 20 + 1,
+                'title': f'Logo Design {index}',
+                'image': f'http://localhost:8000/media/uploads/logo-{index}.jpg',
+                'image_variants': {
+                    'thumb': f'http://localhost:8000/media/uploads/logo-{index}.jpg.thumb.webp',
+                    'medium': f'http://localhost:8000/media/uploads/logo-{index}.jpg.medium.webp',
+                },
+                'description': 'Professionelles Logo-Design für Unternehmen – inklusive Farbvarianten.',
+                'created_at': '2024-05-01T12:30:15.123456Z',
+                'updated_at': '2024-05-03T08:00:00Z',
+                'details': [{'id': index * 3 + n, 'url': f'/api/offerdetails/{index * 3 + n}/'} for n in range(3)],
+                'min_price': decimal.Decimal('149.50'),
+                'min_delivery_time': 5,
+                'user_details': {'username': f'business{index % 20}', 'first_name': 'Max', 'last_name': 'Müller'},
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def orders(count):
+    return [
+        {
+            'id': index,
+            'customer_user': 7,
+            'business_user': 3,
+            'title': 'Logo Design',
+            'revisions': 3,
+            'delivery_time_in_days': 5,
+            'price': '1234.50',
+            'features': ['Logo Design', 'Visitenkarte', 'Briefpapier', 'Größe A4'],
+            'offer_type': 'premium',
+            'status': 'in_progress',
+            'created_at': '2024-05-01T12:30:15.123456Z',
+            'updated_at': '2024-05-03T08:00:00Z',
+        }
+        for index in range(count)
+    ]
+
+
+def cursor_page(count):
+    """
+    Nutzdaten mit Python-Objekten, die über `encoder_class.default` laufen (datetime, Decimal).
+    """
+    return {
+        'next': None,
+        'results': [
+            {'id': index, 'created_at': datetime.datetime(2024, 5, 1, 12, 30, index % 60, tzinfo=datetime.timezone.utc),
+             'price': decimal.Decimal('99.90'), 'features': {'Seiten': index, 'Format': 'A4'}}
+            for index in range(count)
+        ],
+    }
+
+
+def offer_post(detail_count):
+    return {
+        'title': 'Logo Design',
+        'description': 'Professionelles Logo-Design',
+        'details': [
+            {'title': f'Paket {index}', 'revisions': 2, 'delivery_time_in_days': 5, 'price': 150.0,
+             'features': ['Logo', 'Visitenkarte'], 'offer_type': ['basic', 'standard', 'premium'][index % 3]}
+            for index in range(detail_count)
+        ],
+    }
+
+
+def measure(function, repeat):
+    return min(timeit.repeat(function, number=repeat, repeat=3)) / repeat * 1e6
+
+
+def report(label, before, after):
+    print(f'{label:<28}  {before:>9.1f} µs  {after:>9.1f} µs  {before / after:>5.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='Durchläufe je Messung.')
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from coderr.parsers import FastJSONParser
+    from coderr.renderers import FastJSONRenderer, orjson
+
+    print(f'orjson: {orjson.__version__ if orjson else "nicht installiert (Fallback auf json)"}')
+    print(f'{"Nutzdaten":<28}  {"DRF":>12}  {"Fast":>12}  {"Faktor":>6}')
+    renderers = (JSONRenderer(), FastJSONRenderer())
+    payloads = [
+        ('Angebotsseite (6 Karten)', offer_cards(6)),
+        ('Angebotsseite (100 Karten)', offer_cards(100)),
+        ('Bestellungen (100)', orders(100)),
+        ('Bestellungen (1000)', orders(1000)),
+        ('datetime/Decimal (100)', cursor_page(100)),
+    ]
+    for label, payload in payloads:
+        rendered = [renderer.render(payload, 'application/json') for renderer in renderers]
+        if rendered[0] != rendered[1]:
+            raise SystemExit(f'{label}: Ausgabe weicht von JSONRenderer ab.')
+        # große Nutzdaten seltener wiederholen, damit der Lauf kurz bleibt
+        repeat = max(args.repeat // (len(rendered[0]) // 50000 + 1), 5)
+        report(label, *(measure(lambda: renderer.render(payload, 'application/json'), repeat) for renderer in renderers))
+
+    parsers = (JSONParser(), FastJSONParser())
+    for label, payload in [('POST Angebot (3 Pakete)', offer_post(3)), ('POST Angebot (100 Pakete)', offer_post(100))]:
+        body = JSONRenderer().render(payload)
+        report(label, *(measure(lambda: parser.parse(io.BytesIO(body)), args.repeat) for parser in parsers))
+
+
+if __name__ == '__main__':
+    main()
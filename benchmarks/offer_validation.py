@@ -0,0 +1,77 @@
+"""
+Mikrobenchmark der Validierung verschachtelter Angebots-Payloads (1, 3 und 100 Pakete).
+
+- `vorher`: wie bisher je Payload ein neuer `OfferSerializer` und je Paket ein neuer
+  `OfferDetailSerializer` mit `is_valid()` (Felder werden jedes Mal neu aufgebaut).
+- `nachher`: die einmal pro Prozess aufgebauten Validatoren `offer_validator` bzw. `offer_detail_validator`.
+
+Aufruf aus dem Projektverzeichnis (keine Datenbank nötig):
+
+    python benchmarks/offer_validation.py --repeat 200
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'coderr.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+
+def build_payload(detail_count):
+    offer_types = ['basic', 'standard', 'premium']
+    return {
+        'title': 'Logo Design',
+        'description': 'Professionelles Logo-Design',
+        'details': [
+            {'title': f'Paket {index}', 'revisions': 2, 'delivery_time_in_days': 5, 'price': '150.00',
+             'features': ['Logo', 'Visitenkarte'], 'offer_type': offer_types[index % 3]}
+            for index in range(detail_count)
+        ],
+    }
+
+
+def validate_per_instance(payload):
+    """
+    Bisheriger Ablauf: neue Serializer-Instanzen für das Angebot und jedes Paket.
+    """
+    from offers.api.serializers import OfferDetailSerializer, OfferSerializer
+
+    offer_serializer = OfferSerializer(data={key: value for key, value in payload.items() if key != 'details'})
+    offer_serializer.is_valid(raise_exception=True)
+    for detail in payload['details']:
+        OfferDetailSerializer(data=detail).is_valid(raise_exception=True)
+
+
+def validate_compiled(payload):
+    from offers.api.serializers import offer_validator
+
+    offer_validator.run(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='Durchläufe je Messung.')
+    args = parser.parse_args()
+
+    import django
+    django.setup()
+
+    print(f'{"Pakete":>6}  {"vorher":>12}  {"nachher":>12}  {"Faktor":>6}')
+    for detail_count in (1, 3, 100):
+        payload = build_payload(detail_count)
+        repeat = max(args.repeat // max(detail_count // 10, 1), 5)
+        validate_compiled(payload)
+        results = []
+        for function in (validate_per_instance, validate_compiled):
+            best = min(timeit.repeat(lambda: function(payload), number=repeat, repeat=3))
+            results.append(best / repeat * 1e6)
+        before, after = results
+        print(f'{detail_count:>6}  {before:>9.0f} µs  {after:>9.0f} µs  {before / after:>5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import asyncio
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView, deren Handler als Coroutinen (`async def get`) geschrieben werden.
+
+    Django erkennt die View als asynchron und ruft sie unter ASGI direkt im Event-Loop auf.
+    Nur `initial()` (Authentifizierung, Berechtigungen, Throttling) läuft über `sync_to_async`,
+    da die Authentifizierungsklassen synchron sind. Die Handler selbst nutzen das async ORM
+    (`afirst()`, `acount()`, ...). Diese laufen per `sync_to_async(thread_sensitive=True)` im
+    gemeinsamen Sync-Thread, also auch unter `asyncio.gather` nacheinander; der Gewinn liegt darin,
+    dass der Event-Loop währenddessen andere Requests bedient.
+    Synchrone Handler (z. B. DRFs `options`) werden weiterhin direkt aufgerufen.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def sync_handler(method):
+    """
+    Macht einen synchronen Handler in einer `AsyncAPIView` nutzbar (z. B. `patch`),
+    indem er über `sync_to_async` im Thread des ORM ausgeführt wird.
+    """
+    @functools.wraps(method)
+    async def handler(self, request, *args, **kwargs):
+        return await sync_to_async(method)(self, request, *args, **kwargs)
+    return handler
+
+
+def select_view(async_view, sync_view, **initkwargs):
+    """
+    Gibt `async_view.as_view()` zurück, wenn `ASYNC_READ_VIEWS` aktiv ist, sonst `sync_view.as_view()`.
+
+    Unter WSGI würde jede asynchrone View per `async_to_sync` in einem eigenen Event-Loop laufen,
+    daher sind die async Varianten nur für den Betrieb unter ASGI (z. B. uvicorn) gedacht.
+    """
+    view = async_view if getattr(settings, 'ASYNC_READ_VIEWS', False) else sync_view
+    return view.as_view(**initkwargs)
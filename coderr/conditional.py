@@ -0,0 +1,58 @@
+import functools
+
+from django.views.decorators.http import condition
+
+
+def build_etag(*parts):
+    """
+    Baut einen starken ETag-Wert aus Zählern und Zeitstempeln (z. B. Anzahl und max. `updated_at`).
+    """
+    values = []
+    for part in parts:
+        if hasattr(part, 'timestamp'):
+            part = f'{part.timestamp():.6f}'
+        values.append('-' if part is None else str(part))
+    return ':'.join(values)
+
+
+def conditional_get(method):
+    """
+    Dekorator für `get`-Methoden von API-Views, der bedingte GETs (If-None-Match / If-Modified-Since)
+    beantwortet.
+
+    Die View liefert über `get_validators(request, *args, **kwargs)` ein Tupel
+    `(etag, last_modified)` – typischerweise aus einer einzigen Aggregat-Abfrage.
+    Passt einer der Validatoren, wird direkt 304 zurückgegeben, ohne die eigentliche Abfrage
+    oder den Serializer auszuführen. Ansonsten setzt Djangos `condition` die Header `ETag`
+    und `Last-Modified` an der Antwort. Liefert die View `(None, None)` (z. B. weil das Objekt
+    nicht existiert), läuft die Methode unverändert.
+    """
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        view = condition(
+            etag_func=lambda *_args, **_kwargs: etag,
+            last_modified_func=lambda *_args, **_kwargs: last_modified,
+        )(lambda request, *args, **kwargs: method(self, request, *args, **kwargs))
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def async_conditional_get(method):
+    """
+    Gegenstück zu `conditional_get` für `async def get` in einer `AsyncAPIView`.
+    Die Validatoren liefert die Coroutine `aget_validators(request, *args, **kwargs)`.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_validators(request, *args, **kwargs)
+
+        async def view(request, *args, **kwargs):
+            return await method(self, request, *args, **kwargs)
+
+        view = condition(
+            etag_func=lambda *_args, **_kwargs: etag,
+            last_modified_func=lambda *_args, **_kwargs: last_modified,
+        )(view)
+        return await view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from coderr.images import variant_urls
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Schreibgeschütztes Feld mit den URLs der WebP-Varianten einer Bilddatei (siehe `coderr.images`).
+
+    `source` ist das Datei-Feld des Modells, z. B. `ImageVariantsField(source='image')`. Ohne Bild
+    wird `None` ausgegeben; mit `request` im Kontext sind die URLs – wie bei DRFs `ImageField` – absolut.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return variant_urls(value, self.context.get('request'))
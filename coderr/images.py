@@ -0,0 +1,143 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tif', '.tiff', '.webp'}
+DEFAULT_VARIANTS = {
+    'thumb': 320,
+    'medium': 960,
+}
+WEBP_QUALITY = 80
+DEFAULT_MAX_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _variant_settings():
+    return getattr(settings, 'IMAGE_VARIANTS', {})
+
+
+def get_variant_sizes():
+    """
+    Gibt die Varianten als Dict `{name: maximale Kantenlänge in Pixeln}` zurück.
+    """
+    return _variant_settings().get('SIZES', DEFAULT_VARIANTS)
+
+
+def is_image_name(name):
+    return bool(name) and os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def variant_name(name, variant):
+    """
+    Dateiname einer Variante neben dem Original, z. B. `uploads/logo.jpg` -> `uploads/logo.jpg.thumb.webp`.
+    Die Endung des Originals bleibt erhalten, damit `logo.jpg` und `logo.png` nicht dieselbe Variante teilen.
+    """
+    return f'{name}.{variant}.webp'
+
+
+def variant_urls(file, request=None):
+    """
+    Gibt die URLs aller Varianten einer Bilddatei zurück (`None` ohne Bild).
+
+    Die URLs sind deterministisch und werden nicht auf Existenz geprüft; direkt nach dem Upload
+    können sie kurz fehlen, bis die Varianten im Hintergrund erzeugt wurden.
+    Mit `request` werden – wie bei DRFs ImageField – absolute URLs geliefert.
+    """
+    name = getattr(file, 'name', file)
+    if not is_image_name(name):
+        return None
+    urls = {}
+    for variant in get_variant_sizes():
+        url = default_storage.url(variant_name(name, variant))
+        urls[variant] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+
+def _render_variant(image, size):
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    variant.save(output, format='WEBP', quality=WEBP_QUALITY, method=4)
+    return output.getvalue()
+
+
+def generate_variants(name, force=False, storage=default_storage):
+    """
+    Erzeugt alle Varianten einer Bilddatei als WebP neben dem Original.
+    Vorhandene Varianten werden nur mit `force` neu erzeugt. Gibt die Anzahl erzeugter Varianten zurück.
+    """
+    if not is_image_name(name) or not storage.exists(name):
+        return 0
+    targets = {
+        variant: variant_name(name, variant) for variant in get_variant_sizes()
+        if force or not storage.exists(variant_name(name, variant))
+    }
+    if not targets:
+        return 0
+    try:
+        with storage.open(name, 'rb') as original:
+            image = Image.open(original)
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    except (UnidentifiedImageError, OSError) as error:
+        logger.warning('Bildvarianten für %s konnten nicht erzeugt werden: %s', name, error)
+        return 0
+    sizes = get_variant_sizes()
+    for variant, target in targets.items():
+        content = _render_variant(image, sizes[variant])
+        if storage.exists(target):
+            storage.delete(target)
+        storage.save(target, ContentFile(content))
+    return len(targets)
+
+
+def _generate_variants_safely(name):
+    try:
+        generate_variants(name)
+    except Exception:
+        logger.exception('Fehler beim Erzeugen der Bildvarianten für %s', name)
+
+
+def get_executor():
+    """
+    Gibt den gemeinsamen Thread-Pool für die Variantenerzeugung zurück (beim ersten Aufruf angelegt,
+    Größe über `IMAGE_VARIANTS['MAX_WORKERS']`). Weitere Aufträge warten in dessen Warteschlange.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_variant_settings().get('MAX_WORKERS', DEFAULT_MAX_WORKERS),
+                thread_name_prefix='image-variants',
+            )
+        return _executor
+
+
+def schedule_variants(name):
+    """
+    Erzeugt die Varianten nach dem Commit außerhalb des Requests im gemeinsamen Thread-Pool
+    (bzw. synchron, wenn `IMAGE_VARIANTS['ASYNC']` deaktiviert ist).
+    """
+    if not is_image_name(name):
+        return
+
+    def run():
+        if _variant_settings().get('ASYNC', True):
+            get_executor().submit(_generate_variants_safely, name)
+        else:
+            _generate_variants_safely(name)
+
+    transaction.on_commit(run)
@@ -0,0 +1,138 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+
+def _media_settings():
+    return getattr(settings, 'MEDIA_SERVING', {})
+
+
+def file_etag(stat):
+    """
+    Baut einen starken ETag aus Größe und Änderungszeit (ns) einer Datei – ohne sie zu lesen.
+    """
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """
+    Wertet einen `Range`-Header mit genau einem Byte-Bereich aus.
+
+    Gibt `(start, ende)` (inklusive) zurück, `None`, wenn der Header fehlt oder nicht unterstützt
+    wird (dann wird die ganze Datei gesendet), bzw. `False`, wenn der Bereich nicht erfüllbar ist.
+    """
+    match = RANGE_PATTERN.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if not length or not size:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _iter_file_range(path, start, length):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _content_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding:
+        return 'application/octet-stream'
+    return content_type or 'application/octet-stream'
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Liefert eine Datei aus `MEDIA_ROOT` aus.
+
+    - `ETag` (Größe + mtime) und `Last-Modified` beantworten bedingte GETs mit 304,
+      `Cache-Control` erlaubt Browsern und Proxies, die Datei `MEDIA_SERVING['MAX_AGE']` Sekunden zu cachen.
+    - Mit `MEDIA_SERVING['BACKEND']` = `'x-accel-redirect'` (nginx) bzw. `'x-sendfile'` (Apache, lighttpd)
+      übergibt Django nur einen Header, den Dateiinhalt (inkl. Range) sendet der Webserver.
+    - Ohne Backend wird die Datei per `FileResponse` gestreamt, die Server mit `wsgi.file_wrapper`
+      per `sendfile()` ohne Kopie in den Userspace senden. Ein einzelner `Range`-Bereich wird mit 206 beantwortet.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (OSError, ValueError):
+        raise Http404('Datei nicht gefunden.')
+    if not os.path.isfile(full_path):
+        raise Http404('Datei nicht gefunden.')
+
+    options = _media_settings()
+    backend = options.get('BACKEND')
+    etag = file_etag(stat)
+    headers = HttpResponse()
+    headers['ETag'] = etag
+    headers['Last-Modified'] = http_date(stat.st_mtime)
+    headers['Cache-Control'] = f'public, max-age={options.get("MAX_AGE", DEFAULT_MAX_AGE)}'
+    headers['Accept-Ranges'] = 'bytes'
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime), response=headers)
+    if not_modified is not headers:
+        return not_modified
+
+    if backend:
+        response = HttpResponse(content_type=_content_type(full_path))
+        if backend == 'x-accel-redirect':
+            relative = os.path.relpath(full_path, os.path.abspath(settings.MEDIA_ROOT)).replace(os.sep, '/')
+            prefix = options.get('ACCEL_REDIRECT_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(relative)
+        else:
+            response['X-Sendfile'] = full_path
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range or etag in parse_etags(if_range):
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        if byte_range is None:
+            response = FileResponse(open(full_path, 'rb'), content_type=_content_type(full_path))
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _iter_file_range(full_path, start, end - start + 1),
+                status=206,
+                content_type=_content_type(full_path),
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+
+    for header, value in headers.items():
+        if header != 'Content-Type':
+            response[header] = value
+    return response
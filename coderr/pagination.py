@@ -0,0 +1,184 @@
+import base64
+import binascii
+import datetime
+import decimal
+import heapq
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    """
+    Kodiert die Keyset-Position (Sortierwert(e) und ID) als URL-sicheren String.
+    """
+    payload = [_to_json_value(value) for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """
+    Dekodiert einen Cursor aus `encode_cursor`.
+    Wirft einen ValidationError, wenn der Cursor manipuliert oder unvollständig ist.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValidationError({'detail': 'Ungültiger Cursor.'})
+    if not isinstance(values, list) or len(values) != length:
+        raise ValidationError({'detail': 'Ungültiger Cursor.'})
+    return values
+
+
+def _to_json_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def keyset_ordering(field, descending):
+    """
+    Liefert die Sortierung für eine Keyset-Abfrage: Sortierfeld (NULL-Werte zuletzt) und ID als Tie-Breaker.
+    """
+    if descending:
+        return [F(field).desc(nulls_last=True), '-pk']
+    return [F(field).asc(nulls_last=True), 'pk']
+
+
+def keyset_filter(field, descending, value, pk, nullable=False):
+    """
+    Baut die WHERE-Bedingung für alle Zeilen *nach* der Position (`value`, `pk`)
+    in der Sortierung aus `keyset_ordering`.
+    """
+    after = 'lt' if descending else 'gt'
+    if value is None:
+        return Q(**{f'{field}__isnull': True, f'pk__{after}': pk})
+    condition = Q(**{f'{field}__{after}': value}) | Q(**{field: value, f'pk__{after}': pk})
+    if nullable:
+        condition |= Q(**{f'{field}__isnull': True})
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """
+    Basisklasse für Cursor-Paginierung per Keyset (Sortierfeld + ID).
+
+    Jede Seite kostet eine Abfrage mit `WHERE (feld, id) > (cursor)` und `LIMIT page_size + 1`,
+    unabhängig davon, wie tief geblättert wird, und ohne `COUNT(*)`.
+    Unterklassen legen über `get_ordering()` das Sortierfeld und die Richtung fest.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = None
+    cursor_query_param = 'cursor'
+
+    def get_ordering(self, request, view):
+        """
+        Gibt ein Tupel `(feldname, absteigend)` zurück.
+        """
+        raise NotImplementedError('get_ordering() muss implementiert werden.')
+
+    def get_page_size(self, request):
+        if self.page_size_query_param in request.query_params:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginiert die Vereinigung mehrerer QuerySets desselben Modells.
+
+        Jedes QuerySet wird einzeln per Keyset gefiltert und auf `page_size + 1` Zeilen begrenzt,
+        sodass jede Teilabfrage ihren eigenen Index nutzen kann (statt eines OR über mehrere Spalten).
+        Die sortierten Teilergebnisse werden per `heapq.merge` zusammengeführt und Dubletten entfernt.
+        """
+        self.request = request
+        field, descending = self.get_ordering(request, view)
+        model_field = querysets[0].model._meta.get_field(field)
+        page_size = self.get_page_size(request)
+
+        cursor_filter = None
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = decode_cursor(cursor, 2)
+            if not isinstance(pk, int):
+                raise ValidationError({'detail': 'Ungültiger Cursor.'})
+            if value is not None:
+                try:
+                    value = model_field.to_python(value)
+                except DjangoValidationError:
+                    raise ValidationError({'detail': 'Ungültiger Cursor.'})
+            cursor_filter = keyset_filter(field, descending, value, pk, model_field.null)
+
+        ordering = keyset_ordering(field, descending)
+        parts = []
+        for queryset in querysets:
+            if cursor_filter is not None:
+                queryset = queryset.filter(cursor_filter)
+            parts.append(list(queryset.order_by(*ordering)[:page_size + 1]))
+
+        if len(parts) == 1:
+            rows = parts[0]
+        else:
+            rows = []
+            seen = set()
+            for row in heapq.merge(*parts, key=self._merge_key(field, descending), reverse=descending):
+                if row.pk not in seen:
+                    seen.add(row.pk)
+                    rows.append(row)
+                if len(rows) > page_size:
+                    break
+
+        page = rows[:page_size]
+        self.next_cursor = None
+        if len(rows) > page_size:
+            last = page[-1]
+            self.next_cursor = encode_cursor([getattr(last, field), last.pk])
+        return page
+
+    @staticmethod
+    def _merge_key(field, descending):
+        # Entspricht `keyset_ordering`: NULL-Werte zuletzt, ID als Tie-Breaker
+        if descending:
+            return lambda row: (getattr(row, field) is not None, getattr(row, field), row.pk)
+        return lambda row: (getattr(row, field) is None, getattr(row, field), row.pk)
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,30 @@
+import codecs
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from coderr.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON-Parser, der UTF-8-Bodies mit `orjson` einliest, sofern es installiert ist, und sonst
+    unverändert wie DRFs `JSONParser` arbeitet.
+
+    Lehnt orjson einen Body ab, wird er mit `json` erneut geparst: Ungültiges JSON liefert so
+    dieselbe Fehlermeldung wie bisher, und was nur `json` akzeptiert (z. B. Ganzzahlen über 64 Bit),
+    wird weiterhin angenommen.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,79 @@
+from django.conf import settings
+
+
+def fast_lists_enabled():
+    """
+    Gibt zurück, ob die Listenendpunkte über `RowSerializer` statt über DRF-Serializer ausgeben
+    (Setting `FAST_LIST_SERIALIZERS`).
+    """
+    return getattr(settings, 'FAST_LIST_SERIALIZERS', False)
+
+
+def file_url(storage, name, request=None):
+    """
+    URL einer gespeicherten Datei wie bei DRFs `FileField` (`None` ohne Datei, mit `request` absolut).
+    """
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def _skip_none(to_representation):
+    # Wie `Serializer.to_representation`: `None` wird nicht formatiert, sondern direkt ausgegeben
+    return lambda value: None if value is None else to_representation(value)
+
+
+class RowSerializer:
+    """
+    Schreibgeschützter Listen-Serializer, der die Ausgabe direkt aus `values_list()`-Zeilen baut.
+
+    Ein `ModelSerializer` erzeugt für jede Zeile eine Modellinstanz und läuft über alle Feldobjekte.
+    Hier lädt `rows()` nur die Spalten aus `columns` als `values_list(named=True)`-Zeilen
+    (Tupel mit `__slots__ = ()` und Attributzugriff, daher auch für die Keyset-Paginierung nutzbar),
+    und `to_representation()` baut das Dict in der Feldreihenfolge von `reference`.
+
+    Werte, die DRF formatiert (Zeitstempel, Dezimalzahlen), laufen über die Feldobjekte einer einmal
+    pro Klasse aufgebauten `reference`-Instanz (`formatters`), damit die Ausgabe byteweise mit
+    `reference` übereinstimmt. Die Spalte `pk` muss in `columns` enthalten sein.
+    """
+    reference = None
+    columns = ()
+    formatted_fields = ()
+
+    def __init__(self, instance=None, many=True, context=None):
+        self.instance = instance
+        self.context = context or {}
+
+    @classmethod
+    def rows(cls, queryset):
+        """
+        Gibt das QuerySet als Zeilen mit genau den benötigten Spalten zurück.
+        """
+        return queryset.values_list(*cls.columns, named=True)
+
+    @classmethod
+    def get_formatters(cls):
+        """
+        Gibt `{feldname: formatierfunktion}` für `formatted_fields` zurück (einmal pro Klasse aufgebaut).
+        """
+        formatters = cls.__dict__.get('_formatters')
+        if formatters is None:
+            fields = cls.reference().fields
+            formatters = {name: _skip_none(fields[name].to_representation) for name in cls.formatted_fields}
+            cls._formatters = formatters
+        return formatters
+
+    def prepare(self, rows):
+        """
+        Lädt zusätzliche Daten für alle Zeilen auf einmal (z. B. Relationen), bevor sie ausgegeben werden.
+        """
+
+    def to_representation(self, row):
+        raise NotImplementedError('to_representation() muss implementiert werden.')
+
+    @property
+    def data(self):
+        rows = list(self.instance)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
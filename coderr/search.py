@@ -0,0 +1,125 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+
+
+class FullTextIndex:
+    """
+    Volltextindex als SQLite-FTS5-Schattentabelle zu einem Modell.
+
+    - Die Schattentabelle nutzt die Primärschlüssel des Modells als `rowid`.
+    - `index()`/`remove()` halten sie beim Speichern bzw. Löschen synchron.
+    - `search()` filtert ein QuerySet per Index-Lookup und annotiert `search_rank` (BM25, kleiner = besser).
+
+    Auf anderen Datenbanken fällt `search()` auf `icontains` über die Spalten zurück.
+    """
+    TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+    DELETE_BATCH_SIZE = 500
+
+    def __init__(self, table, model, columns, using='default'):
+        self.table = table
+        self.model = model
+        self.columns = list(columns)
+        self.using = using
+
+    @property
+    def is_available(self):
+        """
+        Gibt zurück, ob die Datenbank den FTS5-Index unterstützt.
+        """
+        return connections[self.using].vendor == 'sqlite'
+
+    def build_match_query(self, term):
+        """
+        Wandelt eine Benutzereingabe in eine FTS5-Abfrage um.
+        Jedes Wort wird gequotet und als Präfix gesucht, alle Wörter müssen vorkommen.
+        """
+        tokens = self.TOKEN_PATTERN.findall(term or '')
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def index(self, instance):
+        """
+        Schreibt die indizierten Spalten eines Objekts in die Schattentabelle (ersetzt alte Einträge).
+        """
+        if not self.is_available:
+            return
+        values = [getattr(instance, column) or '' for column in self.columns]
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [instance.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(self.columns)}) '
+                f'VALUES (%s, {", ".join(["%s"] * len(self.columns))})',
+                [instance.pk, *values],
+            )
+
+    def index_many(self, instances):
+        """
+        Schreibt mehrere Objekte mit gebündelten DELETEs und einem `executemany`-INSERT in die Schattentabelle,
+        z. B. nach einem `bulk_create`, das keine Signale auslöst.
+        """
+        if not self.is_available or not instances:
+            return
+        rows = [[instance.pk, *(getattr(instance, column) or '' for column in self.columns)] for instance in instances]
+        with connections[self.using].cursor() as cursor:
+            for start in range(0, len(rows), self.DELETE_BATCH_SIZE):
+                pks = [row[0] for row in rows[start:start + self.DELETE_BATCH_SIZE]]
+                cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({", ".join(["%s"] * len(pks))})', pks)
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, {", ".join(self.columns)}) '
+                f'VALUES (%s, {", ".join(["%s"] * len(self.columns))})',
+                rows,
+            )
+
+    def remove(self, pk):
+        """
+        Entfernt ein Objekt aus der Schattentabelle.
+        """
+        if not self.is_available:
+            return
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [pk])
+
+    def rebuild(self):
+        """
+        Leert die Schattentabelle und befüllt sie mit einem INSERT ... SELECT aus der Modelltabelle neu.
+        """
+        if not self.is_available:
+            return
+        source_table = self.model._meta.db_table
+        source_columns = ', '.join(f"COALESCE({column}, '')" for column in self.columns)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(self.columns)}) '
+                f'SELECT id, {source_columns} FROM {source_table}'
+            )
+
+    def search(self, queryset, term):
+        """
+        Schränkt das QuerySet auf Treffer für `term` ein.
+
+        Mit FTS5 wird die Schattentabelle per `rowid` gejoint und der BM25-Rang als
+        `search_rank` annotiert. Ohne FTS5 wird wie beim DRF-SearchFilter jedes Wort
+        per `icontains` in mindestens einer Spalte gesucht.
+        """
+        match_query = self.build_match_query(term)
+        if not match_query:
+            return queryset
+        if not self.is_available:
+            return self._search_fallback(queryset, term)
+        source_table = self.model._meta.db_table
+        return queryset.extra(
+            select={'search_rank': f'{self.table}.rank'},
+            tables=[self.table],
+            where=[f'{self.table} MATCH %s', f'{self.table}.rowid = {source_table}.id'],
+            params=[match_query],
+        )
+
+    def _search_fallback(self, queryset, term):
+        for token in self.TOKEN_PATTERN.findall(term):
+            condition = Q()
+            for column in self.columns:
+                condition |= Q(**{f'{column}__icontains': token})
+            queryset = queryset.filter(condition)
+        return queryset
@@ -101,6 +101,32 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Token cache, revocation epoch, offer catalog version and offer list/card caches live here.
+# Set REDIS_URL (e.g. redis://localhost:6379/0, requires `pip install redis`) whenever more than one
+# worker process serves requests: the in-memory fallback is per process, so invalidations
+# (bump_catalog_version, token revocation) would only reach the worker that performed them.
+
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'coderr',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'coderr',
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -145,8 +171,64 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth.authentication.CachedTokenAuthentication',
+        'user_auth.authentication.SignedTokenAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
-}
\ No newline at end of file
+    'PAGE_SIZE': 10,
+    # JSON via orjson when installed, otherwise identical to DRF's JSONRenderer/JSONParser (see coderr.renderers);
+    # replace with rest_framework.renderers.JSONRenderer / rest_framework.parsers.JSONParser to opt out
+    'DEFAULT_RENDERER_CLASSES': [
+        'coderr.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'coderr.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Resolved auth tokens in the Django cache (see user_auth.authentication); TTL in seconds.
+# Invalidation reaches all workers only with a shared cache backend (see CACHES)
+TOKEN_AUTH_CACHE = {
+    'TTL': 300,
+}
+
+# Signed, expiring access tokens (see user_auth.tokens); lifetimes in seconds
+SIGNED_TOKENS = {
+    'ACCESS_LIFETIME': 15 * 60,
+    'REFRESH_LIFETIME': 7 * 24 * 60 * 60,
+    'REVOCATION_RELOAD_INTERVAL': 60,
+}
+
+# Rendered offer list responses for anonymous visitors and per-offer cards (see offers.cache);
+# timeouts in seconds, 0 disables
+OFFER_RESPONSE_CACHE = {
+    'TIMEOUT': 300,
+    'CARD_TIMEOUT': 3600,
+}
+
+# Resized WebP variants of uploaded images (see coderr.images); sizes are the max edge in pixels,
+# MAX_WORKERS bounds the shared background pool that renders them
+IMAGE_VARIANTS = {
+    'SIZES': {'thumb': 320, 'medium': 960},
+    'ASYNC': True,
+    'MAX_WORKERS': 2,
+}
+
+# Route the hot read endpoints (base-info, order counts, offerdetails, profile) to their native
+# async views (see coderr.async_views); only enable when running under ASGI, e.g. uvicorn coderr.asgi:application
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', '').lower() in ('1', 'true', 'yes')
+
+# Serve the offer, order, review and profile lists via coderr.rows.RowSerializer: output is built
+# directly from values_list() rows instead of model instances, byte-identical to the DRF serializers
+FAST_LIST_SERIALIZERS = os.environ.get('FAST_LIST_SERIALIZERS', '').lower() in ('1', 'true', 'yes')
+
+# Serving of MEDIA_ROOT (see coderr.media): BACKEND None streams via Django,
+# 'x-accel-redirect' (nginx, internal location at ACCEL_REDIRECT_PREFIX) or 'x-sendfile' hands off to the web server
+MEDIA_SERVING = {
+    'BACKEND': None,
+    'ACCEL_REDIRECT_PREFIX': '/protected-media/',
+    'MAX_AGE': 30 * 24 * 60 * 60,
+}
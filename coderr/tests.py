@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import json
+import uuid
+from io import BytesIO
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from coderr.parsers import FastJSONParser
+from coderr.renderers import FastJSONRenderer
+
+
+class FastJSONTests(SimpleTestCase):
+    """
+    Prüft, dass `FastJSONRenderer`/`FastJSONParser` dieselben Bytes bzw. Daten liefern wie DRFs JSON-Klassen.
+    """
+    PAYLOAD = {
+        'price': decimal.Decimal('1234.50'),
+        'created_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        'naive': datetime.datetime(2024, 5, 1, 12, 30),
+        'date': datetime.date(2024, 5, 1),
+        'time': datetime.time(8, 15, 30, 500),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'label': gettext_lazy('Bestellung'),
+        'features': {'Größe': ['A4', 3, None, True, 2.5], 'Trenner': 'a\u2028b\u2029c'},
+        'histogram': {1: 0, 5: 2},
+        'pair': (1, 2),
+    }
+
+    def test_render_matches_json_renderer(self):
+        for media_type in (None, 'application/json', 'application/json; indent=4'):
+            with self.subTest(media_type=media_type):
+                self.assertEqual(
+                    FastJSONRenderer().render(self.PAYLOAD, media_type),
+                    JSONRenderer().render(self.PAYLOAD, media_type),
+                )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_orjson_is_used_and_errors_fall_back(self):
+        renderer = FastJSONRenderer()
+        self.assertTrue(renderer.use_orjson('application/json', {}))
+        self.assertFalse(renderer.use_orjson('application/json; indent=4', {}))
+        # Ganzzahlen über 64 Bit kann orjson nicht kodieren
+        payload = {'big': 2 ** 70, 'price': decimal.Decimal('9.99')}
+        self.assertEqual(renderer.render(payload), JSONRenderer().render(payload))
+
+    def test_parse_matches_json_parser(self):
+        body = json.dumps({'offer_detail_id': 1, 'features': ['Logo', 'Größe'], 'price': 12.5, 'big': 2 ** 70}).encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        for invalid in (b'{"a": 1,}', b'[NaN]', b'{"a": "\\ud800"'):
+            with self.subTest(body=invalid):
+                with self.assertRaises(ParseError) as expected:
+                    JSONParser().parse(BytesIO(invalid))
+                with self.assertRaises(ParseError) as error:
+                    FastJSONParser().parse(BytesIO(invalid))
+                self.assertEqual(str(error.exception.detail), str(expected.exception.detail))
+
+    def test_falls_back_without_orjson(self):
+        body = b'{"features": ["Logo"]}'
+        with mock.patch('coderr.renderers.orjson', None), mock.patch('coderr.parsers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.PAYLOAD), JSONRenderer().render(self.PAYLOAD))
+            self.assertEqual(FastJSONParser().parse(BytesIO(body)), {'features': ['Logo']})
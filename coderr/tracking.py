@@ -0,0 +1,116 @@
+import copy
+
+from django.db import models
+
+
+class _Unknown:
+    def __repr__(self):
+        return 'UNKNOWN'
+
+
+UNKNOWN = _Unknown()
+"""Platzhalter für einen alten Wert, der nie aus der Datenbank geladen wurde (z. B. bei `.only()`)."""
+
+
+class DirtyFieldsMixin:
+    """
+    Mixin für Modelle, das sich die aus der Datenbank geladenen Werte merkt.
+
+    - `get_dirty_fields()` liefert die seit dem Laden geänderten Felder samt altem Wert.
+    - `save()` schreibt bei bestehenden Objekten nur die geänderten Spalten (`update_fields`),
+      ohne vorher den alten Stand per SELECT zu lesen. Ohne Änderungen wird gar nicht geschrieben.
+    - `get_auto_update_fields()` bestimmt, welche Zeitstempel bei einem Teil-Update mitgeschrieben werden.
+
+    Signal-Handler für `post_save` sehen die geänderten Felder noch, erst nach dem Speichern
+    wird der neue Stand als geladen übernommen – bei explizitem `update_fields` nur für diese Felder.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_loaded_values()
+        return instance
+
+    def _tracked_value(self, field):
+        value = self.__dict__.get(field.attname)
+        if isinstance(field, models.FileField):
+            return getattr(value, 'name', value) or None
+        if isinstance(field, models.JSONField):
+            return copy.deepcopy(value)
+        return value
+
+    def _snapshot_loaded_values(self, attnames=None):
+        loaded = {} if attnames is None else getattr(self, '_loaded_values', None) or {}
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (attnames is None or field.attname in attnames):
+                loaded[field.attname] = self._tracked_value(field)
+        self._loaded_values = loaded
+
+    def get_loaded_value(self, attname, default=UNKNOWN):
+        """
+        Gibt den zuletzt geladenen bzw. gespeicherten Wert eines Feldes zurück.
+        """
+        loaded = getattr(self, '_loaded_values', None) or {}
+        return loaded.get(attname, default)
+
+    def get_dirty_fields(self):
+        """
+        Gibt ein Dict `{attname: alter Wert}` aller seit dem Laden geänderten Felder zurück.
+        Felder, deren alter Wert nie geladen wurde, erscheinen mit `UNKNOWN`.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        dirty = {}
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if loaded is None or field.attname not in loaded:
+                dirty[field.attname] = UNKNOWN
+            elif self._tracked_value(field) != loaded[field.attname]:
+                dirty[field.attname] = loaded[field.attname]
+        return dirty
+
+    def is_dirty(self, *attnames):
+        """
+        Prüft, ob mindestens eines der angegebenen Felder (bzw. ohne Angabe: irgendein Feld) geändert wurde.
+        """
+        dirty = self.get_dirty_fields()
+        return any(attname in dirty for attname in attnames) if attnames else bool(dirty)
+
+    def get_auto_update_fields(self, dirty_fields):
+        """
+        Gibt die Felder zurück, die bei einem Teil-Update zusätzlich geschrieben werden.
+        Standard: alle `auto_now`-Zeitstempel.
+        """
+        return {field.name for field in self._meta.concrete_fields if getattr(field, 'auto_now', False)}
+
+    def get_update_fields(self):
+        """
+        Gibt die Feldnamen für ein Teil-Update zurück oder `None`, wenn vollständig gespeichert werden muss.
+        """
+        if self._state.adding or getattr(self, '_loaded_values', None) is None:
+            return None
+        dirty = self.get_dirty_fields()
+        if not dirty:
+            return set()
+        names = {self._meta.get_field(attname).name for attname in dirty}
+        return names | self.get_auto_update_fields(dirty)
+
+    def save(self, *args, **kwargs):
+        if not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            update_fields = self.get_update_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self._snapshot_loaded_values()
+        else:
+            # nur geschriebene Felder gelten als gespeichert, andere Änderungen bleiben offen
+            self._snapshot_loaded_values({self._meta.get_field(name).attname for name in update_fields})
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None:
+            self._snapshot_loaded_values()
+        else:
+            self._snapshot_loaded_values({self._meta.get_field(name).attname for name in fields})
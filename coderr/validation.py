@@ -0,0 +1,52 @@
+import threading
+
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.settings import api_settings
+
+
+class CompiledValidator:
+    """
+    Validiert Eingaben mit einer einmal pro Prozess aufgebauten Serializer-Instanz.
+
+    Ein Serializer baut bei jeder Instanziierung seine Felder neu auf (bei `ModelSerializer`
+    inklusive Modell-Introspektion), eigene `__init__`-Anpassungen laufen jedes Mal mit.
+    Hier geschieht das nur beim ersten Aufruf; danach validiert `run()` per `run_validation()`,
+    das keinen Zustand an der Instanz ablegt und daher auch parallel genutzt werden kann.
+
+    Fehler haben dieselbe Struktur wie `serializer.errors` nach `is_valid()`.
+    """
+
+    def __init__(self, serializer_class, **kwargs):
+        self.serializer_class = serializer_class
+        self.kwargs = kwargs
+        self._serializer = None
+        self._lock = threading.Lock()
+
+    @property
+    def serializer(self):
+        if self._serializer is None:
+            with self._lock:
+                if self._serializer is None:
+                    serializer = self.serializer_class(**self.kwargs)
+                    # Felder einmalig aufbauen, bevor die Instanz geteilt wird
+                    serializer.fields
+                    self._serializer = serializer
+        return self._serializer
+
+    def run(self, data):
+        """
+        Gibt die validierten Daten zurück oder wirft einen `ValidationError` mit den Fehlern
+        im Format von `serializer.errors`.
+        """
+        try:
+            return self.serializer.run_validation(data)
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError(self._as_errors(exc.detail))
+
+    @staticmethod
+    def _as_errors(detail):
+        # Entspricht `Serializer.errors`: fehlende Daten werden als "No data provided" gemeldet
+        if isinstance(detail, list) and len(detail) == 1 and getattr(detail[0], 'code', None) == 'null':
+            return {api_settings.NON_FIELD_ERRORS_KEY: [ErrorDetail('No data provided', code='null')]}
+        return detail
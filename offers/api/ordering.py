@@ -6,13 +6,44 @@ class OrderingHelperOffers:
     Utility-Klasse zur Sortierung von Offer-Querysets basierend auf definierten Parametern.
     Diese Klasse stellt eine zentrale Stelle bereit, um Sortierlogik für Angebotlisten zu kapseln.
 
+    `min_price` ist eine indizierte Summary-Spalte des Angebots und wird ohne
+    Aggregation (GROUP BY) sortiert.
+
     Aktuell unterstützte Felder:
     - 'min_price', '-min_price'
     - 'created_at', '-created_at'
     - 'updated_at', '-updated_at'
     """
-    @staticmethod
-    def apply_ordering(queryset: QuerySet, ordering: str) -> QuerySet:
+    ORDERING_MAP = {
+        'min_price': 'min_price',
+        '-min_price': '-min_price',
+        'created_at': 'created_at',
+        '-created_at': '-created_at',
+        'updated_at': 'updated_at',
+        '-updated_at': '-updated_at',
+    }
+    DEFAULT_ORDERING = 'created_at'
+
+    @classmethod
+    def get_ordering_field(cls, ordering: str) -> str:
+        """
+        Übersetzt den Query-Parameter in ein Sortierfeld (Fallback: 'created_at').
+        """
+        return cls.ORDERING_MAP.get(ordering, cls.DEFAULT_ORDERING)
+
+    @classmethod
+    def get_keyset_ordering(cls, ordering: str) -> tuple[str, bool]:
+        """
+        Gibt das Sortierfeld ohne Präfix und die Richtung für die Cursor-Paginierung zurück.
+
+        Returns:
+            tuple[str, bool]: z. B. ('min_price', True) für '-min_price'.
+        """
+        ordering_field = cls.get_ordering_field(ordering)
+        return ordering_field.lstrip('-'), ordering_field.startswith('-')
+
+    @classmethod
+    def apply_ordering(cls, queryset: QuerySet, ordering: str) -> QuerySet:
         """
         Wendet ein Ordering auf ein QuerySet von Angeboten an.
 
@@ -23,13 +54,4 @@ class OrderingHelperOffers:
         Returns:
             QuerySet: Das sortierte QuerySet.
         """
-        ordering_map = {
-            'min_price': 'min_price',
-            '-min_price': '-min_price',
-            'created_at': 'created_at',
-            '-created_at': '-created_at',
-            'updated_at': 'updated_at',
-            '-updated_at': '-updated_at',
-        }
-        ordering_field = ordering_map.get(ordering, 'created_at')
-        return queryset.order_by(ordering_field)
\ No newline at end of file
+        return queryset.order_by(cls.get_ordering_field(ordering))
\ No newline at end of file
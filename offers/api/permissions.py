@@ -13,4 +13,4 @@ class IsOwnerOrAdmin(BasePermission):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return request.user == obj.user or request.user.is_staff
\ No newline at end of file
+        return obj.user_id == request.user.pk or request.user.is_staff
\ No newline at end of file
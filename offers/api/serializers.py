@@ -1,7 +1,12 @@
+from django.db import transaction
 from rest_framework import serializers
+from coderr.fields import ImageVariantsField
+from coderr.images import variant_urls
+from coderr.rows import RowSerializer, file_url
+from coderr.validation import CompiledValidator
+from offers.bulk import build_offer, create_offers
 from offers.models import Offer, OfferDetail
 from django.urls import reverse
-from django.db import models
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -12,36 +17,25 @@ class OfferDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = OfferDetail
         fields = ['title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type', 'id']
+        # Eigene Fehlermeldungen als Teil der Felddefinition, statt sie in jeder Instanz nachträglich zu setzen
         extra_kwargs = {
             'id': {'read_only': True},
+            'delivery_time_in_days': {'error_messages': {
+                'invalid': 'Ungültiger Wert.',
+                'min_value': "Die Lieferzeit muss mindestens 1 Tag betragen.",
+                'required': 'Diese Feld ist erforderlich.'
+            }},
+            'price': {'error_messages': {
+                'invalid': 'Ungültiger Wert.',
+                'min_value': "Die Preis muss mindestens 51,00€ betragen.",
+                'required': 'Diese Feld ist erforderlich.'
+            }},
+            'revisions': {'error_messages': {
+                'invalid': 'Ungültiger Wert für Revisionen.',
+                'min_value': "Revisionen müssen -1 (unbegrenzt) oder eine positive Zahl sein.",
+                'required': 'Diese Feld ist erforderlich.'
+            }},
         }
-    
-    def __init__(self, instance=None, data=..., **kwargs):
-        """
-        Initialisiert den Serializer und erweitert die Standardfehlermeldungen.
-        """
-        super().__init__(instance, data, **kwargs)
-        self._customize_errors_messages()
-    
-    def _customize_errors_messages(self):
-        """
-        Überschreibt die Standardfehlermeldungen für bestimmte Felder.
-        """
-        self.fields['delivery_time_in_days'].error_messages.update({
-            'invalid': 'Ungültiger Wert.',
-            'min_value': "Die Lieferzeit muss mindestens 1 Tag betragen.",
-            'required': 'Diese Feld ist erforderlich.'
-        })
-        self.fields['price'].error_messages.update({
-            'invalid': 'Ungültiger Wert.',
-            'min_value': "Die Preis muss mindestens 51,00€ betragen.",
-            'required': 'Diese Feld ist erforderlich.'
-        })
-        self.fields['revisions'].error_messages.update({
-            'invalid': 'Ungültiger Wert für Revisionen.',
-            'min_value': "Revisionen müssen -1 (unbegrenzt) oder eine positive Zahl sein.",
-            'required': 'Diese Feld ist erforderlich.'
-        })
 
     def validate_delivery_time_in_days(self, value):
         """
@@ -76,6 +70,26 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         return value
 
 
+offer_detail_validator = CompiledValidator(OfferDetailSerializer)
+
+
+def validate_offer_details(details_data):
+    """
+    Validiert die Pakete eines Angebots mit dem einmal aufgebauten `OfferDetailSerializer`.
+    Gibt die validierten Daten zurück oder wirft `{"details": [Fehler je Paket]}`.
+    """
+    errors = []
+    validated_details = []
+    for detail_data in details_data:
+        try:
+            validated_details.append(offer_detail_validator.run(detail_data))
+        except serializers.ValidationError as exc:
+            errors.append(exc.detail)
+    if errors:
+        raise serializers.ValidationError({"details": errors})
+    return validated_details
+
+
 class OfferDetailURLSerializer(serializers.Serializer):
     """
     Serialisiert eine reduzierte Darstellung eines OfferDetail-Objekts,
@@ -105,10 +119,11 @@ class OfferSerializer(serializers.ModelSerializer):
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
     user_details = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time', 'user_details']
         extra_kwargs = {
             'user': {'read_only': True},
         }
@@ -127,35 +142,30 @@ class OfferSerializer(serializers.ModelSerializer):
 
         return representation
     
-    def validate(self, attrs):
+    def to_internal_value(self, data):
         """
-        Validiert die verschachtelten Angebotsdetails manuell.
-        """
-        details_data_list = self.initial_data.get('details', [])
-        errors = []
-        validated_details = []
-        for detail_data in details_data_list:
-            serializer = OfferDetailSerializer(data=detail_data)
-            if serializer.is_valid():
-                validated_details.append(serializer.validated_data)
-            else:
-                errors.append(serializer.errors)
-        
-        if errors:
-            raise serializers.ValidationError({"details": errors})
-        attrs['validated_details'] = validated_details
+        Validiert nach den Angebotsfeldern die verschachtelten Angebotsdetails.
+
+        Die Pakete werden aus den Eingabedaten selbst gelesen (nicht aus `initial_data`),
+        sodass auch eine geteilte Instanz (siehe `offer_validator`) validieren kann.
+        """
+        attrs = super().to_internal_value(data)
+        attrs['validated_details'] = validate_offer_details(data.get('details', []))
         return attrs
     
     def create(self, validated_data):
         """
-        Erstellt ein Offer-Objekt und die zugehörigen OfferDetails.
-        """
-        validated_details = validated_data.pop('validated_details', [])
-        offer = Offer.objects.create(**validated_data)
-
-        for detail in validated_details:
-            OfferDetail.objects.create(offer=offer, **detail)
+        Erstellt ein Offer-Objekt und die zugehörigen OfferDetails in einer Transaktion.
 
+        Die Summary-Spalten werden vor dem INSERT aus den Paketen gesetzt, die Pakete mit
+        einem `bulk_create` angelegt.
+        """
+        offer, details = build_offer(validated_data.pop('user'), validated_data)
+        with transaction.atomic():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
         return offer
     
     def get_details(self, offer):
@@ -169,15 +179,15 @@ class OfferSerializer(serializers.ModelSerializer):
     
     def get_min_price(self, offer):
         """
-        Gibt den niedrigsten Preis aus den Angebotsdetails zurück.
+        Gibt den niedrigsten Preis aus den Angebotsdetails zurück (Summary-Spalte `min_price`).
         """
-        return offer.details.aggregate(models.Min('price'))['price__min']
+        return offer.min_price
     
     def get_min_delivery_time(self, offer):
         """
-        Gibt die kürzeste Lieferzeit aus den Angebotsdetails zurück.
+        Gibt die kürzeste Lieferzeit aus den Angebotsdetails zurück (Summary-Spalte `min_delivery_time`).
         """
-        return offer.details.aggregate(models.Min('delivery_time_in_days'))['delivery_time_in_days__min']
+        return offer.min_delivery_time
     
     def get_user_details(self, offer):
         """
@@ -189,9 +199,105 @@ class OfferSerializer(serializers.ModelSerializer):
             'first_name': user.first_name,
             'last_name': user.last_name
             }
+
     
     
 
+class OfferRowSerializer(RowSerializer):
+    """
+    Schnelle Listenausgabe von `OfferSerializer` (GET) aus `values_list()`-Zeilen (siehe `coderr.rows`).
+
+    Benutzerdaten kommen per Join in derselben Abfrage, die Paket-IDs aller Zeilen mit einer
+    weiteren Abfrage in `prepare()`.
+    """
+    reference = OfferSerializer
+    columns = (
+        'pk', 'user_id', 'title', 'image', 'description', 'created_at', 'updated_at',
+        'min_price', 'min_delivery_time', 'user__username', 'user__first_name', 'user__last_name',
+    )
+    formatted_fields = ('created_at', 'updated_at')
+
+    def prepare(self, rows):
+        self.detail_ids = {row.pk: [] for row in rows}
+        details = OfferDetail.objects.filter(offer__in=list(self.detail_ids)).values_list('offer_id', 'id')
+        for offer_id, detail_id in details:
+            self.detail_ids[offer_id].append(detail_id)
+        self.image_storage = Offer._meta.get_field('image').storage
+
+    def to_representation(self, row):
+        request = self.context.get('request')
+        formatters = self.get_formatters()
+        return {
+            'id': row.pk,
+            'user': row.user_id,
+            'title': row.title,
+            'image': file_url(self.image_storage, row.image, request),
+            'image_variants': variant_urls(row.image, request),
+            'description': row.description,
+            'created_at': formatters['created_at'](row.created_at),
+            'updated_at': formatters['updated_at'](row.updated_at),
+            'details': [
+                {'id': detail_id, 'url': reverse('offerdetails', args=[detail_id])}
+                for detail_id in self.detail_ids[row.pk]
+            ],
+            'min_price': row.min_price,
+            'min_delivery_time': row.min_delivery_time,
+            'user_details': self.get_user_details(row),
+        }
+
+    def get_user_details(self, row):
+        """
+        Benutzerdaten wie `OfferSerializer.get_user_details` (auch von `OfferCardCache` pro Request genutzt).
+        """
+        return {
+            'username': row.user__username,
+            'first_name': row.user__first_name,
+            'last_name': row.user__last_name,
+        }
+
+
+offer_validator = CompiledValidator(OfferSerializer)
+
+
+class OffersBulkPostSerializer(serializers.Serializer):
+    """
+    Serializer für das Anlegen mehrerer Angebote in einem Request.
+
+    Erwartet eine Liste `offers` im Format des einzelnen POST an /api/offers/. Jeder Eintrag
+    wird mit `offer_validator` validiert, Fehler werden pro Eintrag (Index in der Liste) gemeldet;
+    in diesem Fall wird kein Angebot angelegt. Angelegt wird über `offers.bulk.create_offers`.
+    """
+    MAX_ITEMS = 100
+
+    offers = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_ITEMS,
+    )
+
+    def validate_offers(self, value):
+        """
+        Validiert jedes Angebot samt Paketen und gibt die validierten Daten zurück.
+        """
+        errors = {}
+        validated_offers = []
+        for index, offer_data in enumerate(value):
+            try:
+                validated_offers.append(offer_validator.run(offer_data))
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+        if errors:
+            raise serializers.ValidationError(errors)
+        return validated_offers
+
+    def create(self, validated_data):
+        """
+        Legt alle Angebote und Pakete mit je einem `bulk_create` an.
+        """
+        user = validated_data['user']
+        return create_offers([build_offer(user, offer_data) for offer_data in validated_data['offers']])
+
+
 class SingleDetailOfOfferSerializer(serializers.ModelSerializer):
     """
     Serializer zur Darstellung eines einzelnen Angebotsdetails (OfferDetail).
@@ -207,33 +313,38 @@ class SingleFullOfferDetailSerializer(serializers.ModelSerializer):
 
     - Zeigt Basisdaten des Angebots sowie Metainformationen.
     - Gibt die verknüpften Details als URL-basierte Referenzen zurück.
-    - Berechnet den minimalen Preis und die minimale Lieferzeit basierend auf verknüpften OfferDetails.
+    - Liefert den minimalen Preis und die minimale Lieferzeit aus den Summary-Spalten des Angebots.
     - Beinhaltet Validierung und Update-Logik für verschachtelte OfferDetails.
     """
-    details = OfferDetailURLSerializer(many=True)
+    details = OfferDetailURLSerializer(many=True, read_only=True)
     min_price = serializers.SerializerMethodField()
     min_delivery_time = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Offer
-        fields = ['id', 'user', 'title', 'image', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
+        fields = ['id', 'user', 'title', 'image', 'image_variants', 'description', 'created_at', 'updated_at', 'details', 'min_price', 'min_delivery_time']
 
     
     def get_min_price(self, obj):
         """
         Gibt den kleinsten Preis aller verknüpften OfferDetails zurück.
         """
-        return obj.details.aggregate(min_price=models.Min('price'))['min_price']
+        return obj.min_price
     
     def get_min_delivery_time(self, obj):
         """
         Gibt die kürzeste Lieferzeit unter den OfferDetails zurück.
         """
-        return obj.details.aggregate(min_delivery=models.Min('delivery_time_in_days'))['min_delivery']
+        return obj.min_delivery_time
+
     
     def validate(self, attrs):
         """
         Validiert eingebettete Angebotsdetails vor dem Update.
+
+        Jedes Paket wird genau einmal validiert. Auch die Pflichtfelder werden hier geprüft,
+        sodass `update()` nur noch schreibt und ein Fehler nie zu einem halben Update führt.
         """
         allowed_fields = ['title', 'description', 'details']
         incoming_fields = set(self.initial_data.keys())
@@ -242,64 +353,75 @@ class SingleFullOfferDetailSerializer(serializers.ModelSerializer):
         if invalid_fields:
             raise serializers.ValidationError({"detail": [f"Ungültige Felder: {', '.join(invalid_fields)}"]})
 
-
         details_data = self.initial_data.get('details', [])
-        errors = []
-        for detail in details_data:
-            detail_serializer = OfferDetailSerializer(data=detail)
-            if not detail_serializer.is_valid():
-                errors.append(detail_serializer.errors)
-        
-        if errors:
-            raise serializers.ValidationError({"details": errors})
-        attrs['validated_details'] = [
-            detail_serializer.validated_data for detail_serializer in map(lambda d: OfferDetailSerializer(data=d), details_data) if detail_serializer.is_valid()
-        ]
+        if not isinstance(details_data, list):
+            message = serializers.ListSerializer.default_error_messages['not_a_list']
+            raise serializers.ValidationError({'details': [message.format(input_type=type(details_data).__name__)]})
+
+        validated_details = validate_offer_details(details_data)
+        for detail_data in validated_details:
+            self._check_detail_fields(detail_data)
+        attrs['validated_details'] = validated_details
         return attrs
-    
+
+    def _check_detail_fields(self, detail_data):
+        """
+        Prüft offer_type und die für das Speichern eines Pakets nötigen Felder.
+        """
+        required_fields = ['title', 'price', 'revisions', 'delivery_time_in_days', 'features', 'offer_type']
+        allowed_types = {'basic', 'standard', 'premium'}
+        offer_type = detail_data.get('offer_type')
+
+        if not offer_type or offer_type not in allowed_types:
+            raise serializers.ValidationError({
+                'details': [f"Ungültiger oder fehlender offer_type: {offer_type}"]
+            })
+        missing_fields = [f for f in required_fields if f not in detail_data]
+        if missing_fields:
+            raise serializers.ValidationError({
+                'details': [f"Fehlende Felder für {offer_type}: {', '.join(missing_fields)}"]
+            })
+
     def update(self, instance, validated_data):
         """
-        Führt ein partielles Update durch. Wenn Angebotsdetails (details) enthalten sind,
-        wird `_update_details()` aufgerufen.
+        Führt ein partielles Update in einer Transaktion durch.
+
+        Geänderte Pakete werden mit einem `bulk_update`, neue mit einem `bulk_create` geschrieben,
+        die Summary-Spalten aus den Paketen im Speicher berechnet. Das Angebot wird nur mit den
+        geänderten Spalten gespeichert. Die aktuellen Pakete stehen danach in `self.updated_details`.
         """
         details_data = validated_data.pop('validated_details', [])
-        validated_data.pop('details', None)
+        update_fields = set()
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        if details_data:
-            self._update_details(instance, details_data)
-        instance.save()
+            update_fields.add(attr)
+        with transaction.atomic():
+            self.updated_details = list(instance.details.all())
+            if details_data:
+                self._update_details(instance, details_data)
+                instance.set_summary_from_details(self.updated_details)
+                update_fields.update(instance.SUMMARY_FIELDS)
+            instance.save(update_fields=[*update_fields, 'updated_at'])
         return instance
-    
+
     def _update_details(self, instance, details_data):
         """
-        Aktualisiert bestehende oder erstellt neue OfferDetails anhand von offer_type.
+        Aktualisiert bestehende (per offer_type zugeordnete) oder erstellt neue OfferDetails.
         """
-        existing_details = {detail.offer_type: detail for detail in instance.details.all()}
-        required_fields = ['title', 'price', 'revisions', 'delivery_time_in_days', 'features', 'offer_type']
-        allowed_types = {'basic', 'standard', 'premium'}
+        existing_details = {detail.offer_type: detail for detail in self.updated_details}
+        changed_details = []
+        changed_fields = set()
+        new_details = []
         for detail_data in details_data:
-            offer_type = detail_data.get('offer_type')
-
-            if not offer_type or offer_type not in allowed_types:
-                raise serializers.ValidationError({
-                    'details': [f"Ungültiger oder fehlender offer_type: {offer_type}"]
-            })
-            missing_fields = [f for f in required_fields if f not in detail_data]
-            if missing_fields:
-                raise serializers.ValidationError({
-                    'details': [f"Fehlende Felder für {offer_type}: {', '.join(missing_fields)}"]
-                })
-        
-            if offer_type in existing_details:
-                self._update_detail_instance(existing_details.pop(offer_type), detail_data)
-            else:
-                OfferDetail.objects.create(offer=instance, **detail_data)
-    
-    def _update_detail_instance(self, detail_instance, detail_data):
-        """
-        Wendet Updates auf ein bestehendes OfferDetail-Objekt an.
-        """
-        for attr, value in detail_data.items():
-            setattr(detail_instance, attr, value)
-        detail_instance.save()
\ No newline at end of file
+            detail = existing_details.pop(detail_data['offer_type'], None)
+            if detail is None:
+                new_details.append(OfferDetail(offer=instance, **detail_data))
+                continue
+            for attr, value in detail_data.items():
+                setattr(detail, attr, value)
+            changed_details.append(detail)
+            changed_fields.update(detail_data)
+        if changed_details:
+            OfferDetail.objects.bulk_update(changed_details, sorted(changed_fields))
+        if new_details:
+            self.updated_details.extend(OfferDetail.objects.bulk_create(new_details))
\ No newline at end of file
@@ -1,8 +1,10 @@
 from django.urls import path
+from coderr.async_views import select_view
 from . import views
 
 urlpatterns = [
     path('offers/', views.OffersList.as_view(), name='offers list'),
+    path('offers/bulk/', views.OffersBulkCreateView.as_view(), name='offers bulk'),
     path('offers/<int:pk>/', views.OfferDetailsView.as_view(), name='offersingle'),
-    path('offerdetails/<int:pk>/', views.OfferSingleView.as_view(), name='offerdetails'),
+    path('offerdetails/<int:pk>/', select_view(views.AsyncOfferSingleView, views.OfferSingleView), name='offerdetails'),
 ]
\ No newline at end of file
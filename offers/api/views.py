@@ -1,20 +1,27 @@
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from functools import partial
+
+from django.core.paginator import Paginator as DjangoPaginator
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from offers.models import Offer, OfferDetail
-from django.db.models import Min
-from .serializers import OfferSerializer
+from .serializers import OfferRowSerializer, OfferSerializer
 from offers.api.ordering import OrderingHelperOffers
+from coderr.async_views import AsyncAPIView
+from coderr.conditional import async_conditional_get, build_etag, conditional_get
+from coderr.pagination import KeysetPagination
+from coderr.rows import fast_lists_enabled
+from offers.cache import offer_card_cache, offer_list_cache
+from offers.search import offer_search_index
 from offers.api.permissions import IsOwnerOrAdmin
-from django.shortcuts import get_object_or_404
-from offers.api.serializers import SingleFullOfferDetailSerializer, OfferDetailSerializer, SingleDetailOfOfferSerializer
+from django.shortcuts import aget_object_or_404, get_object_or_404
+from offers.api.serializers import SingleFullOfferDetailSerializer, OfferDetailSerializer, SingleDetailOfOfferSerializer, OffersBulkPostSerializer
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
-from django.utils.timezone import now
+from django.db.models import Count, Max, prefetch_related_objects
 from rest_framework.exceptions import PermissionDenied, ValidationError
 
 
@@ -29,43 +36,150 @@ class BusinessProfileRequiredException(APIException):
     default_code = 'business_Profile_required'
 
 
+class CountedPaginator(DjangoPaginator):
+    """
+    Django-Paginator, der eine bereits bekannte Gesamtanzahl übernimmt statt erneut COUNT(*) auszuführen.
+    """
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.__dict__['count'] = count
+
+
 class OfferPagination(PageNumberPagination):
     """
     Paginierungsklasse für Angebote.
     Erlaubt Steuerung der Seitenanzahl via QueryParam ?page_size=
+    Hat die View die Anzahl bereits ermittelt (`list_count`, siehe ETag), wird sie wiederverwendet.
     """
     page_size = 6
     page_size_query_param = 'page_size'
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = partial(CountedPaginator, count=getattr(view, 'list_count', None))
+        return super().paginate_queryset(queryset, request, view)
+
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Cursor-Paginierung für Angebote (aktiviert über ?pagination=cursor).
+    Blättert per Keyset über die Sortierung aus `ordering` (updated_at, created_at, min_price) plus ID,
+    ohne COUNT(*) und ohne OFFSET.
+    """
+    page_size = 6
+
+    def get_ordering(self, request, view):
+        return OrderingHelperOffers.get_keyset_ordering(view.get_get_ordering())
+
 
 class OffersList(ListCreateAPIView):
     """
     API-View für:
     - GET: Auflisten aller Angebote mit optionalen Filtern (creator_id, Preis, Lieferzeit, Suche, Sortierung)
+      Die Suche (`?search=`) läuft über den FTS5-Volltextindex und sortiert ohne `ordering` nach Relevanz.
     - POST: Erstellen eines neuen Angebots (nur für Business-User)
     """
     # permission_classes = [IsAuthenticated]
     permission_classes = [AllowAny]
-    queryset = Offer.objects.annotate(min_price=Min('details__price'))
+    queryset = Offer.objects.all()
     serializer_class = OfferSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend]
     pagination_class = OfferPagination
     filterset_fields = ['user']
-    search_fields = ['title', 'description']
 
-    ALLOWED_QUERY_PARAMS = {'creator_id', 'min_price', 'max_delivery_time', 'ordering', 'search', 'page_size'}
+    ALLOWED_QUERY_PARAMS = {'creator_id', 'min_price', 'max_delivery_time', 'ordering', 'search', 'page_size', 'pagination', 'cursor'}
+    PAGINATION_MODES = {'page': OfferPagination, 'cursor': OfferCursorPagination}
+
+    @property
+    def paginator(self):
+        """
+        Wählt die Paginierung anhand von ?pagination= (Standard: 'page', optional: 'cursor').
+        """
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get('pagination', 'page')
+            if mode not in self.PAGINATION_MODES:
+                raise ValidationError({"detail": f"pagination muss einer der Werte {', '.join(self.PAGINATION_MODES)} sein."})
+            self._paginator = self.PAGINATION_MODES[mode]()
+        return self._paginator
+
+    def get(self, request, *args, **kwargs):
+        """
+        Anonyme JSON-Anfragen werden – nach Prüfung der Query-Parameter – aus dem Antwort-Cache bedient,
+        ohne die Datenbank zu berühren. Fehlt der Eintrag, wird die Antwort berechnet und in
+        `finalize_response` abgelegt. Andere Formate (Browsable API) laufen am Cache vorbei.
+        """
+        self.response_cache_key = None
+        if offer_list_cache.is_cacheable(request):
+            self._validate_query_params()
+            self.response_cache_key = offer_list_cache.get_key(request)
+            cached_response = offer_list_cache.fetch(self.response_cache_key, request)
+            if cached_response is not None:
+                self.response_cache_key = None
+                return cached_response
+        return self.get_uncached(request, *args, **kwargs)
+
+    @conditional_get
+    def get_uncached(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Baut die Seite aus gecachten Angebotskarten; nur fehlende Karten werden serialisiert
+        (und nur für diese werden die Pakete geladen). Mit `FAST_LIST_SERIALIZERS` werden statt
+        Modellinstanzen nur die benötigten Spalten geladen (`OfferRowSerializer`).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        if fast_lists_enabled():
+            queryset = OfferRowSerializer.rows(queryset)
+            serializer_class = OfferRowSerializer
+        page = self.paginate_queryset(queryset)
+        offers = list(queryset) if page is None else page
+        data = offer_card_cache.render(offers, serializer_class, self.get_serializer_context())
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, 'response_cache_key', None) and response.status_code == 200:
+            offer_list_cache.store(self.response_cache_key, response)
+        return response
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        ETag aus Anzahl und jüngstem `updated_at` der gefilterten Angebote sowie dem jüngsten
+        `updated_at` der Profile ihrer Anbieter (eine Aggregat-Abfrage). Letzteres deckt
+        `user_details` ab: Umbenennungen am User schreiben `Profile.updated_at` fort
+        (siehe `user_auth.signals.sync_profile_username`).
+
+        Ein `Last-Modified` wird für die Liste nicht gesetzt, da das Löschen eines Angebots
+        den jüngsten Zeitstempel nicht verändert. Mit `?pagination=cursor` gibt es keine
+        Validatoren, damit die Keyset-Paginierung ohne Zählung über alle Treffer auskommt.
+        """
+        if request.query_params.get('pagination') == 'cursor':
+            return None, None
+        summary = self.get_queryset().order_by().aggregate(
+            count=Count('id'), last_modified=Max('updated_at'), owners_modified=Max('user__profile__updated_at'),
+        )
+        self.list_count = summary['count']
+        return build_etag('offers', summary['count'], summary['last_modified'], summary['owners_modified']), None
 
     def get_queryset(self):
         """
-        Gibt die Angebotsliste mit Annotationen zurück.
+        Gibt die Angebotsliste zurück.
         - validiert Query-Parameter
         - filtert nach optionalen Parametern
         - wendet Sortierung an
         """        
         self._validate_query_params()
 
-        queryset = Offer.objects.annotate(min_price=Min('details__price'), max_delivery_time=Min('details__delivery_time_in_days'))
+        queryset = Offer.objects.select_related('user')
         queryset = self._filter_queryset(queryset)
+        queryset = self._search_queryset(queryset)
+        if self._is_ranked_search():
+            return queryset.order_by('search_rank', 'id')
         ordering = self.get_get_ordering()
 
         return OrderingHelperOffers.apply_ordering(queryset, ordering)
@@ -89,6 +203,8 @@ class OffersList(ListCreateAPIView):
         - creator_id
         - min_price
         - max_delivery_time
+
+        Preis und Lieferzeit werden gegen die indizierten Summary-Spalten des Angebots gefiltert.
         """
         params = self.request.query_params
 
@@ -114,10 +230,29 @@ class OffersList(ListCreateAPIView):
                 max_delivery_time = int(max_delivery_time)
             except ValueError:
                 raise ValidationError({"detail": "max_delivery_time muss eine ganze Zahl sein."})
-            queryset = queryset.filter(max_delivery_time__lte=max_delivery_time)
+            queryset = queryset.filter(min_delivery_time__lte=max_delivery_time)
 
         return queryset
     
+    def _search_queryset(self, queryset):
+        """
+        Wendet den Suchbegriff (`search`) über den Volltextindex auf Titel und Beschreibung an.
+        """
+        return offer_search_index.search(queryset, self.request.query_params.get('search', ''))
+
+    def _is_ranked_search(self):
+        """
+        Nach Relevanz wird nur sortiert, wenn gesucht wird und keine explizite Sortierung angegeben ist.
+        Die Cursor-Paginierung blättert immer über `ordering`, da der Rang kein stabiler Keyset-Wert ist.
+        """
+        params = self.request.query_params
+        return (
+            offer_search_index.is_available
+            and bool(offer_search_index.build_match_query(params.get('search', '')))
+            and 'ordering' not in params
+            and params.get('pagination') != 'cursor'
+        )
+
     def get_get_ordering(self):
         """
         Gibt das Sortierfeld zurück (default: 'updated_at').
@@ -146,6 +281,30 @@ class OffersList(ListCreateAPIView):
             raise BusinessProfileRequiredException()
         serializer.save(user=user)
 
+class OffersBulkCreateView(APIView):
+    """
+    API-Endpunkt zum Anlegen mehrerer Angebote in einem Request (nur für Business-User).
+
+    - POST: {"offers": [{"title": ..., "description": ..., "details": [...]}, ...]}
+      legt alle Angebote in einer Transaktion an oder – bei Fehlern – keines.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        """
+        Erstellt alle Angebote und gibt sie wie beim einzelnen POST inklusive Paketen zurück.
+        """
+        profile = getattr(request.user, 'profile', None)
+        if not profile or profile.type != 'business':
+            raise BusinessProfileRequiredException()
+        serializer = OffersBulkPostSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        offers = serializer.save(user=request.user)
+        prefetch_related_objects(offers, 'details')
+        data = OfferSerializer(offers, many=True, context={'request': request}).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
 class OfferDetailsView(RetrieveUpdateDestroyAPIView):
     """
     API-View für ein einzelnes Angebot (GET, PATCH, DELETE).
@@ -155,6 +314,33 @@ class OfferDetailsView(RetrieveUpdateDestroyAPIView):
     serializer_class = SingleFullOfferDetailSerializer
     permission_classes = [IsAuthenticated]
 
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_validators(self, request, pk, *args, **kwargs):
+        """
+        ETag und Last-Modified aus `updated_at` des Angebots.
+        Änderungen an den Paketen speichern das Angebot mit und verändern damit `updated_at`.
+        Das geladene Angebot wird von `get_object()` wiederverwendet.
+        """
+        self.validated_offer = Offer.objects.filter(pk=pk).first()
+        if self.validated_offer is None:
+            return None, None
+        updated_at = self.validated_offer.updated_at
+        return build_etag('offer', pk, updated_at), updated_at
+
+    def get_object(self):
+        """
+        Verwendet bei GET das bereits für die Validatoren geladene Angebot und lädt nur noch die Pakete.
+        """
+        offer = getattr(self, 'validated_offer', None)
+        if offer is None:
+            return super().get_object()
+        self.check_object_permissions(self.request, offer)
+        prefetch_related_objects([offer], 'details')
+        return offer
+
     def get_permissions(self):
         """
         PATCH erlaubt nur Owner/Admin – ansonsten Standardrechte.
@@ -173,14 +359,13 @@ class OfferDetailsView(RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        instance.updated_at = now()
-        instance.refresh_from_db()
 
+        # Antwort aus den Objekten im Speicher, ohne Angebot oder Pakete neu zu laden
         updated_data = {
             'id': instance.id,
-            'title': serializer.validated_data.get('title', instance.title),
-            'description': serializer.validated_data.get('description', instance.description),
-            'details': OfferDetailSerializer(instance.details.all(), many=True).data,
+            'title': instance.title,
+            'description': instance.description,
+            'details': OfferDetailSerializer(sorted(serializer.updated_details, key=lambda detail: detail.pk), many=True).data,
             'image': instance.image.url if instance.image else None
         }
 
@@ -218,12 +403,45 @@ class OfferSingleView(APIView):
     Liefert die Detaildaten eines einzelnen `OfferDetail`-Objekts anhand seiner ID.
     """
     permission_classes = [IsAuthenticated]
+
+    def get_validators(self, request, pk, *args, **kwargs):
+        """
+        ETag und Last-Modified aus `updated_at` des zugehörigen Angebots.
+        """
+        self.offer_detail = OfferDetail.objects.select_related('offer').filter(pk=pk).first()
+        if self.offer_detail is None:
+            return None, None
+        updated_at = self.offer_detail.offer.updated_at
+        return build_etag('offerdetail', pk, updated_at), updated_at
+
+    @conditional_get
     def get(self, request, pk, format=None):
         """
         Holt das OfferDetail mit gegebener ID und serialisiert es vollständig.
         Nur für authentifizierte Nutzer sichtbar.
         """
-        offer = get_object_or_404(OfferDetail, id=pk)
+        offer = self.offer_detail or get_object_or_404(OfferDetail, id=pk)
+        serializer = SingleDetailOfOfferSerializer(offer)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncOfferSingleView(AsyncAPIView, OfferSingleView):
+    """
+    Async Variante von `OfferSingleView` für den Betrieb unter ASGI (siehe `ASYNC_READ_VIEWS`).
+    """
+
+    async def aget_validators(self, request, pk, *args, **kwargs):
+        """
+        ETag und Last-Modified aus `updated_at` des zugehörigen Angebots.
+        """
+        self.offer_detail = await OfferDetail.objects.select_related('offer').filter(pk=pk).afirst()
+        if self.offer_detail is None:
+            return None, None
+        updated_at = self.offer_detail.offer.updated_at
+        return build_etag('offerdetail', pk, updated_at), updated_at
+
+    @async_conditional_get
+    async def get(self, request, pk, format=None):
+        offer = self.offer_detail or await aget_object_or_404(OfferDetail, id=pk)
         serializer = SingleDetailOfOfferSerializer(offer)
         return Response(serializer.data, status=status.HTTP_200_OK)
-        
@@ -0,0 +1,48 @@
+from django.db import transaction
+
+from baseinfo.models import PlatformStats
+from coderr.images import schedule_variants
+from offers.cache import bump_catalog_version
+from offers.models import Offer, OfferDetail
+from offers.search import offer_search_index
+
+
+def build_offer(user, validated_data):
+    """
+    Baut ein Angebot samt Paketen aus validierten Daten von `OfferSerializer` im Speicher auf.
+    Die Summary-Spalten werden direkt aus den Paketen gesetzt. Gibt `(offer, details)` zurück.
+    """
+    validated_data = dict(validated_data)
+    details = [OfferDetail(**detail) for detail in validated_data.pop('validated_details', [])]
+    validated_data['user'] = user
+    offer = Offer(**validated_data)
+    offer.set_summary_from_details(details)
+    return offer, details
+
+
+def create_offers(entries, batch_size=None):
+    """
+    Legt mehrere Angebote in einer Transaktion mit je einem `bulk_create` für Angebote und Pakete an.
+
+    `entries` ist eine Liste von `(offer, details)`-Paaren aus `build_offer`. Da `bulk_create` keine
+    Signale auslöst, werden Volltextindex, `PlatformStats`, Katalogversion und Bildvarianten hier
+    direkt fortgeschrieben. Gibt die angelegten Angebote zurück.
+    """
+    if not entries:
+        return []
+    with transaction.atomic():
+        offers = Offer.objects.bulk_create([offer for offer, _ in entries], batch_size=batch_size)
+        details = []
+        for offer, offer_details in entries:
+            for detail in offer_details:
+                detail.offer = offer
+                details.append(detail)
+        OfferDetail.objects.bulk_create(details, batch_size=batch_size)
+
+        offer_search_index.index_many(offers)
+        PlatformStats.increment(offer_count=len(offers))
+        bump_catalog_version()
+        for offer in offers:
+            if offer.image:
+                schedule_variants(offer.image.name)
+    return offers
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from coderr.rows import RowSerializer
+
+
+CATALOG_VERSION_KEY = 'offers:catalog_version'
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Vary', 'Allow')
+
+_cache_settings = getattr(settings, 'OFFER_RESPONSE_CACHE', {})
+RESPONSE_CACHE_TIMEOUT = _cache_settings.get('TIMEOUT', 300)
+CARD_CACHE_TIMEOUT = _cache_settings.get('CARD_TIMEOUT', 3600)
+
+
+def get_catalog_version():
+    """
+    Gibt die aktuelle Katalogversion zurück.
+    Fehlt der Schlüssel (z. B. nach einer Verdrängung aus dem Cache), wird mit der aktuellen Zeit
+    in Nanosekunden neu begonnen, damit keine alte Version wiederverwendet wird.
+    """
+    return cache.get_or_set(CATALOG_VERSION_KEY, time.time_ns, timeout=None)
+
+
+def bump_catalog_version():
+    """
+    Erhöht die Katalogversion und macht damit alle gecachten Angebotslisten ungültig.
+
+    Es wird sofort und nach dem Commit erhöht: Antworten, die zwischen Schreiben und Commit
+    noch mit altem Stand unter der neuen Version gecacht wurden, werden so ebenfalls verworfen.
+    Alle Worker sehen die neue Version nur mit einem gemeinsamen Cache (`REDIS_URL`, siehe `CACHES`).
+    """
+    _incr_catalog_version()
+    transaction.on_commit(_incr_catalog_version)
+
+
+def _incr_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+class OfferListResponseCache:
+    """
+    Cache fertig gerenderter Antworten der Angebotsliste für anonyme Besucher.
+
+    Der Schlüssel besteht aus Katalogversion, Renderer-Format, Schema und Host (die Paginierungslinks
+    sind absolute URLs) sowie den sortierten Query-Parametern. Jede Änderung an Angeboten oder
+    Paketen erhöht die Katalogversion, alte Einträge laufen über `RESPONSE_CACHE_TIMEOUT` aus.
+
+    Gecacht werden nur die Formate aus `CACHED_FORMATS`: Die HTML-Seite der Browsable API enthält
+    einen CSRF-Token pro Besucher und setzt dessen Cookie, darf also nicht geteilt werden.
+    """
+    CACHED_FORMATS = ('json',)
+
+    def __init__(self, prefix='offers:list', timeout=RESPONSE_CACHE_TIMEOUT):
+        self.prefix = prefix
+        self.timeout = timeout
+
+    @property
+    def enabled(self):
+        return bool(self.timeout)
+
+    def is_cacheable(self, request):
+        """
+        Gibt zurück, ob die Antwort auf `request` aus dem Cache kommen bzw. dort abgelegt werden darf
+        (anonymer Besucher, Format aus `CACHED_FORMATS`).
+        """
+        return (
+            self.enabled and not request.user.is_authenticated
+            and request.accepted_renderer.format in self.CACHED_FORMATS
+        )
+
+    def get_key(self, request):
+        params = sorted((name, sorted(request.query_params.getlist(name))) for name in request.query_params)
+        digest = hashlib.sha1(json.dumps(params).encode()).hexdigest()
+        return ':'.join([
+            self.prefix, str(get_catalog_version()), request.accepted_renderer.format,
+            request.scheme, request.get_host(), digest,
+        ])
+
+    def fetch(self, key, request):
+        """
+        Gibt die gecachte Antwort zurück (bzw. 304, wenn der ETag passt) oder `None`.
+        """
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        etag = entry['headers'].get('ETag')
+        if etag and etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry['content'])
+        for header, value in entry['headers'].items():
+            if header != 'Content-Type' or response.status_code != 304:
+                response[header] = value
+        return response
+
+    def store(self, key, response):
+        """
+        Legt eine gerenderte 200-Antwort im Cache ab.
+        """
+        response.render()
+        cache.set(key, {
+            'content': response.content,
+            'headers': {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+        }, timeout=self.timeout)
+
+
+offer_list_cache = OfferListResponseCache()
+
+
+class OfferCardCache:
+    """
+    Cache der serialisierten Angebotskarten (ein Dict pro Angebot) für Listenseiten.
+
+    Der Schlüssel besteht aus Schema, Host (Bild-URLs sind absolut), Angebots-ID und `updated_at`;
+    jede Änderung am Angebot erzeugt damit automatisch einen neuen Schlüssel. Eine Seite wird per
+    `get_many` zusammengesetzt, nur fehlende Karten werden gerendert – erst dann werden auch deren
+    Pakete nachgeladen. Die Karten von `OfferRowSerializer` sind identisch, daher teilen sich beide
+    Ausgabewege den Cache.
+
+    Die Felder aus `PER_REQUEST_FIELDS` (die Benutzerdaten des Anbieters) gehören nicht zum Angebot
+    und ändern `updated_at` nicht. Sie werden daher nicht gecacht, sondern bei jedem Request über
+    `get_<feld>()` des Serializers aus dem bereits geladenen User bzw. der Zeile ergänzt.
+    """
+    PER_REQUEST_FIELDS = ('user_details',)
+
+    def __init__(self, prefix='offers:card', timeout=CARD_CACHE_TIMEOUT):
+        self.prefix = prefix
+        self.timeout = timeout
+
+    @property
+    def enabled(self):
+        return bool(self.timeout)
+
+    def get_key(self, offer, request):
+        return ':'.join([self.prefix, request.scheme, request.get_host(), str(offer.pk), offer.updated_at.isoformat()])
+
+    def render(self, offers, serializer_class, context):
+        """
+        Gibt die serialisierten Karten der Angebote in der übergebenen Reihenfolge zurück.
+        """
+        if not self.enabled:
+            return self.serialize(offers, serializer_class, context)
+        request = context['request']
+        keys = {offer.pk: self.get_key(offer, request) for offer in offers}
+        cards = cache.get_many(list(keys.values()))
+        misses = [offer for offer in offers if keys[offer.pk] not in cards]
+        if misses:
+            rendered = {
+                keys[offer.pk]: self.strip(card)
+                for offer, card in zip(misses, self.serialize(misses, serializer_class, context))
+            }
+            cache.set_many(rendered, timeout=self.timeout)
+            cards.update(rendered)
+        serializer = serializer_class(context=context)
+        getters = [(field, getattr(serializer, f'get_{field}')) for field in self.PER_REQUEST_FIELDS]
+        return [
+            {**cards[keys[offer.pk]], **{field: getter(offer) for field, getter in getters}}
+            for offer in offers
+        ]
+
+    def strip(self, card):
+        """
+        Gibt die Karte ohne die Felder aus `PER_REQUEST_FIELDS` zurück (so wird sie gecacht).
+        """
+        return {field: value for field, value in card.items() if field not in self.PER_REQUEST_FIELDS}
+
+    @staticmethod
+    def serialize(offers, serializer_class, context):
+        """
+        Serialisiert Angebote (Modellinstanzen mit nachgeladenen Paketen) oder Zeilen eines `RowSerializer`,
+        der seine Pakete selbst lädt.
+        """
+        if not issubclass(serializer_class, RowSerializer):
+            prefetch_related_objects(offers, 'details')
+        return serializer_class(offers, many=True, context=context).data
+
+
+offer_card_cache = OfferCardCache()
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from coderr.images import generate_variants
+from offers.models import Offer
+from user_auth.models import Profile
+
+
+class Command(BaseCommand):
+    """
+    Erzeugt die WebP-Varianten für alle vorhandenen Angebotsbilder und Profilbilder.
+    """
+    help = 'Erzeugt fehlende Bildvarianten (Thumbnails, WebP) für Angebote und Profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Vorhandene Varianten neu erzeugen.')
+
+    def handle(self, *args, **options):
+        names = set(Offer.objects.exclude(image='').exclude(image__isnull=True).values_list('image', flat=True))
+        names |= set(Profile.objects.exclude(file='').exclude(file__isnull=True).values_list('file', flat=True))
+        created = 0
+        for name in sorted(names):
+            created += generate_variants(name, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'{created} Bildvarianten für {len(names)} Dateien erzeugt.'))
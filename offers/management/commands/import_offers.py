@@ -0,0 +1,89 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from offers.api.serializers import offer_validator
+from offers.bulk import build_offer, create_offers
+
+
+IMPORT_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    """
+    Importiert Angebote zeilenweise aus einer NDJSON-Datei.
+
+    Jede Zeile hat das Format des POST an /api/offers/ (`title`, `description`, `details`),
+    optional ergänzt um `user` (ID des Business-Users, sonst `--user`) und `image`
+    (Pfad einer bereits in MEDIA_ROOT liegenden Datei). Die Datei wird gestreamt und in
+    Blöcken von `--chunk-size` Angeboten mit je einer Transaktion angelegt.
+    Ungültige Zeilen werden gemeldet und übersprungen.
+    """
+    help = 'Importiert Angebote samt Paketen aus einer NDJSON-Datei.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="NDJSON-Datei ('-' für stdin).")
+        parser.add_argument('--user', type=int, help='ID des Business-Users für Zeilen ohne eigenes `user`.')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        self.business_users = {}
+        if options['user'] is not None and self.get_business_user(options['user']) is None:
+            raise CommandError(f"User {options['user']} existiert nicht oder hat kein Business-Profil.")
+
+        created = skipped = 0
+        chunk = []
+        source = sys.stdin if options['path'] == '-' else open(options['path'], encoding='utf-8')
+        try:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    chunk.append(self.build_entry(line, options['user']))
+                except ValueError as error:
+                    skipped += 1
+                    self.stderr.write(f'Zeile {line_number}: {error}')
+                    continue
+                if len(chunk) >= options['chunk_size']:
+                    created += len(create_offers(chunk))
+                    chunk = []
+            created += len(create_offers(chunk))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        self.stdout.write(self.style.SUCCESS(f'{created} Angebote importiert, {skipped} Zeilen übersprungen.'))
+
+    def get_business_user(self, user_id):
+        """
+        Lädt einen Business-User einmalig und merkt sich das Ergebnis (auch `None`).
+        """
+        if user_id not in self.business_users:
+            self.business_users[user_id] = User.objects.filter(pk=user_id, profile__type='business').first()
+        return self.business_users[user_id]
+
+    def build_entry(self, line, default_user_id):
+        """
+        Validiert eine Zeile und baut daraus `(offer, details)`. Wirft `ValueError` bei ungültigen Daten.
+        """
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f'Ungültiges JSON ({error.msg}).')
+        if not isinstance(data, dict):
+            raise ValueError('Jede Zeile muss ein JSON-Objekt sein.')
+        user_id = data.pop('user', default_user_id)
+        image = data.pop('image', None)
+        user = self.get_business_user(user_id) if isinstance(user_id, int) else None
+        if user is None:
+            raise ValueError(f'User {user_id} existiert nicht oder hat kein Business-Profil.')
+        try:
+            validated_data = offer_validator.run(data)
+        except ValidationError as error:
+            raise ValueError(json.dumps(error.detail, ensure_ascii=False))
+        offer, details = build_offer(user, validated_data)
+        if image:
+            offer.image = image
+        return offer, details
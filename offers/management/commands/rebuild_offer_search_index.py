@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from offers.search import offer_search_index
+
+
+class Command(BaseCommand):
+    """
+    Baut den FTS5-Volltextindex über Titel und Beschreibung der Angebote neu auf.
+    """
+    help = 'Baut den Volltextindex der Angebote neu auf.'
+
+    def handle(self, *args, **options):
+        if not offer_search_index.is_available:
+            self.stdout.write(self.style.WARNING('Die Datenbank unterstützt keinen FTS5-Index.'))
+            return
+        offer_search_index.rebuild()
+        self.stdout.write(self.style.SUCCESS('Volltextindex der Angebote neu aufgebaut.'))
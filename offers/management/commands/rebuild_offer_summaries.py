@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from offers.cache import bump_catalog_version
+from offers.models import Offer
+
+
+class Command(BaseCommand):
+    """
+    Baut die denormalisierten Summary-Spalten (min_price, min_delivery_time,
+    details_count) aller oder ausgewählter Angebote aus den OfferDetails neu auf.
+    Wurde etwas korrigiert, wird die Katalogversion erhöht, damit gecachte Angebotslisten verfallen.
+    """
+    help = 'Berechnet min_price, min_delivery_time und details_count der Angebote neu.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('offer_ids', nargs='*', type=int, help='Optional: nur diese Angebote neu berechnen.')
+
+    def handle(self, *args, **options):
+        queryset = Offer.objects.all()
+        if options['offer_ids']:
+            queryset = queryset.filter(pk__in=options['offer_ids'])
+        updated = queryset.rebuild_summaries()
+        if updated:
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'{updated} Angebote aktualisiert.'))
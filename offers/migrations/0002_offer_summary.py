@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-18 06:00
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_offer_summaries(apps, schema_editor):
+    Offer = apps.get_model('offers', 'Offer')
+    OfferDetail = apps.get_model('offers', 'OfferDetail')
+    details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+    Offer.objects.update(
+        min_price=Subquery(details.annotate(value=Min('price')).values('value')),
+        min_delivery_time=Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value')),
+        details_count=Coalesce(Subquery(details.annotate(value=Count('id')).values('value')), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='details_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(populate_offer_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_offer_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS offers_offer_fts USING fts5("
+        "title, description, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO offers_offer_fts (rowid, title, description) "
+        "SELECT id, COALESCE(title, ''), COALESCE(description, '') FROM offers_offer"
+    )
+
+
+def drop_offer_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS offers_offer_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0002_offer_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_offer_search_index, drop_offer_search_index),
+    ]
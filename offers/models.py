@@ -1,13 +1,61 @@
 from django.db import models
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+class OfferQuerySet(models.QuerySet):
+    def rebuild_summaries(self):
+        """
+        Berechnet die Summary-Spalten der Angebote im QuerySet mit einem einzigen UPDATE neu.
+
+        Geschrieben werden nur Angebote, deren Werte abweichen; bei ihnen wird auch `updated_at`
+        fortgeschrieben, damit Kartencache und ETags der Angebots-Endpunkte die Korrektur sehen.
+        Gibt die Anzahl der aktualisierten Angebote zurück.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+        summary = {
+            'min_price': Subquery(details.annotate(value=Min('price')).values('value')),
+            'min_delivery_time': Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value')),
+            'details_count': Coalesce(Subquery(details.annotate(value=Count('id')).values('value')), Value(0)),
+        }
+        drifted = Q()
+        for field in summary:
+            rebuilt = f'rebuilt_{field}'
+            drifted |= (
+                Q(**{f'{field}__lt': F(rebuilt)}) | Q(**{f'{field}__gt': F(rebuilt)})
+                | Q(**{f'{field}__isnull': True, f'{rebuilt}__isnull': False})
+                | Q(**{f'{field}__isnull': False, f'{rebuilt}__isnull': True})
+            )
+        queryset = self.alias(**{f'rebuilt_{field}': value for field, value in summary.items()}).filter(drifted)
+        # Zeitstempel aus Python wie bei `auto_now`: SQLites CURRENT_TIMESTAMP hat nur Sekunden und ein
+        # anderes Textformat und würde Sortierung und Keyset-Vergleiche über `updated_at` verfälschen
+        return queryset.update(**summary, updated_at=timezone.now())
+
 
 class Offer(models.Model):
+    SUMMARY_FIELDS = ['min_price', 'min_delivery_time', 'details_count']
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     image = models.ImageField(upload_to='uploads/', null=True)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    min_delivery_time = models.IntegerField(null=True, blank=True, db_index=True)
+    details_count = models.IntegerField(default=0)
+
+    objects = OfferQuerySet.as_manager()
+
+    def set_summary_from_details(self, details):
+        """
+        Setzt die Summary-Spalten aus bereits im Speicher vorliegenden Paketen, ohne Abfrage
+        (z. B. beim Anlegen, bevor das Angebot gespeichert wird).
+        """
+        self.min_price = min((detail.price for detail in details), default=None)
+        self.min_delivery_time = min((detail.delivery_time_in_days for detail in details), default=None)
+        self.details_count = len(details)
 
 
 class OfferDetail(models.Model):
@@ -0,0 +1,5 @@
+from coderr.search import FullTextIndex
+from offers.models import Offer
+
+
+offer_search_index = FullTextIndex('offers_offer_fts', Offer, ['title', 'description'])
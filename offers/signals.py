@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr.images import schedule_variants
+from offers.cache import bump_catalog_version
+from offers.models import Offer, OfferDetail
+from offers.search import offer_search_index
+
+
+@receiver(post_save, sender=Offer)
+def index_offer(sender, instance, update_fields=None, **kwargs):
+    """
+    Aktualisiert den Volltextindex, sobald sich Titel oder Beschreibung geändert haben könnten.
+    """
+    if update_fields is not None and not {'title', 'description'} & set(update_fields):
+        return
+    offer_search_index.index(instance)
+
+
+@receiver(post_delete, sender=Offer)
+def unindex_offer(sender, instance, **kwargs):
+    """
+    Entfernt gelöschte Angebote aus dem Volltextindex.
+    """
+    offer_search_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_offer_lists(sender, instance, **kwargs):
+    """
+    Macht alle gecachten Angebotslisten ungültig, sobald sich ein Angebot oder Paket ändert.
+    """
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_offer_lists_of_user(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Macht die gecachten Angebotslisten ungültig, wenn ein Anbieter umbenannt worden sein könnte,
+    da deren `user_details` den Namen enthalten. Neue User und Speichervorgänge ohne Namensfelder
+    (z. B. `last_login`) werden übergangen.
+    """
+    if created or (update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields)):
+        return
+    if Offer.objects.filter(user_id=instance.pk).exists():
+        bump_catalog_version()
+
+
+@receiver(post_save, sender=Offer)
+def create_offer_image_variants(sender, instance, update_fields=None, **kwargs):
+    """
+    Stößt nach dem Commit die Erzeugung der Bildvarianten an; vorhandene Varianten werden übersprungen.
+    """
+    if instance.image and (update_fields is None or 'image' in update_fields):
+        schedule_variants(instance.image.name)
@@ -1,3 +1,817 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from baseinfo.models import PlatformStats
+from coderr import images
+from coderr.images import variant_name
+from offers.api.serializers import OfferDetailSerializer, OfferSerializer, offer_detail_validator, offer_validator
+from offers.api.views import AsyncOfferSingleView
+from offers.cache import get_catalog_version
+from offers.models import Offer, OfferDetail
+from user_auth.models import Profile
+
+
+def create_business_user(username='business'):
+    """
+    Legt einen Business-User samt Profil an.
+    """
+    user = User.objects.create_user(username=username, password='secret', first_name='Max', last_name='Coderr')
+    Profile.objects.create(user=user, email=f'{username}@coderr.de', type='business')
+    return user
+
+
+def create_offer(user, title='Website', prices=(100, 200, 300)):
+    """
+    Legt ein Angebot mit je einem Paket pro Preis an.
+    """
+    offer = Offer.objects.create(user=user, title=title, description='Beschreibung')
+    for offer_type, price in zip(['basic', 'standard', 'premium'], prices):
+        OfferDetail.objects.create(
+            offer=offer, title=offer_type, revisions=1, delivery_time_in_days=len(offer_type),
+            price=price, features=['Logo'], offer_type=offer_type,
+        )
+    Offer.objects.filter(pk=offer.pk).rebuild_summaries()
+    offer.refresh_from_db()
+    return offer
+
+
+class OfferQueryBudgetTests(APITestCase):
+    """
+    Stellt sicher, dass die Angebots-Endpunkte mit einer festen Anzahl an
+    Datenbankabfragen auskommen – unabhängig von Seitengröße und Paketanzahl.
+    """
+    # COUNT für die Paginierung, Angebote inkl. User per JOIN, Details per Prefetch
+    LIST_QUERY_BUDGET = 3
+    # Token inkl. User, Angebot, Details per Prefetch
+    DETAIL_QUERY_BUDGET = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [create_business_user(f'business{i}') for i in range(3)]
+        for i in range(30):
+            create_offer(cls.users[i % 3], title=f'Angebot {i}')
+        cls.token = Token.objects.create(user=cls.users[0])
+
+    def test_offer_list_query_budget_is_independent_of_page_size(self):
+        for page_size in (1, 6, 30):
+            with self.subTest(page_size=page_size):
+                with self.assertNumQueries(self.LIST_QUERY_BUDGET):
+                    response = self.client.get('/api/offers/', {'page_size': page_size})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), page_size)
+
+    def test_offer_list_values_match_details(self):
+        offer = create_offer(self.users[1], title='Einzigartig', prices=(80, 60, 90))
+        response = self.client.get('/api/offers/', {'creator_id': self.users[1].id, 'page_size': 100})
+        result = next(item for item in response.data['results'] if item['id'] == offer.id)
+        self.assertEqual(result['min_price'], 60)
+        self.assertEqual(result['min_delivery_time'], 5)
+        self.assertEqual(len(result['details']), 3)
+        self.assertEqual(result['user_details']['username'], self.users[1].username)
+
+    def test_offer_detail_query_budget(self):
+        offer = Offer.objects.first()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        with self.assertNumQueries(self.DETAIL_QUERY_BUDGET):
+            response = self.client.get(reverse('offersingle', args=[offer.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['details']), 3)
+
+
+class OfferSummaryTests(APITestCase):
+    """
+    Prüft, dass die Summary-Spalten beim Schreiben der OfferDetails aktuell bleiben.
+    """
+
+    def setUp(self):
+        self.user = create_business_user()
+        self.client.force_authenticate(self.user)
+
+    def _detail_payload(self, offer_type, price, delivery_time):
+        return {
+            'title': offer_type, 'revisions': 1, 'delivery_time_in_days': delivery_time,
+            'price': price, 'features': ['Logo'], 'offer_type': offer_type,
+        }
+
+    def test_create_and_update_keep_summary_in_sync(self):
+        payload = {
+            'title': 'Website', 'description': 'Beschreibung',
+            'details': [self._detail_payload('basic', 100, 7), self._detail_payload('standard', 200, 3)],
+        }
+        response = self.client.post('/api/offers/', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        offer = Offer.objects.get(pk=response.data['id'])
+        self.assertEqual((offer.min_price, offer.min_delivery_time, offer.details_count), (100, 3, 2))
+
+        response = self.client.patch(
+            reverse('offersingle', args=[offer.id]),
+            {'details': [self._detail_payload('basic', 80, 7), self._detail_payload('premium', 500, 2)]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time, offer.details_count), (80, 2, 3))
+
+    def test_list_filters_use_summary_columns(self):
+        create_offer(self.user, title='Günstig', prices=(60, 70, 80))
+        create_offer(self.user, title='Teuer', prices=(600, 700, 800))
+        response = self.client.get('/api/offers/', {'min_price': 100, 'ordering': 'min_price'})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Teuer'])
+        response = self.client.get('/api/offers/', {'ordering': '-min_price'})
+        self.assertEqual([item['title'] for item in response.data['results']], ['Teuer', 'Günstig'])
+
+    def test_rebuild_command_repairs_drift(self):
+        offer = create_offer(self.user)
+        Offer.objects.filter(pk=offer.pk).update(min_price=None, min_delivery_time=None, details_count=0)
+        call_command('rebuild_offer_summaries', stdout=StringIO())
+        offer.refresh_from_db()
+        self.assertEqual((offer.min_price, offer.min_delivery_time, offer.details_count), (100, 5, 3))
+
+    def test_rebuild_refreshes_cached_lists(self):
+        cache.clear()
+        offer = create_offer(self.user)
+        Offer.objects.create(user=self.user, title='Ohne Pakete', description='Leer')
+        Offer.objects.filter(pk=offer.pk).update(min_price=999)
+        self.client.force_authenticate(None)
+        self.client.get('/api/offers/')
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/offers/')
+        self.assertIn(999, [item['min_price'] for item in response.data['results']])
+
+        out = StringIO()
+        call_command('rebuild_offer_summaries', stdout=out)
+        self.assertIn('1 Angebote aktualisiert', out.getvalue())
+        self.assertEqual(self.client.get('/api/offers/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        prices = {item['id']: item['min_price'] for item in self.client.get('/api/offers/').data['results']}
+        self.assertEqual(prices[offer.pk], 100)
+        self.client.force_authenticate(None)
+        prices = {item['id']: item['min_price'] for item in self.client.get('/api/offers/').json()['results']}
+        self.assertEqual(prices[offer.pk], 100)
+        # ohne Abweichung wird nichts geschrieben
+        call_command('rebuild_offer_summaries', stdout=out)
+        self.assertIn('0 Angebote aktualisiert', out.getvalue())
+
+
+class OfferSearchTests(APITestCase):
+    """
+    Prüft die Volltextsuche über `?search=` inklusive Präfixsuche, Ranking und Index-Pflege.
+    """
+
+    def setUp(self):
+        self.user = create_business_user()
+
+    def _search(self, term, **params):
+        response = self.client.get('/api/offers/', {'search': term, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.data['results']]
+
+    def test_search_matches_prefixes_and_ranks_results(self):
+        Offer.objects.create(user=self.user, title='Logo Design', description='Ein Logo, noch ein Logo und ein Logo.')
+        Offer.objects.create(user=self.user, title='Webseite', description='Inklusive Logo')
+        Offer.objects.create(user=self.user, title='Übersetzung', description='Deutsch und Englisch')
+        self.assertEqual(self._search('log'), ['Logo Design', 'Webseite'])
+        self.assertEqual(self._search('uber'), ['Übersetzung'])
+        self.assertEqual(self._search('logo webs'), ['Webseite'])
+        self.assertEqual(self._search('log', ordering='-created_at'), ['Webseite', 'Logo Design'])
+
+    def test_index_follows_updates_and_deletes(self):
+        offer = Offer.objects.create(user=self.user, title='Fotografie', description='Portraits')
+        offer.title = 'Videoschnitt'
+        offer.save()
+        self.assertEqual(self._search('foto'), [])
+        self.assertEqual(self._search('video'), ['Videoschnitt'])
+        offer.delete()
+        self.assertEqual(self._search('video'), [])
+
+
+class OfferCursorPaginationTests(APITestCase):
+    """
+    Prüft die Keyset-Paginierung (?pagination=cursor) für alle unterstützten Sortierungen.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.other = create_business_user('other')
+        for i in range(9):
+            # doppelte Preise erzwingen den ID-Tie-Breaker
+            create_offer(cls.user if i % 3 else cls.other, title=f'Logo {i}', prices=(100 + (i % 4) * 10, 500, 900))
+
+    def _walk(self, **params):
+        ids, url, params = [], '/api/offers/', {'pagination': 'cursor', 'page_size': 2, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids += [item['id'] for item in response.data['results']]
+            url, params = response.data['next'], None
+        return ids
+
+    def test_cursor_walk_matches_full_ordering(self):
+        for ordering in ('updated_at', '-updated_at', 'created_at', '-created_at', 'min_price', '-min_price'):
+            with self.subTest(ordering=ordering):
+                field = ordering.lstrip('-')
+                expected = sorted(Offer.objects.all(), key=lambda offer: (getattr(offer, field), offer.id), reverse=ordering.startswith('-'))
+                self.assertEqual(self._walk(ordering=ordering), [offer.id for offer in expected])
+
+    def test_cursor_combines_with_filters(self):
+        ids = self._walk(ordering='min_price', creator_id=self.user.id, min_price=110, search='logo')
+        expected = Offer.objects.filter(user=self.user, min_price__gte=110).order_by('min_price', 'id')
+        self.assertEqual(ids, [offer.id for offer in expected])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/api/offers/', {'pagination': 'cursor', 'cursor': 'kaputt'})
+        self.assertEqual(response.status_code, 400)
+
+
+class OfferConditionalGetTests(APITestCase):
+    """
+    Prüft ETag/Last-Modified der Angebots-Endpunkte und 304-Antworten ohne Serialisierung.
+    """
+
+    def setUp(self):
+        self.user = create_business_user()
+        self.offer = create_offer(self.user)
+        self.client.force_authenticate(self.user)
+
+    def _patch_basic_price(self, price):
+        detail = {'title': 'basic', 'revisions': 1, 'delivery_time_in_days': 5, 'price': price, 'features': ['Logo'], 'offer_type': 'basic'}
+        response = self.client.patch(reverse('offersingle', args=[self.offer.id]), {'details': [detail]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def _revalidate(self, url, etag, expected_status, queries=None):
+        if queries is None:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        else:
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_offer_list_etag(self):
+        etag = self.client.get('/api/offers/')['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        # nur die Aggregat-Abfrage
+        self._revalidate('/api/offers/', etag, 304, queries=1)
+        self.assertNotEqual(self.client.get('/api/offers/', {'creator_id': 999})['ETag'], etag)
+
+        create_offer(self.user, title='Neu')
+        response = self._revalidate('/api/offers/', etag, 200)
+        Offer.objects.filter(title='Neu').delete()
+        self._revalidate('/api/offers/', response['ETag'], 200)
+
+    def test_offer_list_etag_follows_owner_rename(self):
+        etag = self.client.get('/api/offers/')['ETag']
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Erika'
+        user.save()
+        response = self._revalidate('/api/offers/', etag, 200)
+        self.assertEqual(response.data['results'][0]['user_details']['first_name'], 'Erika')
+
+    def test_cursor_pagination_skips_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/offers/', {'pagination': 'cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+    def test_offer_detail_etag_and_last_modified(self):
+        url = reverse('offersingle', args=[self.offer.id])
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        self._revalidate(url, response['ETag'], 304, queries=1)
+        response_ims = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response_ims.status_code, 304)
+
+        self._patch_basic_price(50)
+        self._revalidate(url, response['ETag'], 200)
+
+    def test_offerdetail_follows_parent_offer(self):
+        detail = self.offer.details.get(offer_type='basic')
+        url = reverse('offerdetails', args=[detail.id])
+        etag = self.client.get(url)['ETag']
+        self._revalidate(url, etag, 304, queries=1)
+        self._patch_basic_price(50)
+        self._revalidate(url, etag, 200)
+
+    def test_missing_objects_still_return_404(self):
+        self.assertEqual(self.client.get(reverse('offersingle', args=[999])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('offerdetails', args=[999])).status_code, 404)
+
+
+class OfferListResponseCacheTests(APITestCase):
+    """
+    Prüft den versionierten Antwort-Cache der Angebotsliste für anonyme Besucher.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_business_user()
+        self.offer = create_offer(self.user, title='Logo')
+
+    def _titles(self, **params):
+        response = self.client.get('/api/offers/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.json()['results']]
+
+    def test_repeated_requests_skip_the_database(self):
+        first = self.client.get('/api/offers/', {'page_size': 6, 'ordering': 'min_price'})
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/offers/', {'ordering': 'min_price', 'page_size': 6})
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/offers/', {'page_size': 6, 'ordering': 'min_price'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_offer_and_detail_changes_invalidate(self):
+        self.assertEqual(self._titles(), ['Logo'])
+        self.offer.title = 'Webdesign'
+        self.offer.save()
+        self.assertEqual(self._titles(), ['Webdesign'])
+
+        version = get_catalog_version()
+        detail = self.offer.details.get(offer_type='basic')
+        detail.price = 10
+        detail.save()
+        self.assertGreater(get_catalog_version(), version)
+
+        self.offer.delete()
+        self.assertEqual(self._titles(), [])
+
+    def test_host_and_authentication_are_respected(self):
+        self.client.get('/api/offers/', {'page_size': 1})
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/offers/', {'page_size': 1}, HTTP_HOST='127.0.0.1')
+        self.assertIsNone(response.json()['next'])
+        self.client.force_authenticate(self.user)
+        # kein Antwort-Cache für angemeldete Nutzer, die Karte kommt aber aus dem Fragment-Cache
+        with self.assertNumQueries(2):
+            self.client.get('/api/offers/')
+
+    def test_browsable_api_is_not_cached(self):
+        self.client.get('/api/offers/')
+        responses = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/offers/', HTTP_ACCEPT='text/html')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+            self.assertTrue(queries.captured_queries)
+            self.assertIn('csrftoken', response.cookies)
+            responses.append(response)
+            self.client.cookies.clear()
+        self.assertNotEqual(responses[0].content, responses[1].content)
+
+    def test_invalid_params_are_rejected_before_cache_lookup(self):
+        self.assertEqual(self.client.get('/api/offers/', {'unbekannt': 1}).status_code, 400)
+
+
+class OfferCardCacheTests(APITestCase):
+    """
+    Prüft den Fragment-Cache der Angebotskarten in Listenseiten.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.offers = [create_offer(cls.user, title=f'Logo {i}', prices=(100 + i, 200, 300)) for i in range(4)]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_cards_are_reused_across_filter_combinations(self):
+        # Zählung, Seite (mit User per JOIN), Pakete der fehlenden Karten
+        with self.assertNumQueries(3):
+            first = self.client.get('/api/offers/', {'ordering': 'min_price'}).data['results']
+        # gleiche Angebote, andere Filter/Sortierung: alle Karten im Cache, keine Paket-Abfrage
+        with self.assertNumQueries(2):
+            second = self.client.get('/api/offers/', {'ordering': '-min_price', 'min_price': 100}).data['results']
+        self.assertEqual(list(reversed(second)), first)
+        self.assertEqual(first[0]['details'][0]['url'], reverse('offerdetails', args=[self.offers[0].details.first().id]))
+
+    def test_changed_offer_is_rendered_again(self):
+        self.client.get('/api/offers/')
+        offer = self.offers[2]
+        offer.title = 'Neu'
+        offer.save()
+        with self.assertNumQueries(3):
+            results = self.client.get('/api/offers/', {'ordering': 'created_at'}).data['results']
+        self.assertEqual([item['title'] for item in results], ['Logo 0', 'Logo 1', 'Neu', 'Logo 3'])
+
+    def test_owner_rename_is_served_from_cached_cards(self):
+        for fast in (False, True):
+            with self.subTest(fast=fast), override_settings(FAST_LIST_SERIALIZERS=fast):
+                self.client.get('/api/offers/')
+                User.objects.filter(pk=self.user.pk).update(first_name=f'Erika {fast}')
+                # Karten kommen aus dem Cache, die Benutzerdaten aus der Seitenabfrage
+                with self.assertNumQueries(2):
+                    results = self.client.get('/api/offers/').data['results']
+                self.assertEqual({item['user_details']['first_name'] for item in results}, {f'Erika {fast}'})
+                self.assertEqual(list(results[0])[-1], 'user_details')
+
+    def test_owner_rename_invalidates_anonymous_lists(self):
+        self.client.force_authenticate(None)
+        self.client.get('/api/offers/')
+        version = get_catalog_version()
+        user = User.objects.get(pk=self.user.pk)
+        user.save(update_fields=['last_login'])
+        self.assertEqual(get_catalog_version(), version)
+        user.last_name = 'Mustermann'
+        user.save()
+        self.assertGreater(get_catalog_version(), version)
+        results = self.client.get('/api/offers/').json()['results']
+        self.assertEqual(results[0]['user_details']['last_name'], 'Mustermann')
+
+
+def create_image_upload(name='bild.jpg', size=(1600, 1200)):
+    """
+    Erzeugt ein JPEG im Speicher als Upload.
+    """
+    output = BytesIO()
+    Image.new('RGB', size, 'teal').save(output, format='JPEG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+class OfferImageVariantTests(APITestCase):
+    """
+    Prüft die Erzeugung der WebP-Varianten für Angebotsbilder und deren URLs in der API.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, IMAGE_VARIANTS={'ASYNC': False})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.user = create_business_user()
+
+    def test_variants_are_created_after_commit_and_exposed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            offer = Offer.objects.create(user=self.user, title='Foto', description='Bild', image=create_image_upload())
+        for variant, edge in (('thumb', 320), ('medium', 960)):
+            name = offer.image.name + f'.{variant}.webp'
+            with default_storage.open(name) as file, Image.open(file) as image:
+                self.assertEqual((image.format, max(image.size)), ('WEBP', edge))
+
+        item = self.client.get('/api/offers/').data['results'][0]
+        self.assertEqual(set(item['image_variants']), {'thumb', 'medium'})
+        self.assertTrue(item['image_variants']['thumb'].startswith('http://testserver/media/'))
+        self.assertTrue(item['image_variants']['thumb'].endswith('.thumb.webp'))
+
+    def test_variants_keep_original_extension(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jpg = Offer.objects.create(user=self.user, title='JPG', description='Bild', image=create_image_upload('logo.jpg'))
+            png = Offer.objects.create(user=self.user, title='PNG', description='Bild', image=create_image_upload('logo.png'))
+        thumbs = {variant_name(offer.image.name, 'thumb') for offer in (jpg, png)}
+        self.assertEqual(thumbs, {'uploads/logo.jpg.thumb.webp', 'uploads/logo.png.thumb.webp'})
+        self.assertTrue(all(default_storage.exists(thumb) for thumb in thumbs))
+
+    @override_settings(IMAGE_VARIANTS={'ASYNC': True})
+    def test_async_variants_run_in_shared_pool(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            offers = [
+                Offer.objects.create(user=self.user, title=f'Foto {index}', description='Bild',
+                                     image=create_image_upload(f'foto{index}.jpg'))
+                for index in range(3)
+            ]
+        executor = images.get_executor()
+        executor.submit(lambda: None).result(timeout=10)
+        executor.shutdown(wait=True)
+        images._executor = None
+        self.assertTrue(all(default_storage.exists(variant_name(offer.image.name, 'thumb')) for offer in offers))
+
+    def test_offers_without_image_have_no_variants(self):
+        create_offer(self.user)
+        self.assertIsNone(self.client.get('/api/offers/').data['results'][0]['image_variants'])
+
+    def test_backfill_command(self):
+        offer = Offer.objects.create(user=self.user, title='Foto', description='Bild', image=create_image_upload())
+        thumb = offer.image.name + '.thumb.webp'
+        self.assertFalse(default_storage.exists(thumb))
+        out = StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertTrue(default_storage.exists(thumb))
+        self.assertIn('2 Bildvarianten', out.getvalue())
+
+
+class MediaServingTests(APITestCase):
+    """
+    Prüft die Auslieferung von Dateien aus MEDIA_ROOT mit Cache-Headern, bedingten GETs und Range.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.content = bytes(range(256)) * 4
+        self.name = default_storage.save('uploads/daten.png', ContentFile(self.content))
+
+    def test_full_file_with_cache_headers(self):
+        response = self.client.get(f'/media/{self.name}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Content-Length'], str(len(self.content)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        response = self.client.get(f'/media/{self.name}', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('ETag', response)
+
+    def test_range_requests(self):
+        response = self.client.get(f'/media/{self.name}', HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+
+        response = self.client.get(f'/media/{self.name}', HTTP_RANGE='bytes=-4')
+        self.assertEqual(b''.join(response.streaming_content), self.content[-4:])
+
+        response = self.client.get(f'/media/{self.name}', HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+
+        response = self.client.get(f'/media/{self.name}', HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"veraltet"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_sendfile_backends(self):
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-accel-redirect', 'ACCEL_REDIRECT_PREFIX': '/intern/'}):
+            response = self.client.get(f'/media/{self.name}')
+        self.assertEqual(response['X-Accel-Redirect'], f'/intern/{self.name}')
+        self.assertEqual(response.content, b'')
+
+        with override_settings(MEDIA_SERVING={'BACKEND': 'x-sendfile'}):
+            response = self.client.get(f'/media/{self.name}')
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.media_root, self.name))
+
+    def test_missing_and_escaping_paths(self):
+        self.assertEqual(self.client.get('/media/uploads/fehlt.png').status_code, 404)
+        self.assertEqual(self.client.get('/media/../settings.py').status_code, 400)
+        self.assertEqual(self.client.post(f'/media/{self.name}').status_code, 405)
+
+
+class AsyncOfferSingleViewTests(APITestCase):
+    """
+    Prüft die async Variante von GET /api/offerdetails/<pk>/ gegen die synchrone View.
+    """
+
+    def setUp(self):
+        self.user = create_business_user()
+        self.detail = create_offer(self.user).details.first()
+        self.client.force_authenticate(self.user)
+
+    def _get_async(self, pk, **extra):
+        request = APIRequestFactory().get(f'/api/offerdetails/{pk}/', **extra)
+        force_authenticate(request, self.user)
+        return async_to_sync(AsyncOfferSingleView.as_view())(request, pk=pk)
+
+    def test_matches_sync_view(self):
+        expected = self.client.get(reverse('offerdetails', args=[self.detail.pk]))
+        response = self._get_async(self.detail.pk)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(response['ETag'], expected['ETag'])
+        self.assertEqual(self._get_async(self.detail.pk, HTTP_IF_NONE_MATCH=expected['ETag']).status_code, 304)
+        self.assertEqual(self._get_async(999).status_code, 404)
+
+
+def offer_payload(title='Logo Design', price=100):
+    """
+    Liefert ein Angebot im Format des POST an /api/offers/.
+    """
+    return {
+        'title': title,
+        'description': 'Professionelles Design',
+        'details': [
+            {'title': offer_type, 'revisions': 2, 'delivery_time_in_days': days, 'price': price * factor,
+             'features': ['Logo'], 'offer_type': offer_type}
+            for offer_type, days, factor in (('basic', 5, 1), ('standard', 3, 2), ('premium', 1, 3))
+        ],
+    }
+
+
+class OfferBulkCreateTests(APITestCase):
+    """
+    Prüft das Anlegen von Angeboten per Batch-Endpunkt und NDJSON-Import inklusive
+    der sonst über Signale gepflegten Daten (Volltextindex, PlatformStats, Summary-Spalten).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_business_user()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('offers bulk')
+
+    def test_batch_creates_offers_with_side_effects(self):
+        version = get_catalog_version()
+        payload = {'offers': [offer_payload(f'Angebot {i}', price=100 + i) for i in range(3)]}
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([len(item['details']) for item in response.data], [3, 3, 3])
+
+        offer = Offer.objects.get(title='Angebot 2')
+        self.assertEqual((offer.min_price, offer.min_delivery_time, offer.details_count), (102, 1, 3))
+        self.assertEqual(PlatformStats.load().offer_count, 3)
+        self.assertNotEqual(get_catalog_version(), version)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/offers/', {'search': 'angebot'}).data['count'], 3)
+
+    def test_query_count_is_independent_of_offer_count(self):
+        with CaptureQueriesContext(connection) as single:
+            self.client.post(self.url, {'offers': [offer_payload()]}, format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post(self.url, {'offers': [offer_payload(f'Angebot {i}') for i in range(20)]}, format='json')
+        self.assertEqual(len(single), len(many))
+        self.assertEqual(Offer.objects.count(), 21)
+
+    def test_errors_are_reported_per_offer(self):
+        invalid = offer_payload()
+        invalid['details'][0]['price'] = 10
+        response = self.client.post(self.url, {'offers': [offer_payload(), invalid]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('price', response.data['offers'][1]['details'][0])
+        self.assertFalse(Offer.objects.exists())
+
+    def test_customers_cannot_create_offers(self):
+        customer = User.objects.create_user(username='kunde', password='secret')
+        Profile.objects.create(user=customer, email='kunde@coderr.de', type='customer')
+        self.client.force_authenticate(customer)
+        self.assertEqual(self.client.post(self.url, {'offers': [offer_payload()]}, format='json').status_code, 403)
+
+    def test_import_command_streams_chunks(self):
+        lines = [json.dumps(offer_payload(f'Import {i}')) for i in range(5)]
+        lines.insert(2, '{kein json')
+        lines.append(json.dumps({**offer_payload(), 'user': 999}))
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False, encoding='utf-8') as source:
+            source.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, source.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_offers', source.name, user=self.user.pk, chunk_size=2, stdout=out, stderr=err)
+        self.assertIn('5 Angebote importiert, 2 Zeilen übersprungen', out.getvalue())
+        self.assertIn('Zeile 3', err.getvalue())
+        self.assertEqual(OfferDetail.objects.filter(offer__title__startswith='Import').count(), 15)
+        self.assertEqual(PlatformStats.load().offer_count, 5)
+
+
+class OfferPatchTests(APITestCase):
+    """
+    Prüft PATCH /api/offers/<id>/: Antwort aus dem Speicher, gebündelte Schreibzugriffe und
+    dass ungültige Pakete nichts verändern.
+    """
+
+    def setUp(self):
+        self.user = create_business_user()
+        self.offer = create_offer(self.user)
+        self.client.force_authenticate(self.user)
+        self.url = reverse('offersingle', args=[self.offer.id])
+        self.details = {detail.offer_type: detail for detail in self.offer.details.all()}
+
+    def _detail(self, offer_type, price):
+        return {'title': f'{offer_type} neu', 'revisions': 3, 'delivery_time_in_days': 2, 'price': price,
+                'features': ['Logo', 'Flyer'], 'offer_type': offer_type}
+
+    def test_response_matches_stored_state(self):
+        payload = {'title': 'Neuer Titel', 'details': [self._detail('basic', 150), self._detail('standard', 250)]}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        selects = [query for query in queries if query['sql'].startswith('SELECT')]
+        # Angebot und Pakete laden, danach kein erneutes Lesen
+        self.assertEqual(len(selects), 2)
+
+        stored = OfferDetailSerializer(OfferDetail.objects.filter(offer=self.offer).order_by('id'), many=True).data
+        self.assertEqual(response.data, {
+            'id': self.offer.id, 'title': 'Neuer Titel', 'description': 'Beschreibung',
+            'details': stored, 'image': None,
+        })
+        self.assertEqual(response.data['details'][0]['price'], '150.00')
+        self.offer.refresh_from_db()
+        self.assertEqual((self.offer.title, self.offer.min_price, self.offer.min_delivery_time), ('Neuer Titel', 150, 2))
+
+    def test_missing_fields_reject_whole_update(self):
+        incomplete = self._detail('standard', 250)
+        del incomplete['revisions']
+        payload = {'title': 'Neuer Titel', 'details': [self._detail('basic', 150), incomplete]}
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'details': ['Fehlende Felder für standard: revisions']})
+        self.assertEqual(OfferDetail.objects.get(pk=self.details['basic'].pk).price, 100)
+        self.assertEqual(Offer.objects.get(pk=self.offer.pk).title, 'Website')
+
+
+class CompiledOfferValidationTests(APITestCase):
+    """
+    Prüft, dass die einmal aufgebauten Validatoren dieselben Ergebnisse und Fehler liefern
+    wie frisch instanziierte Serializer.
+    """
+    INVALID_DETAILS = [
+        {},
+        None,
+        'kein Objekt',
+        {'price': 'x', 'delivery_time_in_days': 'y', 'revisions': 'z'},
+        {'title': '', 'price': 10, 'delivery_time_in_days': 0, 'revisions': -5, 'features': [], 'offer_type': 'gold'},
+    ]
+
+    def test_detail_errors_match_fresh_serializer(self):
+        for data in self.INVALID_DETAILS:
+            with self.subTest(data=data):
+                serializer = OfferDetailSerializer(data=data)
+                self.assertFalse(serializer.is_valid())
+                with self.assertRaises(ValidationError) as context:
+                    offer_detail_validator.run(data)
+                self.assertEqual(context.exception.detail, serializer.errors)
+
+    def test_offer_validation_matches_fresh_serializer(self):
+        invalid = offer_payload()
+        invalid['details'][1]['price'] = 10
+        invalid['details'][2]['features'] = []
+        for data in (offer_payload(), invalid, {'details': []}):
+            with self.subTest(data=data):
+                serializer = OfferSerializer(data=data)
+                if serializer.is_valid():
+                    self.assertEqual(offer_validator.run(data), serializer.validated_data)
+                    continue
+                with self.assertRaises(ValidationError) as context:
+                    offer_validator.run(data)
+                self.assertEqual(context.exception.detail, serializer.errors)
+
+        with self.assertRaises(ValidationError) as context:
+            offer_validator.run(invalid)
+        # wie bisher enthält die Liste nur die fehlerhaften Pakete
+        self.assertEqual(context.exception.detail['details'], [
+            {'price': ['Die Preis muss mindestens 51,00€ betragen.']},
+            {'features': ['Es muss mindestens ein Feature vorhanden sein.']},
+        ])
+
+
+class OfferRowSerializerTests(APITestCase):
+    """
+    Prüft, dass die schnelle Listenausgabe (`FAST_LIST_SERIALIZERS`) byteweise mit `OfferSerializer` übereinstimmt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_business_user()
+        cls.offers = [create_offer(cls.user, title=f'Logo {i}', prices=(100 + i, 249.5, 300)) for i in range(5)]
+        Offer.objects.filter(pk=cls.offers[1].pk).update(image='uploads/logo.jpg', description='Grüße € "Zitat"')
+        Offer.objects.create(user=create_business_user('leer'), title='Ohne Pakete', description='')
+
+    def _get(self, fast, params):
+        cache.clear()
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get('/api/offers/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_output_matches_offer_serializer(self):
+        for params in (
+            {}, {'page_size': 100}, {'ordering': 'min_price', 'page_size': 3},
+            {'pagination': 'cursor', 'ordering': '-min_price', 'page_size': 4}, {'search': 'Logo'},
+            {'creator_id': self.user.pk, 'max_delivery_time': 5},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self._get(True, params), self._get(False, params))
+
+    def test_cursor_walk_and_query_count(self):
+        self.client.force_authenticate(self.user)
+        cache.clear()
+        # Seite (mit User per JOIN) und Paket-IDs aller Zeilen, ohne ETag-Aggregat
+        with override_settings(FAST_LIST_SERIALIZERS=True), self.assertNumQueries(2):
+            response = self.client.get('/api/offers/', {'pagination': 'cursor', 'page_size': 4})
+        with override_settings(FAST_LIST_SERIALIZERS=True):
+            second = self.client.get(response.data['next']).data['results']
+        ids = [item['id'] for item in response.data['results'] + second]
+        self.assertEqual(ids, list(Offer.objects.order_by('updated_at', 'pk').values_list('pk', flat=True)))
+
+    def test_cards_are_shared_with_offer_serializer(self):
+        self.client.force_authenticate(self.user)
+        cache.clear()
+        expected = self.client.get('/api/offers/', {'page_size': 100}).content
+        # alle Karten liegen bereits im Cache: Zählung und Seite, keine Paket-Abfrage
+        with override_settings(FAST_LIST_SERIALIZERS=True), self.assertNumQueries(2):
+            response = self.client.get('/api/offers/', {'page_size': 100})
+        self.assertEqual(response.content, expected)
@@ -1,5 +1,10 @@
+from collections import Counter
+
+from django.db import transaction
 from rest_framework import serializers
-from orders.models import Order
+from coderr.rows import RowSerializer
+from offers.models import OfferDetail
+from orders.models import BusinessOrderStats, Order
 
 class OrderListSerializer(serializers.ModelSerializer):
     """
@@ -12,6 +17,35 @@ class OrderListSerializer(serializers.ModelSerializer):
         model = Order
         fields = ['id', 'customer_user', 'business_user', 'title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type','status', 'created_at', 'updated_at']
 
+
+class OrderRowSerializer(RowSerializer):
+    """
+    Schnelle Listenausgabe von `OrderListSerializer` aus `values_list()`-Zeilen (siehe `coderr.rows`).
+    """
+    reference = OrderListSerializer
+    columns = (
+        'pk', 'customer_user', 'business_user_id', 'title', 'revisions', 'delivery_time_in_days',
+        'price', 'features', 'offer_type', 'status', 'created_at', 'updated_at',
+    )
+    formatted_fields = ('price', 'created_at', 'updated_at')
+
+    def to_representation(self, row):
+        formatters = self.get_formatters()
+        return {
+            'id': row.pk,
+            'customer_user': row.customer_user,
+            'business_user': row.business_user_id,
+            'title': row.title,
+            'revisions': row.revisions,
+            'delivery_time_in_days': row.delivery_time_in_days,
+            'price': formatters['price'](row.price),
+            'features': row.features,
+            'offer_type': row.offer_type,
+            'status': row.status,
+            'created_at': formatters['created_at'](row.created_at),
+            'updated_at': formatters['updated_at'](row.updated_at),
+        }
+
 class OrdersPostSerializer(serializers.ModelSerializer):
     """
     Serializer für das Erstellen einer neuen Bestellung (POST).
@@ -24,6 +58,55 @@ class OrdersPostSerializer(serializers.ModelSerializer):
         model = Order
         fields = ['offer_detail_id']
 
+class OrdersBulkPostSerializer(serializers.Serializer):
+    """
+    Serializer für das Erstellen mehrerer Bestellungen in einem Request (Warenkorb).
+
+    Erwartet eine Liste `offer_detail_ids`. Alle Pakete samt Angeboten werden mit einer
+    Abfrage geladen, die Bestellungen im Speicher aufgebaut und in einer Transaktion per
+    `bulk_create` angelegt. Fehler werden pro Eintrag (Index in der Liste) gemeldet;
+    in diesem Fall wird keine Bestellung angelegt.
+    """
+    MAX_ITEMS = 50
+
+    offer_detail_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_ITEMS,
+    )
+
+    def validate_offer_detail_ids(self, value):
+        """
+        Prüft, ob alle Pakete existieren, und merkt sich die geladenen OfferDetails.
+        """
+        details = OfferDetail.objects.select_related('offer').in_bulk(set(value))
+        errors = {
+            index: [f'Das Angebotspaket {detail_id} existiert nicht.']
+            for index, detail_id in enumerate(value) if detail_id not in details
+        }
+        if errors:
+            raise serializers.ValidationError(errors)
+        self._offer_details = details
+        return value
+
+    def create(self, validated_data):
+        """
+        Legt alle Bestellungen mit einem `bulk_create` an und verbucht sie in den Bestellzählern.
+        """
+        orders = []
+        for detail_id in validated_data['offer_detail_ids']:
+            order = Order(offer_detail_id=self._offer_details[detail_id], customer_user=validated_data['customer_user'])
+            order.copy_offer_detail(order.offer_detail_id)
+            orders.append(order)
+
+        with transaction.atomic():
+            orders = Order.objects.bulk_create(orders)
+            # bulk_create löst keine post_save-Signale aus
+            for business_user_id, count in Counter(order.business_user_id for order in orders).items():
+                BusinessOrderStats.record_status_change(business_user_id, new_status='in_progress', count=count)
+        return orders
+
+
 class OrdersPatchSerializer(serializers.ModelSerializer):
     """
     Serializer für Teilaktualisierungen (PATCH) von Bestellungen.
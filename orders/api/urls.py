@@ -1,10 +1,14 @@
 
 from django.urls import path
+from coderr.async_views import select_view
 from . import views
 
 urlpatterns = [
     path('orders/', views.OrdersList.as_view()),
+    path('orders/bulk/', views.OrdersBulkCreateView.as_view()),
+    path('orders/export/', views.OrdersExportView.as_view()),
     path('orders/<int:pk>/', views.SingleOrderView.as_view()),
-    path('completed-order-count/<int:pk>/', views.OrdersBusinessCompletedCountView.as_view()),
-    path('order-count/<int:pk>/', views.OrdersBusinessUncomletedCoutView.as_view()),
+    path('completed-order-count/<int:pk>/', select_view(views.AsyncOrdersBusinessCompletedCountView, views.OrdersBusinessCompletedCountView)),
+    path('order-count/<int:pk>/', select_view(views.AsyncOrdersBusinessUncompletedCountView, views.OrdersBusinessUncomletedCoutView)),
+    path('order-stats/', views.OrdersBusinessStatsView.as_view()),
 ]
\ No newline at end of file
@@ -1,33 +1,164 @@
+import datetime
+import heapq
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
-from orders.models import Order
-from orders.api.serializers import OrderListSerializer, OrdersPostSerializer, OrdersPatchSerializer
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from coderr.async_views import AsyncAPIView
+from coderr.pagination import KeysetPagination
+from coderr.rows import fast_lists_enabled
+from orders.models import BusinessOrderStats, Order
+from user_auth.models import Profile
+from orders.api.serializers import OrderListSerializer, OrderRowSerializer, OrdersPostSerializer, OrdersPatchSerializer, OrdersBulkPostSerializer
+from orders.export import EXPORT_FORMATS, stream_orders
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse
 from django.contrib.auth.models import User
 
-class OrdersList(APIView):
+class OrderFilterMixin:
+    """
+    Gemeinsame Filter für Bestelllisten: `status`, `created_from`, `created_to`
+    (Datum oder Zeitstempel, jeweils inklusive).
+    """
+
+    def _parse_date_param(self, name):
+        """
+        Liest einen Datums- bzw. Zeitstempel-Parameter.
+        Gibt `(zeitpunkt, nur_datum)` zurück; ein reines Datum steht für den Tagesbeginn.
+        """
+        raw = self.request.query_params.get(name)
+        if not raw:
+            return None, False
+        try:
+            day = parse_date(raw)
+            date_only = day is not None
+            if date_only:
+                value = datetime.datetime.combine(day, datetime.time.min)
+            else:
+                value = parse_datetime(raw)
+                if value is None:
+                    raise ValueError
+        except ValueError:
+            raise ValidationError({'detail': f'{name} muss ein Datum (JJJJ-MM-TT) oder ein ISO-Zeitstempel sein.'})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        return value, date_only
+
+    def get_order_filters(self):
+        """
+        Gibt die Filter aus den Query-Parametern als kwargs für `filter()` zurück.
+        """
+        params = self.request.query_params
+        filters = {}
+        status_value = params.get('status')
+        if status_value:
+            if status_value not in dict(Order.STATUS_CHOICES):
+                raise ValidationError({'detail': f"status muss einer der Werte {', '.join(dict(Order.STATUS_CHOICES))} sein."})
+            filters['status'] = status_value
+        created_from, _ = self._parse_date_param('created_from')
+        if created_from:
+            filters['created_at__gte'] = created_from
+        created_to, date_only = self._parse_date_param('created_to')
+        if created_to and date_only:
+            # ein reines Datum schließt den ganzen Tag ein
+            filters['created_at__lt'] = created_to + datetime.timedelta(days=1)
+        elif created_to:
+            filters['created_at__lte'] = created_to
+        return filters
+
+
+class OrderInboxPagination(KeysetPagination):
+    """
+    Cursor-Paginierung für die Bestellübersicht (aktiviert über ?pagination=cursor).
+    Blättert per Keyset über `created_at` plus ID.
+    """
+    page_size = 20
+    max_page_size = 100
+
+    def get_ordering(self, request, view):
+        return 'created_at', view.get_ordering() == '-created_at'
+
+
+class OrdersList(OrderFilterMixin, APIView):
     """
     API-Endpunkt für das Abrufen und Erstellen von Bestellungen (Orders).
     Nur authentifizierte Nutzer haben Zugriff.
 
     - GET: Gibt alle Bestellungen zurück, bei denen der Nutzer Kunde oder Anbieter ist.
+      Optionale Filter: `status`, `role` (business/customer), `created_from`, `created_to`
+      (Datum oder Zeitstempel, jeweils inklusive), Sortierung `ordering` (created_at, -created_at)
+      und Cursor-Paginierung über `?pagination=cursor`.
     - POST: Erstellt eine neue Bestellung, nur wenn der Nutzer ein Kundenprofil hat.
+
+    Statt eines OR über `business_user` und `customer_user` wird je Rolle eine eigene Abfrage
+    über den passenden Index gestellt; die sortierten Ergebnisse werden zusammengeführt.
+    Ohne Paginierung liefert die Liste höchstens `LIST_LIMIT` Bestellungen (jede Teilabfrage ist
+    per LIMIT begrenzt), damit die Antwortzeit nicht mit der Zahl der Bestellungen wächst;
+    alle Bestellungen liefern `?pagination=cursor` bzw. der Export.
+    Mit `FAST_LIST_SERIALIZERS` gibt die Liste über `OrderRowSerializer` aus.
     """
     permission_classes = [IsAuthenticated]
+    LIST_LIMIT = OrderInboxPagination.max_page_size
+    ROLES = ('business', 'customer')
+    ORDERINGS = ('created_at', '-created_at')
+    DEFAULT_ORDERING = 'created_at'
+
+    def get_ordering(self):
+        """
+        Gibt die Sortierung aus ?ordering= zurück (Standard: älteste zuerst).
+        """
+        ordering = self.request.query_params.get('ordering', self.DEFAULT_ORDERING)
+        if ordering not in self.ORDERINGS:
+            raise ValidationError({'detail': f"ordering muss einer der Werte {', '.join(self.ORDERINGS)} sein."})
+        return ordering
+
+    def get_role_querysets(self):
+        """
+        Baut je Rolle ein gefiltertes QuerySet, das über den Index (rolle, created_at, id) läuft.
+        """
+        params = self.request.query_params
+        filters = self.get_order_filters()
+        role = params.get('role')
+        if role and role not in self.ROLES:
+            raise ValidationError({'detail': f"role muss einer der Werte {', '.join(self.ROLES)} sein."})
+        querysets = []
+        if role in (None, '', 'business'):
+            querysets.append(Order.objects.filter(business_user=self.request.user, **filters))
+        if role in (None, '', 'customer'):
+            querysets.append(Order.objects.filter(customer_user=self.request.user.id, **filters))
+        return querysets
 
     def get(self, request, format=None):
         """
         Gibt eine Liste der Bestellungen zurück, die dem angemeldeten Nutzer zugeordnet sind,
         entweder als Kunde oder Anbieter.
         """
-        if request.user.is_authenticated:
-            orders = Order.objects.filter(Q(business_user=request.user) | Q(customer_user=request.user.id))
-        else:
-            orders = Order.objects.none()
-        serializer = OrderListSerializer(orders, many=True)
+        pagination = request.query_params.get('pagination')
+        if pagination not in (None, 'cursor'):
+            return Response({'detail': 'pagination muss den Wert cursor haben.'}, status=status.HTTP_400_BAD_REQUEST)
+        querysets = self.get_role_querysets()
+        serializer_class = OrderListSerializer
+        if fast_lists_enabled():
+            querysets = [OrderRowSerializer.rows(queryset) for queryset in querysets]
+            serializer_class = OrderRowSerializer
+        if pagination == 'cursor':
+            paginator = OrderInboxPagination()
+            page = paginator.paginate_querysets(querysets, request, view=self)
+            serializer = serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        descending = self.get_ordering() == '-created_at'
+        ordering = ['-created_at', '-id'] if descending else ['created_at', 'id']
+        merged = heapq.merge(
+            *(queryset.order_by(*ordering)[:self.LIST_LIMIT] for queryset in querysets),
+            key=lambda order: (order.created_at, order.pk), reverse=descending,
+        )
+        orders = list({order.pk: order for order in merged}.values())[:self.LIST_LIMIT]
+        serializer = serializer_class(orders, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
     def post(self, request, format=None):
@@ -44,6 +175,54 @@ class OrdersList(APIView):
             return Response(full_serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+class OrdersBulkCreateView(APIView):
+    """
+    API-Endpunkt zum Erstellen mehrerer Bestellungen in einem Request.
+    Nur Benutzer mit Kundenprofil dürfen diesen Vorgang durchführen.
+
+    - POST: {"offer_detail_ids": [1, 2, 3]} – legt alle Bestellungen in einer Transaktion an.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        """
+        Erstellt alle Bestellungen oder – bei Fehlern – keine und meldet die Fehler pro Eintrag.
+        """
+        if self.request.user.profile.type != 'customer':
+            return Response({'details': ['Nur Kunden können Aufträge erteilen']},status=status.HTTP_403_FORBIDDEN)
+        serializer = OrdersBulkPostSerializer(data=request.data)
+        if serializer.is_valid():
+            orders = serializer.save(customer_user=request.user.id)
+            full_serializer = OrderListSerializer(orders, many=True)
+            return Response(full_serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class OrdersExportView(OrderFilterMixin, APIView):
+    """
+    API-Endpunkt, der die Bestellhistorie des angemeldeten Business-Users streamt.
+
+    - GET: ?export_format=ndjson (Standard) oder csv, optional mit `status`, `created_from`, `created_to`.
+
+    Die Zeilen werden blockweise aus der Datenbank gelesen und direkt als
+    `StreamingHttpResponse` geschrieben; der Speicherbedarf hängt nicht von der Anzahl ab.
+    (`format` ist in DRF für die Content-Negotiation reserviert, daher `export_format`.)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, format=None):
+        """
+        Streamt alle (gefilterten) Bestellungen, bei denen der Nutzer Anbieter ist.
+        """
+        if getattr(request.user, 'profile', None) is None or request.user.profile.type != 'business':
+            return Response({'detail': 'Nur Unternehmen können ihre Bestellungen exportieren.'}, status=status.HTTP_403_FORBIDDEN)
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'detail': f"export_format muss einer der Werte {', '.join(EXPORT_FORMATS)} sein."}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = Order.objects.filter(business_user=request.user, **self.get_order_filters())
+        response = StreamingHttpResponse(stream_orders(queryset, export_format), content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="orders.{export_format}"'
+        return response
+
 class SingleOrderView(APIView):
     """
     API-Endpunkt zum Abrufen, Aktualisieren und Löschen einer einzelnen Bestellung.
@@ -150,4 +329,87 @@ class OrdersBusinessCompletedCountView(APIView):
         if not hasattr(business_user, 'profile') or business_user.profile.type != 'business':
             return Response({'detail': 'Dieser Benutzer ist kein Business-Profil.'}, status=status.HTTP_404_NOT_FOUND)
         completed_order_count = Order.objects.filter(business_user=business_user, status='completed')
-        return Response({'completed_order_count': completed_order_count.count()})
\ No newline at end of file
+        return Response({'completed_order_count': completed_order_count.count()})
+
+class AsyncBusinessOrderCountView(AsyncAPIView):
+    """
+    Basis der async Varianten der Bestellzähler-Views (siehe `ASYNC_READ_VIEWS`).
+
+    Profilprüfung und Zählung laufen nacheinander: Das async ORM führt jede Abfrage per
+    `sync_to_async(thread_sensitive=True)` im gemeinsamen Sync-Thread aus, ein `asyncio.gather`
+    würde sie also ebenfalls hintereinander ausführen. Gezählt wird daher erst nach der Profilprüfung.
+    Unterklassen setzen `order_status` und `count_key`.
+    """
+    permission_classes = [IsAuthenticated]
+    order_status = None
+    count_key = None
+
+    async def get(self, request, pk, format=None):
+        user_row = await User.objects.filter(pk=pk).values('profile__type').afirst()
+        if user_row is None:
+            return Response({'detail': 'Dieser Business User existiert nicht.'}, status=status.HTTP_404_NOT_FOUND)
+        if user_row['profile__type'] != 'business':
+            return Response({'detail': 'Dieser Benutzer ist kein Business-Profil.'}, status=status.HTTP_404_NOT_FOUND)
+        order_count = await Order.objects.filter(business_user_id=pk, status=self.order_status).acount()
+        return Response({self.count_key: order_count})
+
+
+class AsyncOrdersBusinessUncompletedCountView(AsyncBusinessOrderCountView):
+    """
+    Async Variante von `OrdersBusinessUncomletedCoutView`.
+    """
+    order_status = 'in_progress'
+    count_key = 'order_count'
+
+
+class AsyncOrdersBusinessCompletedCountView(AsyncBusinessOrderCountView):
+    """
+    Async Variante von `OrdersBusinessCompletedCountView`.
+    """
+    order_status = 'completed'
+    count_key = 'completed_order_count'
+
+
+class OrdersBusinessStatsView(APIView):
+    """
+    API-Endpunkt, der die Bestellzähler (in_progress, completed, cancelled) für
+    mehrere Business-User in einer Anfrage zurückgibt.
+
+    Beispiel: GET /api/order-stats/?business_user_ids=1,2,3
+
+    Die Werte stammen aus den Zählern `BusinessOrderStats` und werden zusammen mit
+    der Business-Profil-Prüfung in einer einzigen Abfrage gelesen.
+    User-IDs ohne Business-Profil werden unter `not_found` aufgeführt.
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_IDS = 100
+
+    def get(self, request, format=None):
+        """
+        Gibt die Zähler aller angefragten Business-User zurück.
+        """
+        raw_ids = request.query_params.get('business_user_ids', '')
+        try:
+            business_user_ids = list(dict.fromkeys(int(value) for value in raw_ids.split(',') if value.strip()))
+        except ValueError:
+            return Response({'detail': 'business_user_ids muss eine kommagetrennte Liste ganzer Zahlen sein.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not business_user_ids:
+            return Response({'detail': 'business_user_ids ist erforderlich.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(business_user_ids) > self.MAX_IDS:
+            return Response({'detail': f'Es sind höchstens {self.MAX_IDS} business_user_ids erlaubt.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = Profile.objects.filter(user_id__in=business_user_ids, type='business').values(
+            'user_id',
+            *(f'user__order_stats__{field}' for field in BusinessOrderStats.STATUS_FIELDS.values()),
+        )
+        stats = {
+            row['user_id']: {
+                status_name: row[f'user__order_stats__{field}'] or 0
+                for status_name, field in BusinessOrderStats.STATUS_FIELDS.items()
+            }
+            for row in rows
+        }
+        return Response({
+            'results': [{'business_user': user_id, **stats[user_id]} for user_id in business_user_ids if user_id in stats],
+            'not_found': [user_id for user_id in business_user_ids if user_id not in stats],
+        }, status=status.HTTP_200_OK)
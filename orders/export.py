@@ -0,0 +1,84 @@
+import csv
+import datetime
+import decimal
+import json
+
+from orders.models import Order
+
+
+EXPORT_FIELDS = ['id', 'status', 'price', 'offer_type', 'created_at', 'updated_at']
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class _Echo:
+    """
+    Pseudo-Datei für `csv.writer`, die die geschriebene Zeile direkt zurückgibt statt sie zu puffern.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _format_value(value):
+    # gleiche Darstellung wie die REST-API (DRF): Dezimalzahlen als String, Zeitstempel ISO 8601 mit 'Z'
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def export_queryset(business_user_id=None):
+    """
+    Gibt das QuerySet der zu exportierenden Bestellungen zurück (optional nur eines Business-Users).
+    """
+    queryset = Order.objects.all()
+    if business_user_id is not None:
+        queryset = queryset.filter(business_user_id=business_user_id)
+    return queryset
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Liefert die Exportfelder zeilenweise als Tupel.
+    Die Zeilen werden per `values_list().iterator()` in Blöcken gelesen, es werden keine
+    Modellinstanzen gebaut und nie mehr als `chunk_size` Zeilen gleichzeitig gehalten.
+    """
+    rows = queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield tuple(_format_value(value) for value in row)
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Erzeugt den Export als NDJSON: ein JSON-Objekt pro Zeile.
+    """
+    for row in iter_rows(queryset, chunk_size):
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n'
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Erzeugt den Export als CSV mit Kopfzeile.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in iter_rows(queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def stream_orders(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Gibt einen Generator über die Exportzeilen im gewünschten Format (`ndjson` oder `csv`) zurück.
+    """
+    if export_format == 'csv':
+        return stream_csv(queryset, chunk_size)
+    if export_format == 'ndjson':
+        return stream_ndjson(queryset, chunk_size)
+    raise ValueError(f'Unbekanntes Exportformat: {export_format}')
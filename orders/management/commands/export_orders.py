@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from orders.export import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_queryset, stream_orders
+
+
+class Command(BaseCommand):
+    """
+    Exportiert Bestellungen zeilenweise als NDJSON oder CSV.
+    """
+    help = 'Exportiert Bestellungen (optional eines Business-Users) als NDJSON oder CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--business-user', type=int, help='Nur die Bestellungen dieses Business-Users exportieren.')
+        parser.add_argument('--export-format', choices=list(EXPORT_FORMATS), default='ndjson')
+        parser.add_argument('--output', help='Zieldatei (Standard: stdout).')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines = stream_orders(
+            export_queryset(options['business_user']), options['export_format'], chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
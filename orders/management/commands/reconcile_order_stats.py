@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from orders.models import BusinessOrderStats
+
+
+class Command(BaseCommand):
+    """
+    Gleicht die Bestellzähler pro Business-User mit der Order-Tabelle ab.
+    """
+    help = 'Berechnet die Bestellzähler pro Business-User neu und korrigiert Abweichungen.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('business_user_ids', nargs='*', type=int, help='Optional: nur diese Business-User abgleichen.')
+
+    def handle(self, *args, **options):
+        changed = BusinessOrderStats.reconcile(options['business_user_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'{changed} Zählerzeilen korrigiert.'))
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-18 06:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_business_order_stats(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    BusinessOrderStats = apps.get_model('orders', 'BusinessOrderStats')
+    rows = Order.objects.values('business_user_id').annotate(
+        in_progress_count=Count('id', filter=Q(status='in_progress')),
+        completed_count=Count('id', filter=Q(status='completed')),
+        cancelled_count=Count('id', filter=Q(status='cancelled')),
+    )
+    BusinessOrderStats.objects.bulk_create([
+        BusinessOrderStats(
+            business_user_id=row['business_user_id'],
+            in_progress_count=row['in_progress_count'],
+            completed_count=row['completed_count'],
+            cancelled_count=row['cancelled_count'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('orders', '0002_order_revisions_alter_order_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_business_order_stats, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,13 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 
+from coderr.tracking import DirtyFieldsMixin
 
-class Order(models.Model):
+
+class Order(DirtyFieldsMixin, models.Model):
     STATUS_CHOICES = [
         ('cancelled', 'Cancelled'),
         ('in_progress', 'In Progress'),
@@ -23,21 +26,116 @@ class Order(models.Model):
     offer_type = models.CharField(max_length=50, blank=True)
     revisions = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Bestellübersicht: je Rolle eine Abfrage sortiert nach created_at, id
+            models.Index(fields=['business_user', 'created_at', 'id'], name='order_business_created_idx'),
+            models.Index(fields=['customer_user', 'created_at', 'id'], name='order_customer_created_idx'),
+        ]
+
+    def copy_offer_detail(self, detail):
+        """
+        Übernimmt die Snapshot-Felder (Titel, Preis, Features, Revisionen, Business-User ...)
+        aus dem OfferDetail und dessen Angebot, sofern sie noch nicht gesetzt sind.
+        Erwartet ein OfferDetail mit geladenem Angebot (`select_related('offer')`), um keine
+        weiteren Abfragen auszulösen.
+        """
+        if not self.business_user_id:
+            self.business_user_id = detail.offer.user_id
+        if not self.title:
+            self.title = detail.offer.title
+        self.revisions = self.revisions or detail.revisions
+        self.delivery_time_in_days = self.delivery_time_in_days or detail.delivery_time_in_days
+        self.price = self.price or detail.price
+        self.features = self.features or detail.features
+        self.offer_type = self.offer_type or detail.offer_type
+
     def save(self, *args, **kwargs):
-        if not self.business_user_id and self.offer_detail_id:
-            self.business_user = self.offer_detail_id.offer.user
-        
-        if not self.title and self.offer_detail_id:
-            self.title = self.offer_detail_id.offer.title
-        if self.offer_detail_id:
-            detail = self.offer_detail_id
-            self.revisions = self.revisions or detail.revisions
-            self.delivery_time_in_days = self.delivery_time_in_days or detail.delivery_time_in_days
-            self.price = self.price or detail.price
-            self.features = self.features or detail.features
-            self.offer_type = self.offer_type or detail.offer_type
+        if self._state.adding and self.offer_detail_id_id:
+            self.copy_offer_detail(self.offer_detail_id)
         super().save(*args, **kwargs)
     
     def update(self, *args, **kwargs):
         self.updated_at = now()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class BusinessOrderStats(models.Model):
+    """
+    Zähler der Bestellungen eines Business-Users je Status.
+    Wird bei Anlage, Statuswechsel und Löschung von Bestellungen fortgeschrieben
+    (siehe `orders.signals`) und kann mit `reconcile_order_stats` neu berechnet werden.
+    """
+    STATUS_FIELDS = {
+        'in_progress': 'in_progress_count',
+        'completed': 'completed_count',
+        'cancelled': 'cancelled_count',
+    }
+
+    business_user = models.OneToOneField(User, primary_key=True, on_delete=models.CASCADE, related_name='order_stats')
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+
+    @classmethod
+    def compute(cls, business_user_ids):
+        """
+        Zählt die Bestellungen je Status direkt aus der Order-Tabelle.
+        Gibt ein Dict `{business_user_id: {zählerfeld: anzahl}}` zurück.
+        """
+        counts = Order.objects.filter(business_user_id__in=business_user_ids).values('business_user_id').annotate(
+            **{field: Count('id', filter=Q(status=status)) for status, field in cls.STATUS_FIELDS.items()}
+        )
+        result = {user_id: {field: 0 for field in cls.STATUS_FIELDS.values()} for user_id in business_user_ids}
+        for row in counts:
+            result[row.pop('business_user_id')] = row
+        return result
+
+    @classmethod
+    def record_status_change(cls, business_user_id, old_status=None, new_status=None, count=1):
+        """
+        Verbucht einen Statuswechsel atomar per `UPDATE ... SET feld = feld +/- count`.
+        `old_status=None` steht für eine neue, `new_status=None` für eine gelöschte Bestellung.
+        Existiert noch keine Zählerzeile, wird sie aus dem Bestand berechnet – außer beim Löschen,
+        da der Business-User dann womöglich selbst gerade gelöscht wird.
+        """
+        deltas = {}
+        if old_status in cls.STATUS_FIELDS:
+            deltas[cls.STATUS_FIELDS[old_status]] = -count
+        if new_status in cls.STATUS_FIELDS:
+            field = cls.STATUS_FIELDS[new_status]
+            deltas[field] = deltas.get(field, 0) + count
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        update = {field: F(field) + delta for field, delta in deltas.items()}
+        if cls.objects.filter(pk=business_user_id).update(**update) or new_status is None:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(pk=business_user_id, **cls.compute([business_user_id])[business_user_id])
+        except IntegrityError:
+            cls.objects.filter(pk=business_user_id).update(**update)
+
+    @classmethod
+    def reconcile(cls, business_user_ids=None):
+        """
+        Berechnet die Zähler der angegebenen (oder aller) Business-User neu.
+        Gibt die Anzahl der korrigierten Zählerzeilen zurück.
+        """
+        if business_user_ids is None:
+            business_user_ids = set(Order.objects.values_list('business_user_id', flat=True).distinct())
+            business_user_ids |= set(cls.objects.values_list('pk', flat=True))
+        computed = cls.compute(list(business_user_ids))
+        existing = cls.objects.in_bulk(list(business_user_ids))
+        changed = 0
+        for user_id, counts in computed.items():
+            stats = existing.get(user_id)
+            if stats and all(getattr(stats, field) == value for field, value in counts.items()):
+                continue
+            cls.objects.update_or_create(pk=user_id, defaults=counts)
+            changed += 1
+        return changed
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.in_progress_count} offen, {self.completed_count} abgeschlossen"
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr.tracking import UNKNOWN
+from orders.models import BusinessOrderStats, Order
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, **kwargs):
+    """
+    Verbucht neue Bestellungen und Statuswechsel in den Zählern des Business-Users.
+    """
+    if created:
+        BusinessOrderStats.record_status_change(instance.business_user_id, new_status=instance.status)
+        return
+    previous_status = instance.get_dirty_fields().get('status', instance.status)
+    if previous_status is UNKNOWN:
+        BusinessOrderStats.reconcile([instance.business_user_id])
+    elif previous_status != instance.status:
+        BusinessOrderStats.record_status_change(instance.business_user_id, previous_status, instance.status)
+
+
+@receiver(post_delete, sender=Order)
+def count_deleted_order(sender, instance, **kwargs):
+    status = instance.get_loaded_value('status', instance.status)
+    BusinessOrderStats.record_status_change(instance.business_user_id, old_status=status)
@@ -1,3 +1,352 @@
-from django.test import TestCase
+import csv
+import json
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from offers.models import Offer, OfferDetail
+from orders.api.views import AsyncOrdersBusinessCompletedCountView, AsyncOrdersBusinessUncompletedCountView, OrdersList
+from orders.models import BusinessOrderStats, Order
+from user_auth.models import Profile
+
+
+def create_user(username, profile_type):
+    """
+    Legt einen User samt Profil des angegebenen Typs an.
+    """
+    user = User.objects.create_user(username=username, password='secret')
+    Profile.objects.create(user=user, email=f'{username}@coderr.de', type=profile_type)
+    return user
+
+
+def create_offer_detail(business_user, offer_type='basic', price=100):
+    """
+    Legt ein Angebot mit einem Paket an und gibt das Paket zurück.
+    """
+    offer = Offer.objects.create(user=business_user, title='Logo', description='Design')
+    return OfferDetail.objects.create(
+        offer=offer, title=offer_type, revisions=2, delivery_time_in_days=3,
+        price=price, features=['Logo'], offer_type=offer_type,
+    )
+
+
+class BusinessOrderStatsTests(APITestCase):
+    """
+    Prüft die Bestellzähler pro Business-User und den Sammel-Endpunkt.
+    """
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.other_business = create_user('other', 'business')
+        self.customer = create_user('customer', 'customer')
+        self.detail = create_offer_detail(self.business)
+
+    def _counts(self, business_user):
+        stats = BusinessOrderStats.objects.get(pk=business_user.pk)
+        return stats.in_progress_count, stats.completed_count, stats.cancelled_count
+
+    def test_counters_follow_order_lifecycle(self):
+        self.client.force_authenticate(self.customer)
+        order_ids = [self.client.post('/api/orders/', {'offer_detail_id': self.detail.id}).data['id'] for _ in range(3)]
+        self.assertEqual(self._counts(self.business), (3, 0, 0))
+
+        self.client.force_authenticate(self.business)
+        self.client.patch(f'/api/orders/{order_ids[0]}/', {'status': 'completed'})
+        self.client.patch(f'/api/orders/{order_ids[1]}/', {'status': 'cancelled'})
+        self.assertEqual(self._counts(self.business), (1, 1, 1))
+
+        Order.objects.get(pk=order_ids[2]).delete()
+        self.assertEqual(self._counts(self.business), (0, 1, 1))
+
+    def test_stats_endpoint_is_a_single_query(self):
+        for _ in range(2):
+            Order.objects.create(offer_detail_id=self.detail, customer_user=self.customer.id)
+        Order.objects.filter(pk=Order.objects.first().pk).update(status='completed')
+        call_command('reconcile_order_stats', stdout=StringIO())
+
+        self.client.force_authenticate(self.customer)
+        ids = f'{self.business.id},{self.other_business.id},{self.customer.id}'
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/order-stats/', {'business_user_ids': ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [
+            {'business_user': self.business.id, 'in_progress': 1, 'completed': 1, 'cancelled': 0},
+            {'business_user': self.other_business.id, 'in_progress': 0, 'completed': 0, 'cancelled': 0},
+        ])
+        self.assertEqual(response.data['not_found'], [self.customer.id])
+
+    def test_stats_endpoint_validates_ids(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get('/api/order-stats/').status_code, 400)
+        self.assertEqual(self.client.get('/api/order-stats/', {'business_user_ids': '1,abc'}).status_code, 400)
+
+    def test_deleting_business_user_cleans_up(self):
+        Order.objects.create(offer_detail_id=self.detail, customer_user=self.customer.id)
+        self.business.delete()
+        self.assertFalse(BusinessOrderStats.objects.exists())
+
+
+class OrdersBulkCreateTests(APITestCase):
+    """
+    Prüft das Anlegen mehrerer Bestellungen in einem Request.
+    """
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        self.details = [create_offer_detail(self.business, offer_type, price) for offer_type, price in [('basic', 100), ('premium', 300)]]
+        self.client.force_authenticate(self.customer)
+
+    def test_bulk_create_copies_snapshot_fields(self):
+        ids = [self.details[0].id, self.details[1].id, self.details[0].id]
+        response = self.client.post('/api/orders/bulk/', {'offer_detail_ids': ids}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['price'] for item in response.data], ['100.00', '300.00', '100.00'])
+        self.assertEqual({item['business_user'] for item in response.data}, {self.business.id})
+        self.assertEqual({item['customer_user'] for item in response.data}, {self.customer.id})
+        self.assertEqual(BusinessOrderStats.objects.get(pk=self.business.pk).in_progress_count, 3)
+
+    def test_query_count_is_independent_of_item_count(self):
+        self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[0].id]}, format='json')
+        with CaptureQueriesContext(connection) as single:
+            self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[0].id]}, format='json')
+        with CaptureQueriesContext(connection) as many:
+            self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[1].id] * 20}, format='json')
+        self.assertEqual(len(many), len(single))
+        self.assertEqual(Order.objects.count(), 22)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        response = self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[0].id, 999, 'x']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['offer_detail_ids']), {2})
+        response = self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[0].id, 999]}, format='json')
+        self.assertEqual(set(response.data['offer_detail_ids']), {1})
+        self.assertFalse(Order.objects.exists())
+
+    def test_only_customers_can_bulk_order(self):
+        self.client.force_authenticate(self.business)
+        response = self.client.post('/api/orders/bulk/', {'offer_detail_ids': [self.details[0].id]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class OrderInboxTests(APITestCase):
+    """
+    Prüft Filter und Cursor-Paginierung der Bestellübersicht (GET /api/orders/).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        cls.customer = create_user('customer', 'customer')
+        cls.other = create_user('other', 'customer')
+        detail = create_offer_detail(cls.business)
+        cls.orders = []
+        for i in range(7):
+            order = Order.objects.create(offer_detail_id=detail, customer_user=(cls.customer if i % 2 else cls.other).id)
+            cls.orders.append(order)
+        Order.objects.filter(pk=cls.orders[0].pk).update(status='completed', created_at='2024-01-10T12:00:00Z')
+        # gleicher Zeitstempel erzwingt den ID-Tie-Breaker
+        Order.objects.filter(pk__in=[cls.orders[1].pk, cls.orders[2].pk]).update(created_at='2024-02-01T00:00:00Z')
+
+    def _ids(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/orders/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data]
+
+    def _walk(self, user, **params):
+        self.client.force_authenticate(user)
+        ids, url, params = [], '/api/orders/', {'pagination': 'cursor', 'page_size': 2, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids += [item['id'] for item in response.data['results']]
+            url, params = response.data['next'], None
+        return ids
+
+    def test_cursor_walk_matches_full_list(self):
+        for ordering in ('created_at', '-created_at'):
+            with self.subTest(ordering=ordering):
+                expected = Order.objects.filter(business_user=self.business).order_by(ordering, f'{ordering[:-10]}id')
+                self.assertEqual(self._walk(self.business, ordering=ordering), [order.id for order in expected])
+                self.assertEqual(self._ids(self.business, ordering=ordering), [order.id for order in expected])
+
+    def test_each_role_sees_only_own_orders(self):
+        expected = [order.id for order in Order.objects.filter(customer_user=self.customer.id).order_by('created_at', 'id')]
+        self.assertEqual(self._walk(self.customer), expected)
+        self.assertEqual(self._ids(self.business, role='customer'), [])
+
+    def test_status_and_date_filters(self):
+        self.assertEqual(self._ids(self.business, status='completed'), [self.orders[0].id])
+        self.assertEqual(self._ids(self.business, created_to='2024-01-10'), [self.orders[0].id])
+        self.assertEqual(self._ids(self.business, created_from='2024-01-11', created_to='2024-02-01T00:00:00Z'),
+                         [self.orders[1].id, self.orders[2].id])
+        self.client.force_authenticate(self.business)
+        self.assertEqual(self.client.get('/api/orders/', {'status': 'offen'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/orders/', {'created_from': 'gestern'}).status_code, 400)
+
+    def test_page_uses_one_query_per_role(self):
+        self.client.force_authenticate(self.customer)
+        with self.assertNumQueries(2):
+            self.client.get('/api/orders/', {'pagination': 'cursor', 'page_size': 2})
+
+    def test_plain_list_is_capped(self):
+        self.client.force_authenticate(self.business)
+        expected = [order.id for order in Order.objects.filter(business_user=self.business).order_by('-created_at', '-id')]
+        with mock.patch.object(OrdersList, 'LIST_LIMIT', 3), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self._ids(self.business, ordering='-created_at'), expected[:3])
+        self.assertTrue(all('LIMIT 3' in query['sql'] for query in queries.captured_queries))
+
+    def test_role_queries_use_composite_indexes(self):
+        plan = Order.objects.filter(customer_user=self.customer.id).order_by('created_at', 'id').explain()
+        self.assertIn('order_customer_created_idx', plan)
+        plan = Order.objects.filter(business_user=self.business).order_by('-created_at', '-id').explain()
+        self.assertIn('order_business_created_idx', plan)
+
+
+class OrderExportTests(APITestCase):
+    """
+    Prüft den gestreamten Export der Bestellhistorie (Endpunkt und Management-Command).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        cls.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(cls.business, 'premium', 250)
+        cls.orders = [Order.objects.create(offer_detail_id=detail, customer_user=cls.customer.id) for _ in range(3)]
+        Order.objects.filter(pk=cls.orders[1].pk).update(status='completed')
+
+    def _export(self, **params):
+        self.client.force_authenticate(self.business)
+        response = self.client.get('/api/orders/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_matches_api_representation(self):
+        rows = [json.loads(line) for line in self._export().splitlines()]
+        self.client.force_authenticate(self.business)
+        api_rows = self.client.get('/api/orders/').data
+        self.assertEqual(rows, [{field: item[field] for field in rows[0]} for item in api_rows])
+        self.assertEqual(set(rows[0]), {'id', 'status', 'price', 'offer_type', 'created_at', 'updated_at'})
+
+    def test_csv_with_filter(self):
+        rows = list(csv.reader(StringIO(self._export(export_format='csv', status='completed'))))
+        self.assertEqual(rows[0], ['id', 'status', 'price', 'offer_type', 'created_at', 'updated_at'])
+        self.assertEqual([row[:4] for row in rows[1:]], [[str(self.orders[1].id), 'completed', '250.00', 'premium']])
+
+    def test_only_business_users_and_known_formats(self):
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.client.get('/api/orders/export/').status_code, 403)
+        self.client.force_authenticate(self.business)
+        self.assertEqual(self.client.get('/api/orders/export/', {'export_format': 'xlsx'}).status_code, 400)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command('export_orders', '--business-user', str(self.business.id), '--chunk-size', '1', stdout=out)
+        self.assertEqual([json.loads(line)['id'] for line in out.getvalue().splitlines()], [order.id for order in self.orders])
+
+
+class AsyncOrderCountViewTests(APITestCase):
+    """
+    Prüft die async Bestellzähler gegen die synchronen Views, inklusive der 404-Fälle.
+    """
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(self.business)
+        orders = [Order.objects.create(offer_detail_id=detail, customer_user=self.customer.id) for _ in range(3)]
+        Order.objects.filter(pk=orders[0].pk).update(status='completed')
+        self.client.force_authenticate(self.customer)
+
+    def _get_async(self, view_class, path, pk):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, self.customer)
+        return async_to_sync(view_class.as_view())(request, pk=pk)
+
+    def test_matches_sync_views(self):
+        views = [
+            ('order-count', AsyncOrdersBusinessUncompletedCountView),
+            ('completed-order-count', AsyncOrdersBusinessCompletedCountView),
+        ]
+        for prefix, view_class in views:
+            for pk in (self.business.pk, self.customer.pk, 999):
+                with self.subTest(prefix=prefix, pk=pk):
+                    path = f'/api/{prefix}/{pk}/'
+                    expected = self.client.get(path)
+                    response = self._get_async(view_class, path, pk)
+                    self.assertEqual((response.status_code, response.data), (expected.status_code, expected.data))
+        self.assertEqual(self._get_async(AsyncOrdersBusinessUncompletedCountView, '/', self.business.pk).data, {'order_count': 2})
+
+    def test_requires_authentication(self):
+        request = APIRequestFactory().get('/')
+        response = async_to_sync(AsyncOrdersBusinessCompletedCountView.as_view())(request, pk=self.business.pk)
+        self.assertEqual(response.status_code, 401)
+
+
+class OrderRowSerializerTests(APITestCase):
+    """
+    Prüft, dass die schnelle Listenausgabe (`FAST_LIST_SERIALIZERS`) byteweise mit `OrderListSerializer` übereinstimmt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        cls.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(cls.business, price='1234.5')
+        orders = [Order.objects.create(offer_detail_id=detail, customer_user=cls.customer.id) for _ in range(4)]
+        Order.objects.filter(pk=orders[0].pk).update(status='completed', price=None, features={'Größe': ['A4', 3]})
+        Order.objects.filter(pk=orders[1].pk).update(title=None, created_at='2024-02-01T00:00:00Z')
+        # Bestellung, in der der Business-User zugleich Kunde ist (taucht in beiden Teilabfragen auf)
+        Order.objects.create(offer_detail_id=detail, customer_user=cls.business.id)
+
+    def _get(self, fast, user, params):
+        self.client.force_authenticate(user)
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get('/api/orders/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_output_matches_order_list_serializer(self):
+        for user in (self.business, self.customer):
+            for params in ({}, {'ordering': '-created_at'}, {'status': 'completed'}, {'pagination': 'cursor', 'page_size': 2}):
+                with self.subTest(user=user.username, params=params):
+                    self.assertEqual(self._get(True, user, params), self._get(False, user, params))
+
+
+class FastJSONResponseTests(APITestCase):
+    """
+    Prüft, dass die Bestell- und Angebots-Endpunkte mit `FastJSONRenderer`/`FastJSONParser` dieselben
+    Antworten liefern wie mit DRFs JSON-Klassen (die Klassen selbst prüft `coderr.tests`).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        cls.customer = create_user('customer', 'customer')
+        detail = create_offer_detail(cls.business, price='1234.5')
+        Order.objects.create(offer_detail_id=detail, customer_user=cls.customer.id, features={'Größe': ['A4'], 'Seiten': 3})
+
+    def test_api_responses_match_json_renderer(self):
+        self.client.force_authenticate(self.customer)
+        for path in ('/api/orders/', '/api/offers/', '/api/base-info/'):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_json_post_is_parsed(self):
+        detail = OfferDetail.objects.get()
+        self.client.force_authenticate(self.customer)
+        response = self.client.post('/api/orders/', {'offer_detail_id': detail.pk}, format='json')
+        self.assertEqual(response.status_code, 201)
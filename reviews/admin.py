@@ -1,4 +1,5 @@
 from django.contrib import admin
-from .models import Review
+from .models import BusinessRatingSummary, Review
 
 admin.site.register(Review)
+admin.site.register(BusinessRatingSummary)
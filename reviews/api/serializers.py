@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from coderr.rows import RowSerializer
 from reviews.models import Review
 
 class ReviewsSerializer(serializers.ModelSerializer):
@@ -47,4 +48,25 @@ class ReviewsSerializer(serializers.ModelSerializer):
         Setzt den Reviewer automatisch auf den aktuellen Nutzer.
         """
         validated_data['reviewer'] = self.context['request'].user
-        return super().create(validated_data)
\ No newline at end of file
+        return super().create(validated_data)
+
+
+class ReviewRowSerializer(RowSerializer):
+    """
+    Schnelle Listenausgabe von `ReviewsSerializer` aus `values_list()`-Zeilen (siehe `coderr.rows`).
+    """
+    reference = ReviewsSerializer
+    columns = ('pk', 'reviewer_id', 'business_user_id', 'rating', 'description', 'created_at', 'updated_at')
+    formatted_fields = ('created_at', 'updated_at')
+
+    def to_representation(self, row):
+        formatters = self.get_formatters()
+        return {
+            'id': row.pk,
+            'reviewer': row.reviewer_id,
+            'business_user': row.business_user_id,
+            'rating': row.rating,
+            'description': row.description,
+            'created_at': formatters['created_at'](row.created_at),
+            'updated_at': formatters['updated_at'](row.updated_at),
+        }
@@ -5,4 +5,5 @@ from . import views
 urlpatterns = [
     path('reviews/', views.ReviewListView.as_view()),
     path('reviews/<int:pk>/', views.ReviewDetailsview.as_view()),
+    path('review-summary/<int:pk>/', views.BusinessRatingSummaryView.as_view()),
 ]
\ No newline at end of file
@@ -1,19 +1,41 @@
 from rest_framework import generics
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from reviews.models import Review
-from .serializers import ReviewsSerializer
+from rest_framework.views import APIView
+from coderr.pagination import KeysetPagination
+from coderr.rows import fast_lists_enabled
+from reviews.models import BusinessRatingSummary, Review
+from user_auth.models import Profile
+from .serializers import ReviewRowSerializer, ReviewsSerializer
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 
 
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Cursor-Paginierung für Bewertungen (aktiviert über ?pagination=cursor).
+    Blättert per Keyset über die Sortierung aus `ordering` (updated_at, rating) plus ID.
+    """
+    page_size = 10
+    max_page_size = 100
+    DEFAULT_ORDERING = '-updated_at'
+
+    def get_ordering(self, request, view):
+        ordering = request.query_params.get('ordering', self.DEFAULT_ORDERING)
+        if ordering.lstrip('-') not in view.ordering_fields:
+            ordering = self.DEFAULT_ORDERING
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+
 class ReviewListView(generics.ListCreateAPIView):
     """
     API-Endpunkt für das Abrufen und Erstellen von Bewertungen.
 
     - `GET`: Gibt alle Bewertungen zurück, filterbar nach `business_user_id` und `reviewer_id`.
+      Mit `?pagination=cursor` seitenweise per Keyset (Sortierung über `ordering`: updated_at, rating).
+      Mit `FAST_LIST_SERIALIZERS` erfolgt die Ausgabe über `ReviewRowSerializer`.
     - `POST`: Erstellt eine neue Bewertung, nur erlaubt für authentifizierte Nutzer mit einem Kundenprofil.
     """
     queryset = Review.objects.all()
@@ -24,6 +46,30 @@ class ReviewListView(generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     pagination_class = None
 
+    @property
+    def paginator(self):
+        """
+        Ohne Angabe bleibt die Liste unpaginiert, mit ?pagination=cursor wird per Keyset paginiert.
+        """
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get('pagination')
+            if mode not in (None, 'cursor'):
+                raise ValidationError({'detail': 'pagination muss den Wert cursor haben.'})
+            self._paginator = ReviewCursorPagination() if mode == 'cursor' else None
+        return self._paginator
+
+    def list(self, request, *args, **kwargs):
+        """
+        Gibt die Bewertungen aus; mit `FAST_LIST_SERIALIZERS` direkt aus `values_list()`-Zeilen.
+        """
+        if not fast_lists_enabled():
+            return super().list(request, *args, **kwargs)
+        queryset = ReviewRowSerializer.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(ReviewRowSerializer(page, many=True).data)
+        return Response(ReviewRowSerializer(queryset, many=True).data)
+
     def get_permissions(self):
         """
         Gibt spezifische Berechtigungen je nach HTTP-Methode zurück.
@@ -98,4 +144,34 @@ class ReviewDetailsview(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class BusinessRatingSummaryView(APIView):
+    """
+    API-Endpunkt für die Bewertungsübersicht eines Business-Users:
+    Anzahl, Summe, Durchschnitt und Verteilung der Sterne (1–5).
+
+    Die Werte stammen aus `BusinessRatingSummary` und werden zusammen mit der
+    Business-Profil-Prüfung in einer einzigen Abfrage gelesen.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk, format=None):
+        """
+        Gibt die Bewertungsübersicht zurück oder 404, wenn kein Business-Profil existiert.
+        """
+        fields = BusinessRatingSummary.counter_fields()
+        row = Profile.objects.filter(user_id=pk, type='business').values(
+            *(f'user__rating_summary__{field}' for field in fields)
+        ).first()
+        if row is None:
+            return Response({'detail': 'Dieser Benutzer ist kein Business-Profil.'}, status=status.HTTP_404_NOT_FOUND)
+        summary = BusinessRatingSummary(business_user_id=pk, **{field: row[f'user__rating_summary__{field}'] or 0 for field in fields})
+        return Response({
+            'business_user': pk,
+            'review_count': summary.review_count,
+            'rating_sum': summary.rating_sum,
+            'average_rating': summary.average_rating,
+            'histogram': {str(rating): count for rating, count in summary.histogram.items()},
+        }, status=status.HTTP_200_OK)
@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
 from django.contrib.auth.models import User
 from django.utils.timezone import now
 
+from coderr.tracking import DirtyFieldsMixin
 
-class Review(models.Model):
+
+class Review(DirtyFieldsMixin, models.Model):
     reviewer = models.ForeignKey( User, on_delete=models.CASCADE, related_name='reviews')
     business_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reviewed')
     rating = models.IntegerField()
@@ -11,9 +14,124 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Bewertungsliste eines Business-Users, per Keyset nach updated_at bzw. rating sortiert
+            models.Index(fields=['business_user', 'updated_at', 'id'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating', 'id'], name='review_business_rating_idx'),
+        ]
+
     def update(self, **kwargs):
         updated_at= now()
         super().save(**kwargs)
 
     def __str__(self):
         return f"{self.reviewer} reviewed {self.business_user}"
+
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Bewertungsübersicht eines Business-Users: Anzahl, Summe und Verteilung der Sterne (1–5).
+    Wird beim Anlegen, Ändern und Löschen von Bewertungen fortgeschrieben
+    (siehe `reviews.signals`) und kann mit `reconcile_rating_summaries` neu berechnet werden.
+    """
+    RATINGS = range(1, 6)
+    HISTOGRAM_FIELDS = {rating: f'rating_{rating}_count' for rating in RATINGS}
+
+    business_user = models.OneToOneField(User, primary_key=True, on_delete=models.CASCADE, related_name='rating_summary')
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+
+    @property
+    def average_rating(self):
+        """
+        Durchschnittsbewertung, auf eine Nachkommastelle gerundet (0 ohne Bewertungen).
+        """
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        """
+        Anzahl der Bewertungen je Sternezahl als Dict `{1: anzahl, ..., 5: anzahl}`.
+        """
+        return {rating: getattr(self, field) for rating, field in self.HISTOGRAM_FIELDS.items()}
+
+    @classmethod
+    def counter_fields(cls):
+        return ['review_count', 'rating_sum', *cls.HISTOGRAM_FIELDS.values()]
+
+    @classmethod
+    def compute(cls, business_user_ids):
+        """
+        Berechnet die Kennzahlen direkt aus der Review-Tabelle.
+        Gibt ein Dict `{business_user_id: {zählerfeld: wert}}` zurück.
+        """
+        rows = Review.objects.filter(business_user_id__in=business_user_ids).values('business_user_id').annotate(
+            review_count=Count('id'),
+            rating_sum=Sum('rating'),
+            **{field: Count('id', filter=Q(rating=rating)) for rating, field in cls.HISTOGRAM_FIELDS.items()},
+        )
+        result = {user_id: {field: 0 for field in cls.counter_fields()} for user_id in business_user_ids}
+        for row in rows:
+            result[row.pop('business_user_id')] = row
+        return result
+
+    @classmethod
+    def record_change(cls, business_user_id, old_rating=None, new_rating=None):
+        """
+        Verbucht eine Bewertungsänderung atomar per `UPDATE ... SET feld = feld +/- 1`.
+        `old_rating=None` steht für eine neue, `new_rating=None` für eine gelöschte Bewertung.
+        Existiert noch keine Zeile, wird sie aus dem Bestand berechnet – außer beim Löschen,
+        da der Business-User dann womöglich selbst gerade gelöscht wird.
+        """
+        deltas = {}
+        for rating, sign in ((old_rating, -1), (new_rating, 1)):
+            if rating is None:
+                continue
+            deltas['review_count'] = deltas.get('review_count', 0) + sign
+            deltas['rating_sum'] = deltas.get('rating_sum', 0) + sign * rating
+            field = cls.HISTOGRAM_FIELDS.get(rating)
+            if field:
+                deltas[field] = deltas.get(field, 0) + sign
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        update = {field: F(field) + delta for field, delta in deltas.items()}
+        if cls.objects.filter(pk=business_user_id).update(**update) or new_rating is None:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(pk=business_user_id, **cls.compute([business_user_id])[business_user_id])
+        except IntegrityError:
+            cls.objects.filter(pk=business_user_id).update(**update)
+
+    @classmethod
+    def reconcile(cls, business_user_ids=None):
+        """
+        Berechnet die Übersichten der angegebenen (oder aller) Business-User neu.
+        Gibt die Anzahl der korrigierten Zeilen zurück.
+        """
+        if business_user_ids is None:
+            business_user_ids = set(Review.objects.values_list('business_user_id', flat=True).distinct())
+            business_user_ids |= set(cls.objects.values_list('pk', flat=True))
+        computed = cls.compute(list(business_user_ids))
+        existing = cls.objects.in_bulk(list(business_user_ids))
+        changed = 0
+        for user_id, values in computed.items():
+            summary = existing.get(user_id)
+            if summary and all(getattr(summary, field) == value for field, value in values.items()):
+                continue
+            cls.objects.update_or_create(pk=user_id, defaults=values)
+            changed += 1
+        return changed
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.review_count} Bewertungen, Ø {self.average_rating}"
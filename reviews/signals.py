@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coderr.tracking import UNKNOWN
+from reviews.models import BusinessRatingSummary, Review
+
+
+@receiver(post_save, sender=Review)
+def summarize_saved_review(sender, instance, created, **kwargs):
+    """
+    Verbucht neue Bewertungen bzw. bei Updates die Änderung von Sternen oder Business-User.
+    """
+    if created:
+        BusinessRatingSummary.record_change(instance.business_user_id, new_rating=instance.rating)
+        return
+    dirty = instance.get_dirty_fields()
+    previous_user_id = dirty.get('business_user_id', instance.business_user_id)
+    previous_rating = dirty.get('rating', instance.rating)
+    if previous_user_id is UNKNOWN:
+        BusinessRatingSummary.reconcile()
+    elif previous_rating is UNKNOWN:
+        BusinessRatingSummary.reconcile({previous_user_id, instance.business_user_id})
+    elif previous_user_id != instance.business_user_id:
+        BusinessRatingSummary.record_change(previous_user_id, old_rating=previous_rating)
+        BusinessRatingSummary.record_change(instance.business_user_id, new_rating=instance.rating)
+    elif previous_rating != instance.rating:
+        BusinessRatingSummary.record_change(instance.business_user_id, previous_rating, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def summarize_deleted_review(sender, instance, **kwargs):
+    business_user_id = instance.get_loaded_value('business_user_id', instance.business_user_id)
+    rating = instance.get_loaded_value('rating', instance.rating)
+    BusinessRatingSummary.record_change(business_user_id, old_rating=rating)
@@ -1,3 +1,126 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from reviews.models import BusinessRatingSummary, Review
+from user_auth.models import Profile
+
+
+def create_user(username, profile_type):
+    """
+    Legt einen User samt Profil des angegebenen Typs an.
+    """
+    user = User.objects.create_user(username=username, password='secret')
+    Profile.objects.create(user=user, email=f'{username}@coderr.de', type=profile_type)
+    return user
+
+
+class BusinessRatingSummaryTests(APITestCase):
+    """
+    Prüft, dass die Bewertungsübersicht über die API-Endpunkte aktuell bleibt.
+    """
+
+    def setUp(self):
+        self.business = create_user('business', 'business')
+        self.customers = [create_user(f'customer{i}', 'customer') for i in range(3)]
+
+    def _review(self, customer, rating):
+        self.client.force_authenticate(customer)
+        response = self.client.post('/api/reviews/', {'business_user': self.business.id, 'rating': rating, 'description': 'Gut'})
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def _summary(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/review-summary/{self.business.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_summary_follows_create_update_and_delete(self):
+        review_ids = [self._review(customer, rating) for customer, rating in zip(self.customers, (5, 4, 4))]
+        summary = self._summary()
+        self.assertEqual((summary['review_count'], summary['rating_sum'], summary['average_rating']), (3, 13, 4.3))
+        self.assertEqual(summary['histogram'], {'1': 0, '2': 0, '3': 0, '4': 2, '5': 1})
+
+        self.client.force_authenticate(self.customers[1])
+        self.client.patch(f'/api/reviews/{review_ids[1]}/', {'rating': 1})
+        self.client.force_authenticate(self.customers[0])
+        self.client.delete(f'/api/reviews/{review_ids[0]}/')
+        summary = self._summary()
+        self.assertEqual((summary['review_count'], summary['rating_sum'], summary['average_rating']), (2, 5, 2.5))
+        self.assertEqual(summary['histogram'], {'1': 1, '2': 0, '3': 0, '4': 1, '5': 0})
+
+    def test_summary_without_reviews_and_for_non_business_users(self):
+        self.assertEqual(self._summary()['review_count'], 0)
+        response = self.client.get(f'/api/review-summary/{self.customers[0].id}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_reconcile_command_repairs_drift(self):
+        self._review(self.customers[0], 3)
+        BusinessRatingSummary.objects.filter(pk=self.business.pk).update(review_count=7, rating_3_count=0)
+        call_command('reconcile_rating_summaries', stdout=StringIO())
+        summary = BusinessRatingSummary.objects.get(pk=self.business.pk)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.histogram[3]), (1, 3, 1))
+
+
+class ReviewCursorPaginationTests(APITestCase):
+    """
+    Prüft die Keyset-Paginierung der Bewertungsliste (?pagination=cursor).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        for i in range(7):
+            customer = create_user(f'customer{i}', 'customer')
+            Review.objects.create(reviewer=customer, business_user=cls.business, rating=1 + i % 3, description='Gut')
+
+    def _walk(self, **params):
+        self.client.force_authenticate(self.business)
+        ids, url, params = [], '/api/reviews/', {'pagination': 'cursor', 'page_size': 2, **params}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids += [item['id'] for item in response.data['results']]
+            url, params = response.data['next'], None
+        return ids
+
+    def test_cursor_walk_matches_full_ordering(self):
+        for ordering in ('updated_at', '-updated_at', 'rating', '-rating'):
+            with self.subTest(ordering=ordering):
+                field = ordering.lstrip('-')
+                expected = sorted(Review.objects.all(), key=lambda review: (getattr(review, field), review.id), reverse=ordering.startswith('-'))
+                self.assertEqual(self._walk(ordering=ordering, business_user_id=self.business.id), [review.id for review in expected])
+
+    def test_list_stays_unpaginated_by_default(self):
+        self.client.force_authenticate(self.business)
+        response = self.client.get('/api/reviews/')
+        self.assertEqual(len(response.data), 7)
+
+
+class ReviewRowSerializerTests(APITestCase):
+    """
+    Prüft, dass die schnelle Listenausgabe (`FAST_LIST_SERIALIZERS`) byteweise mit `ReviewsSerializer` übereinstimmt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_user('business', 'business')
+        for i in range(4):
+            customer = create_user(f'customer{i}', 'customer')
+            Review.objects.create(reviewer=customer, business_user=cls.business, rating=1 + i % 3, description=f'Sehr gut {i} – „Top“')
+
+    def _get(self, fast, params):
+        self.client.force_authenticate(self.business)
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get('/api/reviews/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_output_matches_reviews_serializer(self):
+        for params in ({}, {'ordering': '-rating'}, {'business_user_id': self.business.pk}, {'pagination': 'cursor', 'page_size': 3}):
+            with self.subTest(params=params):
+                self.assertEqual(self._get(True, params), self._get(False, params))
@@ -2,7 +2,11 @@ from rest_framework import serializers
 from rest_framework.authtoken.models import Token
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from coderr.fields import ImageVariantsField
+from coderr.images import variant_urls
+from coderr.rows import RowSerializer, file_url
 from user_auth.models import Profile
+from user_auth.tokens import issue_tokens
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -94,9 +98,11 @@ class ProfileSerializer(serializers.ModelSerializer):
     - Bestimmte Felder sind mit benutzerdefinierten Fehlermeldungen ausgestattet.
     - Die Validierung stellt sicher, dass nur explizit erlaubte Felder verändert werden.
     """
+    file_variants = ImageVariantsField(source='file')
+
     class Meta:
         model = Profile
-        fields = '__all__'
+        exclude = ['updated_at']
         extra_kwargs = {
             'email': {'error_messages': {'blank': ['Dieses Feld darf nicht leer sein'], 'required': 'Dieses Feld ist erforderlich', 'unique': 'Diese E-Mail ist bereits vergeben'}},
             'first_name': {'error_messages': {'blank': ['Dieses Feld darf nicht leer sein']}},
@@ -107,6 +113,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'tel': {'error_messages': {'blank': ['Dieses Feld darf nicht leer sein']}}
         }
 
+
     def validate(self, attrs):
         """
         Validiert, ob nur zulässige Felder übermittelt wurden.
@@ -153,6 +160,7 @@ class LoginSerializer(serializers.Serializer):
         - Benutzer anhand des Benutzernamens suchen
         - Passwort überprüfen
         - Token erstellen oder abrufen
+        - signiertes Access-/Refresh-Token ausstellen
         """
         username = data.get('username')
         password = data.get('password')
@@ -165,6 +173,7 @@ class LoginSerializer(serializers.Serializer):
         data['user_id'] = user.id
         data['token'] = token.key
         data['email'] = user.email
+        data.update(issue_tokens(user))
         return data
     
 
@@ -178,9 +187,10 @@ class BusinessProfilesListSerializer(serializers.ModelSerializer):
     - Konvertiert verschachtelte Benutzerinformationen in eine einfache ID im Output
     """
     user = UserSerializer()
+    file_variants = ImageVariantsField(source='file')
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'location', 'tel', 'description', 'working_hours', 'type']
 
     def to_representation(self, instance):
         """
@@ -190,6 +200,7 @@ class BusinessProfilesListSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         representation['user'] = representation['user']['id']
         return representation
+
     
 
 class CustomerProfilesListSerializer(serializers.ModelSerializer):
@@ -201,9 +212,10 @@ class CustomerProfilesListSerializer(serializers.ModelSerializer):
     - Profilinformationen wie Name, Profilbild, Registrierungszeitpunkt, Typ
     """
     user = UserSerializer()
+    file_variants = ImageVariantsField(source='file')
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type']
+        fields = ['user', 'username', 'first_name', 'last_name', 'file', 'file_variants', 'uploaded_at', 'type']
 
     def to_representation(self, instance):
         """
@@ -212,4 +224,76 @@ class CustomerProfilesListSerializer(serializers.ModelSerializer):
         """
         representation = super().to_representation(instance)
         representation['user'] = representation['user']['id']
-        return representation
\ No newline at end of file
+        return representation
+
+
+
+class ProfileRowSerializer(RowSerializer):
+    """
+    Basis der schnellen Listenausgabe der Profilverzeichnisse aus `values_list()`-Zeilen (siehe `coderr.rows`).
+    Die User-ID kommt direkt aus der Spalte `user_id`, ein Join auf den User entfällt;
+    `id` wird für die Keyset-Paginierung mitgeladen.
+    """
+
+    def __init__(self, instance=None, many=True, context=None):
+        super().__init__(instance, many, context)
+        self.file_storage = Profile._meta.get_field('file').storage
+
+    def get_file_fields(self, row):
+        request = self.context.get('request')
+        return {
+            'file': file_url(self.file_storage, row.file, request),
+            'file_variants': variant_urls(row.file, request),
+        }
+
+
+class BusinessProfileRowSerializer(ProfileRowSerializer):
+    """
+    Schnelle Listenausgabe von `BusinessProfilesListSerializer`.
+    """
+    reference = BusinessProfilesListSerializer
+    columns = ('pk', 'id', 'user_id', 'username', 'first_name', 'last_name', 'file', 'location', 'tel', 'description', 'working_hours', 'type')
+
+    def to_representation(self, row):
+        return {
+            'user': row.user_id,
+            'username': row.username,
+            'first_name': row.first_name,
+            'last_name': row.last_name,
+            **self.get_file_fields(row),
+            'location': row.location,
+            'tel': row.tel,
+            'description': row.description,
+            'working_hours': row.working_hours,
+            'type': row.type,
+        }
+
+
+class CustomerProfileRowSerializer(ProfileRowSerializer):
+    """
+    Schnelle Listenausgabe von `CustomerProfilesListSerializer`.
+    """
+    reference = CustomerProfilesListSerializer
+    columns = ('pk', 'id', 'user_id', 'username', 'first_name', 'last_name', 'file', 'uploaded_at', 'type')
+    formatted_fields = ('uploaded_at',)
+
+    def to_representation(self, row):
+        return {
+            'user': row.user_id,
+            'username': row.username,
+            'first_name': row.first_name,
+            'last_name': row.last_name,
+            **self.get_file_fields(row),
+            'uploaded_at': self.get_formatters()['uploaded_at'](row.uploaded_at),
+            'type': row.type,
+        }
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Serializer für den Refresh-Flow der signierten Tokens.
+
+    Nimmt ein `refresh_token` entgegen und gibt ein neues Paar aus
+    `access_token` und `refresh_token` zurück.
+    """
+    refresh_token = serializers.CharField()
@@ -1,10 +1,13 @@
 from django.urls import path
+from coderr.async_views import select_view
 from . import views
 
 urlpatterns = [
     path('login/', views.LoginView.as_view(), name='login'),
     path('registration/', views.RegisterView.as_view(), name='register'),
+    path('token/refresh/', views.TokenRefreshView.as_view(), name='token refresh'),
+    path('token/revoke/', views.TokenRevokeView.as_view(), name='token revoke'),
     path('profiles/customer/', views.CustomerProfileList.as_view(), name='customer list'),
     path('profiles/business/', views.BusinessProfileList.as_view(), name='business list'),
-    path('profile/<int:pk>/', views.ProfileDetailsView.as_view(), name='profil details'),
+    path('profile/<int:pk>/', select_view(views.AsyncProfileDetailsView, views.ProfileDetailsView), name='profil details'),
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from django.shortcuts import get_object_or_404
+from django.shortcuts import aget_object_or_404, get_object_or_404
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -7,9 +7,18 @@ from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 
+from coderr.async_views import AsyncAPIView, sync_handler
+from coderr.conditional import async_conditional_get, build_etag, conditional_get
+from coderr.pagination import KeysetPagination
+from coderr.rows import fast_lists_enabled
 from user_auth.models import Profile
-from user_auth.api.serializers import ProfileSerializer, BusinessProfilesListSerializer, CustomerProfilesListSerializer
-from .serializers import RegistrationSerializer, LoginSerializer
+from user_auth.search import profile_search_index
+from user_auth.api.serializers import (
+    ProfileSerializer, BusinessProfilesListSerializer, CustomerProfilesListSerializer,
+    BusinessProfileRowSerializer, CustomerProfileRowSerializer,
+)
+from user_auth.tokens import issue_tokens, refresh_tokens, revoke_tokens
+from .serializers import RegistrationSerializer, LoginSerializer, TokenRefreshSerializer
 
 
 class RegisterView(APIView):
@@ -18,7 +27,8 @@ class RegisterView(APIView):
 
     - Erlaubt POST-Anfragen ohne Authentifizierung.
     - Validiert die eingegebenen Benutzerdaten mit RegistrationSerializer.
-    - Erstellt automatisch ein Authentifizierungstoken für den neuen Benutzer.
+    - Erstellt automatisch ein Authentifizierungstoken für den neuen Benutzer
+      sowie ein signiertes Access-/Refresh-Token.
     """
     permission_classes = [AllowAny]
 
@@ -36,7 +46,8 @@ class RegisterView(APIView):
                 'token': token.key,
                 'username': user.username,
                 'email': user.email,
-                "user_id": user.id
+                "user_id": user.id,
+                **issue_tokens(user),
                 }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -49,13 +60,24 @@ class ProfileDetailsView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    def get_validators(self, request, pk, *args, **kwargs):
+        """
+        ETag und Last-Modified aus `updated_at` des Profils.
+        Das geladene Profil wird von `get()` wiederverwendet.
+        """
+        self.profile = Profile.objects.filter(pk=pk).first()
+        if self.profile is None:
+            return None, None
+        return build_etag('profile', pk, self.profile.updated_at), self.profile.updated_at
+
+    @conditional_get
     def get(self, request, pk):
         """
         Gibt die Profildaten für die angegebene Benutzer-ID zurück.
 
         Entfernt das Feld 'uploaded_at' aus der Rückgabe, falls vorhanden.
         """
-        profile = get_object_or_404(Profile, pk=pk)
+        profile = self.profile or get_object_or_404(Profile, pk=pk)
         serializer = ProfileSerializer(profile)
         data = serializer.data
         data.pop('uploaded_at', None)
@@ -81,6 +103,31 @@ class ProfileDetailsView(APIView):
         serializer.save()
         return Response(serializer.data, status=status.HTTP_200_OK)
     
+class AsyncProfileDetailsView(AsyncAPIView, ProfileDetailsView):
+    """
+    Async Variante von `ProfileDetailsView` für den Betrieb unter ASGI (siehe `ASYNC_READ_VIEWS`).
+    `GET` nutzt das async ORM, `PATCH` läuft unverändert synchron.
+    """
+
+    async def aget_validators(self, request, pk, *args, **kwargs):
+        """
+        ETag und Last-Modified aus `updated_at` des Profils.
+        """
+        self.profile = await Profile.objects.filter(pk=pk).afirst()
+        if self.profile is None:
+            return None, None
+        return build_etag('profile', pk, self.profile.updated_at), self.profile.updated_at
+
+    @async_conditional_get
+    async def get(self, request, pk):
+        profile = self.profile or await aget_object_or_404(Profile, pk=pk)
+        data = ProfileSerializer(profile).data
+        data.pop('uploaded_at', None)
+        return Response(data, status=status.HTTP_200_OK)
+
+    patch = sync_handler(ProfileDetailsView.patch)
+
+
 class LoginView(APIView):
     """
     API-Endpunkt für die Benutzeranmeldung.
@@ -102,45 +149,121 @@ class LoginView(APIView):
                 'user_id': serializer.validated_data['user_id'],
                 'username': serializer.validated_data['username'],
                 'email': serializer.validated_data['email'],
-                'token': serializer.validated_data['token']
+                'token': serializer.validated_data['token'],
+                'access_token': serializer.validated_data['access_token'],
+                'refresh_token': serializer.validated_data['refresh_token'],
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class CustomerProfileList(APIView):
+class TokenRefreshView(APIView):
     """
-    API-Endpunkt zur Auflistung aller Profile mit dem Typ 'customer'.
+    API-Endpunkt zum Erneuern signierter Tokens.
 
-    Nur authentifizierte Benutzer haben Zugriff.
+    - `POST`: Tauscht ein gültiges `refresh_token` gegen ein neues Token-Paar.
     """
-    permission_classes = [IsAuthenticated]
-    pagination_classes = None
+    permission_classes = [AllowAny]
 
-    def get(self, request):
+    def post(self, request):
+        """
+        Prüft das Refresh-Token und gibt ein neues `access_token`/`refresh_token` zurück.
         """
-        Gibt eine Liste aller Profile mit `type='customer'` zurück.
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(refresh_tokens(serializer.validated_data['refresh_token']), status=status.HTTP_200_OK)
+
+class TokenRevokeView(APIView):
+    """
+    API-Endpunkt zum Widerrufen aller signierten Tokens des angemeldeten Benutzers.
 
-        Rückgabeformat: Liste serialisierter Profile.
+    - `POST`: Erhöht die Token-Version; bereits ausgestellte Access- und Refresh-Tokens werden ungültig.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
         """
-        profiles = Profile.objects.filter(type='customer')
-        serializer = CustomerProfilesListSerializer(profiles, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
-    
-class BusinessProfileList(APIView):
+        Widerruft die signierten Tokens des aktuellen Benutzers.
+        """
+        revoke_tokens(request.user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class ProfileDirectoryPagination(KeysetPagination):
     """
-    API-Endpunkt zur Auflistung aller Business-Profile.
+    Cursor-Paginierung für die Profilverzeichnisse (aktiviert über ?pagination=cursor).
+    Blättert per Keyset über die Profil-ID.
+    """
+    page_size = 20
+    max_page_size = 100
 
-    Nur authentifizierte Benutzer dürfen auf diese Liste zugreifen.
+    def get_ordering(self, request, view):
+        return 'id', False
+
+
+class ProfileDirectoryView(APIView):
+    """
+    Basisklasse für die Profilverzeichnisse eines Typs.
+
+    - `?search=` sucht über Benutzername, Vor-/Nachname und Standort (FTS5-Volltextindex,
+      ohne Paginierung nach Relevanz sortiert).
+    - `?pagination=cursor` liefert Seiten `{next, results}` per Keyset über die ID.
+    - Ohne Paginierung enthält die Liste höchstens `LIST_LIMIT` Profile (LIMIT in der Abfrage,
+      bei der Suche die relevantesten), damit die Antwort nicht mit der Zahl der Profile wächst.
+
+    Der verschachtelte User wird per `select_related('user')` in derselben Abfrage geladen.
+    Mit `FAST_LIST_SERIALIZERS` gibt `row_serializer_class` direkt aus `values_list()`-Zeilen aus.
     """
     permission_classes = [IsAuthenticated]
-    pagination_classes = None
+    LIST_LIMIT = ProfileDirectoryPagination.max_page_size
+    profile_type = None
+    serializer_class = None
+    row_serializer_class = None
+
+    def get_queryset(self):
+        profiles = Profile.objects.filter(type=self.profile_type).select_related('user').order_by('id')
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            profiles = profile_search_index.search(profiles, search)
+            if profile_search_index.is_available:
+                profiles = profiles.order_by('search_rank', 'id')
+        return profiles
 
     def get(self, request):
         """
-        Gibt alle Profile mit dem Typ 'business' zurück.
-
-        Rückgabe:
-            - Liste serialisierter Business-Profile
+        Gibt die Profile des Typs zurück – als Liste oder mit ?pagination=cursor seitenweise.
         """
-        profiles = Profile.objects.filter(type='business')
-        serializer = BusinessProfilesListSerializer(profiles, many=True)
+        pagination = request.query_params.get('pagination')
+        if pagination not in (None, 'cursor'):
+            return Response({'detail': 'pagination muss den Wert cursor haben.'}, status=status.HTTP_400_BAD_REQUEST)
+        profiles = self.get_queryset()
+        serializer_class = self.serializer_class
+        if fast_lists_enabled():
+            profiles = self.row_serializer_class.rows(profiles)
+            serializer_class = self.row_serializer_class
+        if pagination == 'cursor':
+            paginator = ProfileDirectoryPagination()
+            page = paginator.paginate_queryset(profiles, request, view=self)
+            serializer = serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        serializer = serializer_class(profiles[:self.LIST_LIMIT], many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class CustomerProfileList(ProfileDirectoryView):
+    """
+    API-Endpunkt zur Auflistung aller Profile mit dem Typ 'customer'.
+
+    Nur authentifizierte Benutzer haben Zugriff.
+    """
+    profile_type = 'customer'
+    serializer_class = CustomerProfilesListSerializer
+    row_serializer_class = CustomerProfileRowSerializer
+
+
+class BusinessProfileList(ProfileDirectoryView):
+    """
+    API-Endpunkt zur Auflistung aller Business-Profile.
+
+    Nur authentifizierte Benutzer dürfen auf diese Liste zugreifen.
+    """
+    profile_type = 'business'
+    serializer_class = BusinessProfilesListSerializer
+    row_serializer_class = BusinessProfileRowSerializer
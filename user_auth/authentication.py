@@ -0,0 +1,144 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BaseAuthentication, TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from user_auth.models import Profile
+from user_auth.tokens import build_token_user, verify_access_token
+
+
+def _cached_columns(model, exclude=()):
+    return [field.attname for field in model._meta.concrete_fields if field.attname not in exclude]
+
+
+class TokenCache:
+    """
+    Cache für aufgelöste Tokens im Django-Cache-Framework (siehe `CACHES`).
+
+    Abgelegt werden nur einfache Spaltenwerte von Token, User (ohne Passwort-Hash) und Profil;
+    jede Anfrage erhält daraus eigene Instanzen (`build()`), es werden keine Objekte zwischen
+    parallelen Anfragen geteilt. Mit einem gemeinsamen Cache-Backend wirkt `invalidate()` in allen
+    Worker-Prozessen; `ttl` begrenzt nur, wie lange ungenutzte Einträge liegen bleiben.
+    """
+    USER_COLUMNS = _cached_columns(User, exclude={'password'})
+    PROFILE_COLUMNS = _cached_columns(Profile)
+
+    def __init__(self, prefix='user_auth:token', ttl=300):
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get_key(self, key):
+        # Der Token-Schlüssel ist ein Geheimnis und landet daher nur gehasht im Cache-Schlüssel
+        return f'{self.prefix}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+    def load(self, key):
+        """
+        Liest Token, User und Profil mit einer Abfrage als einfache Werte (`None`, wenn das Token fehlt).
+        """
+        return Token.objects.filter(key=key).values(
+            'created',
+            *(f'user__{column}' for column in self.USER_COLUMNS),
+            *(f'user__profile__{column}' for column in self.PROFILE_COLUMNS),
+        ).first()
+
+    def build(self, key, row):
+        """
+        Baut aus den gecachten Werten neue Instanzen und gibt `(user, token)` zurück.
+        Nicht gecachte Felder (z. B. `password`) werden bei Bedarf nachgeladen.
+        """
+        user = User.from_db('default', self.USER_COLUMNS, [row[f'user__{column}'] for column in self.USER_COLUMNS])
+        if row['user__profile__id'] is None:
+            User.profile.related.set_cached_value(user, None)
+        else:
+            profile = Profile.from_db(
+                'default', self.PROFILE_COLUMNS, [row[f'user__profile__{column}'] for column in self.PROFILE_COLUMNS],
+            )
+            Profile.user.field.set_cached_value(profile, user)
+            User.profile.related.set_cached_value(user, profile)
+        token = Token.from_db('default', ['key', 'user_id', 'created'], [key, user.pk, row['created']])
+        Token.user.field.set_cached_value(token, user)
+        return user, token
+
+    def get(self, key):
+        return cache.get(self.get_key(key))
+
+    def get_user_key(self, user_id):
+        return f'{self.prefix}:user:{user_id}'
+
+    def set(self, key, row):
+        # Verweis User -> Eintrag (DRF-Tokens gibt es nur eines pro User) für `invalidate_user`
+        cache_key = self.get_key(key)
+        cache.set_many({cache_key: row, self.get_user_key(row['user__id']): cache_key}, timeout=self.ttl)
+
+    def invalidate(self, key):
+        cache.delete(self.get_key(key))
+
+    def invalidate_user(self, user_id):
+        """
+        Entfernt den Eintrag eines Users, z. B. nach Änderungen an User oder Profil.
+        """
+        user_key = self.get_user_key(user_id)
+        cache_key = cache.get(user_key)
+        if cache_key is not None:
+            cache.delete_many([cache_key, user_key])
+
+
+_cache_settings = getattr(settings, 'TOKEN_AUTH_CACHE', {})
+token_cache = TokenCache(ttl=_cache_settings.get('TTL', 300))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in-Ersatz für `rest_framework.authentication.TokenAuthentication`.
+
+    - Löst Token → User → Profil mit einer einzigen Abfrage auf, sodass `request.user.profile`
+      in den Views keine weitere Abfrage auslöst.
+    - Hält die Spaltenwerte im `token_cache`; Einträge werden beim Löschen des Tokens sowie
+      bei Änderungen an User oder Profil invalidiert (siehe `user_auth.signals`).
+    """
+
+    def authenticate_credentials(self, key):
+        row = token_cache.get(key)
+        if row is None:
+            row = token_cache.load(key)
+            if row is None:
+                raise AuthenticationFailed(_('Invalid token.'))
+            if row['user__is_active']:
+                token_cache.set(key, row)
+
+        if not row['user__is_active']:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        return token_cache.build(key, row)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """
+    Authentifizierung über signierte, ablaufende Access-Tokens (`Authorization: Bearer <token>`).
+
+    Das Token wird per HMAC geprüft; User und Profiltyp stammen aus dem Payload, es wird keine
+    Datenbankabfrage ausgeführt. Die Revocation-Liste wird nur bei einer Versionsänderung neu geladen
+    (siehe `user_auth.tokens`). Klassische Tokens (`Token <key>`) werden ignoriert und weiter von
+    `CachedTokenAuthentication` verarbeitet.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Ungültiger Authorization-Header.')
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed('Ungültiges Token.')
+        payload = verify_access_token(token)
+        return (build_token_user(payload), payload)
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from user_auth.search import profile_search_index
+
+
+class Command(BaseCommand):
+    """
+    Baut den FTS5-Volltextindex über Namen und Standort der Profile neu auf.
+    """
+    help = 'Baut den Volltextindex der Profile neu auf.'
+
+    def handle(self, *args, **options):
+        if not profile_search_index.is_available:
+            self.stdout.write(self.style.WARNING('Die Datenbank unterstützt keinen FTS5-Index.'))
+            return
+        profile_search_index.rebuild()
+        self.stdout.write(self.style.SUCCESS('Volltextindex der Profile neu aufgebaut.'))
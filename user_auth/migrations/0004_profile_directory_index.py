@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 06:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_profile_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS user_auth_profile_fts USING fts5("
+        "username, first_name, last_name, location, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO user_auth_profile_fts (rowid, username, first_name, last_name, location) "
+        "SELECT id, COALESCE(username, ''), COALESCE(first_name, ''), COALESCE(last_name, ''), COALESCE(location, '') "
+        "FROM user_auth_profile"
+    )
+
+
+def drop_profile_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS user_auth_profile_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0003_access_token_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['type', 'id'], name='profile_type_idx'),
+        ),
+        migrations.RunPython(create_profile_search_index, drop_profile_search_index),
+    ]
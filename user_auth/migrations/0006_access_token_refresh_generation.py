@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0005_profile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accesstokenversion',
+            name='refresh_generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,13 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.utils.timezone import now
+
+from coderr.tracking import DirtyFieldsMixin
 
 class FileUpload(models.Model):
     file = models.FileField(upload_to='uploads/', blank=True, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
 
-class Profile(models.Model):
+class Profile(DirtyFieldsMixin, models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     email = models.EmailField(unique=True, error_messages={'unique': 'Email bereits vorhanden.'})
     username = models.CharField(max_length=120, default='Max Coderr')
@@ -21,17 +22,47 @@ class Profile(models.Model):
     working_hours = models.CharField(max_length=100, blank=True, default='9:00 - 17:00')
     tel = models.CharField(max_length=25, blank=True, default='0123456789')
     uploaded_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Profilverzeichnisse: nach Typ gefiltert, per Keyset nach ID geblättert
+            models.Index(fields=['type', 'id'], name='profile_type_idx'),
+        ]
 
     def save(self, *args, **kwargs):
-        
-        self.username = self.user.username
-        if self.pk:
-            original = Profile.objects.get(pk=self.pk)
-            if original.file != self.file:
-                self.upload_at = now()
+        """
+        Übernimmt den Benutzernamen des Users (nur wenn dieser ohnehin geladen ist) und
+        speichert bei bestehenden Profilen nur die geänderten Spalten. Umbenennungen direkt am
+        User spiegelt `user_auth.signals.sync_profile_username`.
+        """
+        if self._state.adding or Profile.user.is_cached(self):
+            self.username = self.user.username
         super().save(*args, **kwargs)
 
+    def get_auto_update_fields(self, dirty_fields):
+        """
+        `updated_at` wird bei jeder Änderung geschrieben, `uploaded_at` nur,
+        wenn sich die Datei tatsächlich geändert hat.
+        """
+        return {'updated_at', 'uploaded_at'} if 'file' in dirty_fields else {'updated_at'}
+
 
     def __str__(self):
         return f"{self.user.username} - {self.type}"
-         
\ No newline at end of file
+
+
+class AccessTokenVersion(models.Model):
+    """
+    Aktuelle Version der signierten Access-Tokens eines Users.
+    Signierte Tokens mit einer kleineren Version gelten als widerrufen (siehe `user_auth.tokens`).
+    `refresh_generation` ist die Generation des einzig gültigen Refresh-Tokens; sie wird bei jedem
+    ausgestellten Token-Paar erhöht, ältere Refresh-Tokens sind damit verbraucht.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='access_token_version')
+    version = models.PositiveIntegerField(default=0)
+    refresh_generation = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id} - v{self.version}"
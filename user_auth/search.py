@@ -0,0 +1,5 @@
+from coderr.search import FullTextIndex
+from user_auth.models import Profile
+
+
+profile_search_index = FullTextIndex('user_auth_profile_fts', Profile, ['username', 'first_name', 'last_name', 'location'])
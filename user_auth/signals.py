@@ -0,0 +1,76 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from coderr.images import schedule_variants
+from user_auth.authentication import token_cache
+from user_auth.models import Profile
+from user_auth.search import profile_search_index
+
+
+USER_NAME_FIELDS = ('username', 'first_name', 'last_name')
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Entfernt gelöschte Tokens sofort aus dem Authentifizierungs-Cache.
+    """
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Verwirft gecachte Authentifizierungen, wenn sich User oder Profil geändert haben.
+    """
+    user_id = instance.pk if sender is User else instance.user_id
+    token_cache.invalidate_user(user_id)
+
+
+@receiver(post_save, sender=User)
+def sync_profile_username(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Übernimmt Änderungen am User, die nicht über das Profil laufen (z. B. im Admin), ins Profil:
+    `Profile.username` wird gespiegelt und `updated_at` fortgeschrieben. Über `save()` des Profils
+    laufen auch Volltextindex und Cache-Invalidierung. Speichervorgänge ohne Namensfelder
+    (z. B. `last_login`) werden übergangen.
+    """
+    if created or (update_fields is not None and not set(USER_NAME_FIELDS) & set(update_fields)):
+        return
+    profile = Profile.objects.filter(user_id=instance.pk).first()
+    if profile is None:
+        return
+    profile.username = instance.username
+    profile.save(update_fields=['username', 'updated_at'])
+
+
+@receiver(post_save, sender=Profile)
+def index_profile(sender, instance, update_fields=None, **kwargs):
+    """
+    Aktualisiert den Volltextindex, sobald sich Name oder Standort geändert haben könnten.
+    """
+    if update_fields is not None and not set(profile_search_index.columns) & set(update_fields):
+        return
+    profile_search_index.index(instance)
+
+
+@receiver(post_delete, sender=Profile)
+def unindex_profile(sender, instance, **kwargs):
+    """
+    Entfernt gelöschte Profile aus dem Volltextindex.
+    """
+    profile_search_index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def create_profile_picture_variants(sender, instance, **kwargs):
+    """
+    Stößt nach dem Commit die Erzeugung der Bildvarianten an, wenn sich das Profilbild geändert hat.
+    """
+    if instance.file and 'file' in instance.get_dirty_fields():
+        schedule_variants(instance.file.name)
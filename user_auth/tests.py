@@ -1,3 +1,381 @@
-from django.test import TestCase
+import datetime
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from user_auth.api.views import AsyncProfileDetailsView, BusinessProfileList
+from user_auth.authentication import CachedTokenAuthentication, token_cache
+from user_auth.models import Profile
+from user_auth.tokens import revocation_list
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    Prüft die gecachte Token-Authentifizierung inklusive Invalidierung.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kunde', password='secret')
+        self.profile = Profile.objects.create(user=self.user, email='kunde@coderr.de', type='customer')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_token_user_and_profile_resolved_once(self):
+        # Token, User und Profil in einer Abfrage, danach nur noch die eigentliche Profilabfrage der View
+        with self.assertNumQueries(2):
+            self.client.get(f'/api/profile/{self.profile.pk}/')
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/profile/{self.profile.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_change_invalidates_cache(self):
+        self.client.get(f'/api/profile/{self.profile.pk}/')
+        self.profile.type = 'business'
+        self.profile.save()
+        with self.assertNumQueries(2):
+            self.client.get(f'/api/profile/{self.profile.pk}/')
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(f'/api/profile/{self.profile.pk}/')
+        self.token.delete()
+        response = self.client.get(f'/api/profile/{self.profile.pk}/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_cache_holds_plain_values_and_builds_fresh_users(self):
+        self.client.get(f'/api/profile/{self.profile.pk}/')
+        row = cache.get(token_cache.get_key(self.token.key))
+        self.assertNotIn('user__password', row)
+        self.assertTrue(all(isinstance(value, (int, str, bool, datetime.datetime, type(None))) for value in row.values()))
+
+        first, token = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        second, _ = CachedTokenAuthentication().authenticate_credentials(self.token.key)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.profile, second.profile)
+        self.assertEqual((first.pk, first.profile.type, token.user_id), (self.user.pk, 'customer', self.user.pk))
+        # der Passwort-Hash wird bei Bedarf nachgeladen
+        with self.assertNumQueries(1):
+            self.assertTrue(first.check_password('secret'))
+
+    def test_invalidation_is_shared_through_cache(self):
+        self.client.get(f'/api/profile/{self.profile.pk}/')
+        # Löschen ohne Signal (wie in einem anderen Prozess, der nur den gemeinsamen Cache sieht)
+        Token.objects.filter(pk=self.token.pk).delete()
+        token_cache.invalidate(self.token.key)
+        self.assertEqual(self.client.get(f'/api/profile/{self.profile.pk}/').status_code, 401)
+
+
+class SignedTokenTests(APITestCase):
+    """
+    Prüft signierte Access-Tokens, den Refresh-Flow und den Widerruf.
+    """
+
+    def setUp(self):
+        revocation_list._loaded_at = None
+        self.client.post('/api/registration/', {
+            'username': 'kunde', 'email': 'kunde@coderr.de', 'password': 'secret', 'repeated_password': 'secret', 'type': 'customer',
+        })
+        response = self.client.post('/api/login/', {'username': 'kunde', 'password': 'secret'})
+        self.tokens = response.data
+        self.profile = Profile.objects.get(user__username='kunde')
+
+    def test_access_token_authenticates_without_auth_queries(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access_token']}")
+        self.client.get(f'/api/profile/{self.profile.pk}/')
+        # nur noch die Profilabfrage der View
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/profile/{self.profile.pk}/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_legacy_token_still_works(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.tokens['token']}")
+        self.assertEqual(self.client.get(f'/api/profile/{self.profile.pk}/').status_code, 200)
+
+    def test_tampered_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access_token']}x")
+        self.assertEqual(self.client.get(f'/api/profile/{self.profile.pk}/').status_code, 401)
+
+    def test_refresh_and_revoke(self):
+        response = self.client.post('/api/token/refresh/', {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(response.status_code, 200)
+        access_token = response.data['access_token']
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        self.assertEqual(self.client.post('/api/token/revoke/').status_code, 204)
+        self.assertEqual(self.client.get(f'/api/profile/{self.profile.pk}/').status_code, 401)
+        response = self.client.post('/api/token/refresh/', {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(response.status_code, 401)
+
+
+    def test_refresh_token_is_single_use(self):
+        first = self.client.post('/api/token/refresh/', {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(first.status_code, 200)
+        replay = self.client.post('/api/token/refresh/', {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(replay.status_code, 401)
+        second = self.client.post('/api/token/refresh/', {'refresh_token': first.data['refresh_token']})
+        self.assertEqual(second.status_code, 200)
+        # ein neues Login löst die bisherige Refresh-Kette ab
+        self.client.post('/api/login/', {'username': 'kunde', 'password': 'secret'})
+        response = self.client.post('/api/token/refresh/', {'refresh_token': second.data['refresh_token']})
+        self.assertEqual(response.status_code, 401)
+
+
+class ProfileChangeTrackingTests(APITestCase):
+    """
+    Prüft das Dirty-Field-Tracking von Profile.save.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kunde', password='secret')
+        Profile.objects.create(user=self.user, email='kunde@coderr.de', type='customer')
+        self.profile = Profile.objects.get(user=self.user)
+
+    def test_save_writes_only_changed_columns(self):
+        # tel ist nicht im Volltextindex, daher genau ein UPDATE
+        self.profile.tel = '0987654321'
+        with self.assertNumQueries(1) as context:
+            self.profile.save()
+        sql = context.captured_queries[0]['sql']
+        self.assertTrue(sql.startswith('UPDATE'))
+        self.assertIn('"tel"', sql)
+        self.assertNotIn('"email"', sql)
+        self.assertNotIn('"uploaded_at"', sql)
+
+    def test_unchanged_profile_is_not_written(self):
+        with self.assertNumQueries(0):
+            self.profile.save()
+
+    def test_uploaded_at_changes_only_with_file(self):
+        uploaded_at = self.profile.uploaded_at
+        self.profile.tel = '0987654321'
+        self.profile.save()
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.uploaded_at, uploaded_at)
+
+        self.profile.file = 'uploads/neu.jpg'
+        self.profile.save()
+        self.profile.refresh_from_db()
+        self.assertGreater(self.profile.uploaded_at, uploaded_at)
+
+    def test_partial_save_keeps_other_changes_dirty(self):
+        self.profile.location = 'Hamburg'
+        self.profile.tel = '0123'
+        self.profile.save(update_fields=['tel'])
+        self.assertEqual(set(self.profile.get_dirty_fields()), {'location'})
+        self.profile.save()
+        self.assertEqual(Profile.objects.values_list('location', 'tel').get(pk=self.profile.pk), ('Hamburg', '0123'))
+        self.assertFalse(self.profile.is_dirty())
+
+    def test_user_rename_is_mirrored_to_profile(self):
+        updated_at = self.profile.updated_at
+        user = User.objects.get(pk=self.user.pk)
+        user.username = 'kundin'
+        user.save()
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.username, 'kundin')
+        self.assertGreater(self.profile.updated_at, updated_at)
+        self.client.force_authenticate(self.user)
+        users = [item['user'] for item in self.client.get('/api/profiles/customer/', {'search': 'kundin'}).data]
+        self.assertEqual(users, [self.user.pk])
+
+        # Speichern ohne Namensfelder (z. B. beim Login) schreibt das Profil nicht
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+
+class ProfileDirectoryTests(APITestCase):
+    """
+    Prüft Suche, Paginierung und Abfrageanzahl der Profilverzeichnisse.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profiles = []
+        for i, (location, last_name) in enumerate([('Berlin', 'Schulz'), ('München', 'Müller'), ('Köln', 'Meier'), ('Berlin', 'Bauer')]):
+            user = User.objects.create_user(username=f'business{i}', password='secret')
+            cls.profiles.append(Profile.objects.create(
+                user=user, email=f'business{i}@coderr.de', type='business', last_name=last_name, location=location,
+            ))
+        cls.customer = User.objects.create_user(username='kunde', password='secret')
+        Profile.objects.create(user=cls.customer, email='kunde@coderr.de', type='customer')
+
+    def setUp(self):
+        self.client.force_authenticate(self.customer)
+
+    def _users(self, **params):
+        response = self.client.get('/api/profiles/business/', params)
+        self.assertEqual(response.status_code, 200)
+        return [item['user'] for item in response.data]
+
+    def test_list_loads_users_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profiles/business/')
+        self.assertEqual([item['user'] for item in response.data], [profile.user_id for profile in self.profiles])
+        self.assertEqual(response.data[1]['location'], 'München')
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/profiles/customer/')
+        self.assertEqual([item['user'] for item in response.data], [self.customer.id])
+
+    def test_plain_list_is_capped(self):
+        with mock.patch.object(BusinessProfileList, 'LIST_LIMIT', 2):
+            with CaptureQueriesContext(connection) as queries:
+                users = self._users()
+            self.assertEqual(users, [profile.user_id for profile in self.profiles[:2]])
+            self.assertIn('LIMIT 2', queries.captured_queries[0]['sql'])
+            self.assertEqual(len(self._users(search='berl')), 2)
+            self.assertEqual(len(self._users(search='b')), 2)
+
+    def test_search_by_name_and_location(self):
+        self.assertEqual(self._users(search='berl'), [self.profiles[0].user_id, self.profiles[3].user_id])
+        self.assertEqual(self._users(search='muller'), [self.profiles[1].user_id])
+        self.assertEqual(self._users(search='berlin bauer'), [self.profiles[3].user_id])
+
+    def test_search_follows_profile_updates(self):
+        profile = self.profiles[2]
+        profile.location = 'Hamburg'
+        profile.save()
+        self.assertEqual(self._users(search='hamburg'), [profile.user_id])
+        self.assertEqual(self._users(search='köln'), [])
+
+    def test_cursor_pagination(self):
+        ids, url, params = [], '/api/profiles/business/', {'pagination': 'cursor', 'page_size': 3}
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            ids += [item['user'] for item in response.data['results']]
+            url, params = response.data['next'], None
+        self.assertEqual(ids, [profile.user_id for profile in self.profiles])
+
+
+class ProfileConditionalGetTests(APITestCase):
+    """
+    Prüft ETag/Last-Modified von GET /api/profile/<pk>/.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kunde', password='secret')
+        self.profile = Profile.objects.create(user=self.user, email='kunde@coderr.de', type='customer')
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/profile/{self.profile.pk}/'
+
+    def test_not_modified_until_profile_changes(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('updated_at', response.data)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+        self.client.patch(self.url, {'tel': '0987654321'})
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+
+@override_settings(IMAGE_VARIANTS={'ASYNC': False})
+class ProfilePictureVariantTests(APITestCase):
+    """
+    Prüft, dass Profilbilder nur bei Änderung der Datei Varianten erzeugen.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(username='kunde', password='secret')
+        self.profile = Profile.objects.create(user=self.user, email='kunde@coderr.de', type='customer')
+
+    def test_variants_follow_file_changes(self):
+        output = BytesIO()
+        Image.new('RGBA', (500, 400), (255, 0, 0, 128)).save(output, format='PNG')
+        self.profile.file = SimpleUploadedFile('avatar.png', output.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.save()
+        thumb = self.profile.file.name + '.thumb.webp'
+        self.assertTrue(default_storage.exists(thumb))
+
+        self.client.force_authenticate(self.user)
+        data = self.client.get(f'/api/profile/{self.profile.pk}/').data
+        self.assertEqual(data['file_variants']['thumb'], f'/media/{thumb}')
+
+        self.profile.tel = '0987654321'
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.profile.save()
+        self.assertEqual(callbacks, [])
+
+
+class AsyncProfileDetailsViewTests(APITestCase):
+    """
+    Prüft die async Variante von /api/profile/<pk>/ (GET async, PATCH über sync_to_async).
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kunde', password='secret')
+        self.profile = Profile.objects.create(user=self.user, email='kunde@coderr.de', type='customer')
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/profile/{self.profile.pk}/'
+        self.view = AsyncProfileDetailsView.as_view()
+
+    def _call(self, method, pk, *args, **extra):
+        request = getattr(APIRequestFactory(), method)(f'/api/profile/{pk}/', *args, **extra)
+        force_authenticate(request, self.user)
+        return async_to_sync(self.view)(request, pk=pk)
+
+    def test_get_matches_sync_view(self):
+        expected = self.client.get(self.url)
+        response = self._call('get', self.profile.pk)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual(self._call('get', self.profile.pk, HTTP_IF_NONE_MATCH=expected['ETag']).status_code, 304)
+        self.assertEqual(self._call('get', 999).status_code, 404)
+
+    def test_patch_runs_sync_handler(self):
+        response = self._call('patch', self.profile.pk, {'tel': '0987654321'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.tel, '0987654321')
+
+
+class ProfileRowSerializerTests(APITestCase):
+    """
+    Prüft, dass die schnelle Listenausgabe (`FAST_LIST_SERIALIZERS`) byteweise mit den Profil-Listenserializern übereinstimmt.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for i, profile_type in enumerate(['business', 'customer'] * 3):
+            user = User.objects.create_user(username=f'user{i}', password='secret')
+            Profile.objects.create(user=user, email=f'user{i}@coderr.de', type=profile_type, location='Köln', last_name=f'Müller {i}')
+        Profile.objects.filter(user__username__in=['user0', 'user1']).update(file='uploads/avatar.png')
+        Profile.objects.filter(user__username='user2').update(file='uploads/lebenslauf.pdf')
+        cls.user = User.objects.get(username='user0')
+
+    def _get(self, fast, path, params):
+        self.client.force_authenticate(self.user)
+        with override_settings(FAST_LIST_SERIALIZERS=fast):
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def test_output_matches_profile_list_serializers(self):
+        for path in ('/api/profiles/business/', '/api/profiles/customer/'):
+            for params in ({}, {'search': 'Köln'}, {'pagination': 'cursor', 'page_size': 2}):
+                with self.subTest(path=path, params=params):
+                    self.assertEqual(self._get(True, path, params), self._get(False, path, params))
+
+    def test_fast_list_skips_user_join(self):
+        self.client.force_authenticate(self.user)
+        with override_settings(FAST_LIST_SERIALIZERS=True), CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/profiles/business/')
+        self.assertNotIn('auth_user', queries.captured_queries[-1]['sql'])
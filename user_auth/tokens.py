@@ -0,0 +1,178 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework.exceptions import AuthenticationFailed
+
+from user_auth.models import AccessTokenVersion, Profile
+
+
+ACCESS_SALT = 'user_auth.tokens.access'
+REFRESH_SALT = 'user_auth.tokens.refresh'
+REVOCATION_EPOCH_CACHE_KEY = 'user_auth:revocation_epoch'
+
+_token_settings = getattr(settings, 'SIGNED_TOKENS', {})
+ACCESS_LIFETIME = _token_settings.get('ACCESS_LIFETIME', 15 * 60)
+REFRESH_LIFETIME = _token_settings.get('REFRESH_LIFETIME', 7 * 24 * 60 * 60)
+REVOCATION_RELOAD_INTERVAL = _token_settings.get('REVOCATION_RELOAD_INTERVAL', 60)
+
+
+class RevocationList:
+    """
+    Prozesslokale Kopie der Token-Versionen aller User mit widerrufenen Tokens.
+
+    Die Datenbank wird nur neu gelesen, wenn sich die Revocation-Epoche im Django-Cache
+    geändert hat (`bump()`) oder `REVOCATION_RELOAD_INTERVAL` Sekunden vergangen sind –
+    Letzteres deckt Worker ab, die keinen gemeinsamen Cache nutzen.
+    """
+
+    def __init__(self, reload_interval=REVOCATION_RELOAD_INTERVAL):
+        self.reload_interval = reload_interval
+        self._versions = {}
+        self._epoch = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def min_version(self, user_id):
+        """
+        Gibt die kleinste noch gültige Token-Version des Users zurück.
+        """
+        epoch = cache.get(REVOCATION_EPOCH_CACHE_KEY, 0)
+        stale = self._loaded_at is None or epoch != self._epoch or (
+            self.reload_interval is not None and time.monotonic() - self._loaded_at > self.reload_interval
+        )
+        if stale:
+            self._reload(epoch)
+        return self._versions.get(user_id, 0)
+
+    def _reload(self, epoch):
+        versions = dict(AccessTokenVersion.objects.filter(version__gt=0).values_list('user_id', 'version'))
+        with self._lock:
+            self._versions = versions
+            self._epoch = epoch
+            self._loaded_at = time.monotonic()
+
+    def bump(self):
+        """
+        Erhöht die Revocation-Epoche, damit alle Prozesse die Liste beim nächsten Zugriff neu laden.
+        """
+        try:
+            cache.incr(REVOCATION_EPOCH_CACHE_KEY)
+        except ValueError:
+            cache.set(REVOCATION_EPOCH_CACHE_KEY, 1, timeout=None)
+        self._loaded_at = None
+
+
+revocation_list = RevocationList()
+
+
+def _current_version(user):
+    return AccessTokenVersion.objects.filter(user=user).values_list('version', flat=True).first() or 0
+
+
+def _rotate_refresh_generation(user, current=None):
+    """
+    Erhöht die Refresh-Generation des Users und gibt `(version, generation)` zurück.
+    Mit `current` nur, wenn diese noch aktuell ist (sonst `None`) – das UPDATE ist damit
+    ein Compare-and-Swap, sodass ein Refresh-Token auch bei parallelen Anfragen nur einmal gilt.
+    """
+    AccessTokenVersion.objects.get_or_create(user=user)
+    rows = AccessTokenVersion.objects.filter(user=user)
+    if current is not None:
+        rows = rows.filter(refresh_generation=current)
+    if not rows.update(refresh_generation=F('refresh_generation') + 1):
+        return None
+    return AccessTokenVersion.objects.filter(user=user).values_list('version', 'refresh_generation').get()
+
+
+def issue_tokens(user, current_generation=None):
+    """
+    Erstellt ein signiertes Access-Token (kurzlebig) und ein Refresh-Token (langlebig).
+
+    Das Access-Token enthält User-ID, Benutzername, Profiltyp, Admin-Flags und die Token-Version
+    und kann ohne Datenbankzugriff per HMAC geprüft werden. Das Refresh-Token trägt die neue
+    Refresh-Generation; damit werden alle zuvor ausgestellten Refresh-Tokens des Users ungültig.
+    """
+    rotated = _rotate_refresh_generation(user, current_generation)
+    if rotated is None:
+        raise AuthenticationFailed('Das Refresh-Token wurde bereits verwendet.')
+    version, generation = rotated
+    profile_type = Profile.objects.filter(user=user).values_list('type', flat=True).first()
+    access_payload = {
+        'uid': user.pk,
+        'usr': user.username,
+        'typ': profile_type,
+        'stf': user.is_staff,
+        'su': user.is_superuser,
+        'ver': version,
+    }
+    return {
+        'access_token': signing.dumps(access_payload, salt=ACCESS_SALT),
+        'refresh_token': signing.dumps({'uid': user.pk, 'ver': version, 'gen': generation}, salt=REFRESH_SALT),
+    }
+
+
+def verify_access_token(token):
+    """
+    Prüft Signatur, Ablaufzeit und Version eines Access-Tokens und gibt dessen Payload zurück.
+    """
+    try:
+        payload = signing.loads(token, salt=ACCESS_SALT, max_age=ACCESS_LIFETIME)
+    except signing.SignatureExpired:
+        raise AuthenticationFailed('Das Token ist abgelaufen.')
+    except signing.BadSignature:
+        raise AuthenticationFailed('Ungültiges Token.')
+    if payload.get('ver', 0) < revocation_list.min_version(payload.get('uid')):
+        raise AuthenticationFailed('Das Token wurde widerrufen.')
+    return payload
+
+
+def refresh_tokens(refresh_token):
+    """
+    Tauscht ein gültiges Refresh-Token gegen ein neues Token-Paar.
+    Version, Refresh-Generation und User-Status werden hier gegen die Datenbank geprüft; jedes
+    Refresh-Token kann nur einmal eingetauscht werden (Rotation).
+    """
+    try:
+        payload = signing.loads(refresh_token, salt=REFRESH_SALT, max_age=REFRESH_LIFETIME)
+    except signing.SignatureExpired:
+        raise AuthenticationFailed('Das Refresh-Token ist abgelaufen.')
+    except signing.BadSignature:
+        raise AuthenticationFailed('Ungültiges Refresh-Token.')
+    user = User.objects.filter(pk=payload.get('uid'), is_active=True).first()
+    if user is None or 'gen' not in payload or payload.get('ver', 0) < _current_version(user):
+        raise AuthenticationFailed('Das Refresh-Token wurde widerrufen.')
+    return issue_tokens(user, current_generation=payload['gen'])
+
+
+def revoke_tokens(user):
+    """
+    Widerruft alle bisher ausgestellten signierten Tokens des Users.
+    """
+    AccessTokenVersion.objects.get_or_create(user=user)
+    AccessTokenVersion.objects.filter(user=user).update(version=F('version') + 1)
+    revocation_list.bump()
+
+
+def build_token_user(payload):
+    """
+    Baut aus dem Token-Payload einen User ohne Datenbankzugriff.
+
+    Gesetzt sind ID, Benutzername, `is_staff`, `is_superuser` sowie ein Profil mit dem Typ,
+    sodass `request.user.profile.type` ebenfalls ohne Abfrage funktioniert.
+    """
+    user = User(pk=payload['uid'], username=payload.get('usr', ''), is_staff=payload.get('stf', False),
+                is_superuser=payload.get('su', False), is_active=True)
+    user._state.adding = False
+    user._state.db = 'default'
+    if payload.get('typ'):
+        profile = Profile(user=user, type=payload['typ'])
+        profile._state.adding = False
+        User.profile.related.set_cached_value(user, profile)
+    else:
+        User.profile.related.set_cached_value(user, None)
+    return user